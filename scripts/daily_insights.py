@@ -8,8 +8,7 @@
 
 import sys
 import os
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
 import json
 from pathlib import Path
 
@@ -17,6 +16,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from talkshow.storage.json_storage import JSONStorage
+from talkshow.analytics.insights import group_questions_by_date_and_time, round_to_half_hour
 from talkshow.config.manager import ConfigManager
 from rich.console import Console
 from rich.table import Table
@@ -24,63 +24,6 @@ from rich import box
 from rich.text import Text
 
 
-def round_to_half_hour(dt):
-    """将时间归整到最近的半点或整点"""
-    # 获取分钟数
-    minutes = dt.minute
-    
-    # 确定最近的半点或整点
-    if minutes <= 15:
-        # 归整到整点
-        rounded_minutes = 0
-    elif minutes <= 45:
-        # 归整到半点
-        rounded_minutes = 30
-    else:
-        # 归整到下一个整点
-        rounded_minutes = 0
-        dt = dt + timedelta(hours=1)
-    
-    return dt.replace(minute=rounded_minutes, second=0, microsecond=0)
-
-
-def group_questions_by_date_and_time(sessions):
-    """按日期和时间分组问题"""
-    daily_questions = defaultdict(list)
-    
-    for session in sessions:
-        # 使用解析器已经提取的时间信息
-        session_start_time = session.start_time  # ChatSession.start_time 属性
-        date_str = session_start_time.strftime('%Y-%m-%d')
-        
-        # 为这个会话的每个QA pair创建时间条目
-        for qa_pair in session.qa_pairs:
-            question = qa_pair.question.strip()
-            if question:
-                # 使用QA pair的时间戳，如果没有则使用会话开始时间
-                qa_time = qa_pair.timestamp or session_start_time
-                
-                # 归整时间到最近的半点或整点
-                rounded_time = round_to_half_hour(qa_time)
-                
-                # 使用已有的摘要，如果没有则使用原问题
-                q_summary = qa_pair.question_summary or question
-                
-                daily_questions[date_str].append({
-                    'time': rounded_time,
-                    'time_str': rounded_time.strftime('%H:%M'),
-                    'original': question,
-                    'summary': q_summary,
-                    'session_theme': session.meta.theme
-                })
-    
-    # 对每天的问题按时间排序
-    for date_str in daily_questions:
-        daily_questions[date_str].sort(key=lambda x: x['time'])
-    
-    return daily_questions
-
-
 def print_daily_insights(daily_questions):
     """使用 Rich 打印思维日记表格"""
     console = Console()
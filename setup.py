@@ -49,6 +49,7 @@ setup(
         "dev": [
             "pytest>=7.0.0",
             "pytest-cov>=4.0.0",
+            "httpx>=0.24.0",
         ],
         "llm": [
             "litellm>=1.0.0",
@@ -57,6 +58,10 @@ setup(
             "fastapi>=0.100.0",
             "uvicorn>=0.20.0",
         ],
+        "speedups": [
+            "orjson>=3.9.0",
+            "brotli>=1.0.0",
+        ],
         "cli": [
             "click>=8.0.0",
             "rich>=13.0.0",
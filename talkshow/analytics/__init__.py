@@ -0,0 +1,11 @@
+"""Analytics over the stored chat history."""
+
+from .qa_table import QATable
+from .insights import DailyInsights, group_questions_by_date_and_time, round_to_half_hour
+
+__all__ = [
+    "QATable",
+    "DailyInsights",
+    "group_questions_by_date_and_time",
+    "round_to_half_hour",
+]
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""Daily insights: questions grouped by day and half-hour."""
+
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from ..models.chat import ChatSession
+from .qa_table import HAS_QUESTION, QATable
+
+
+# Longest original question text sent to clients
+ORIGINAL_PREVIEW_LENGTH = 200
+
+
+def round_to_half_hour(dt: datetime) -> datetime:
+    """Round a time to the nearest hour or half hour.
+    
+    Minutes 0-15 round down to the hour, 16-45 to the half hour and
+    46-59 up to the next hour.
+    
+    Args:
+        dt: Time to round
+    
+    Returns:
+        datetime: The rounded time, in the same time zone
+    """
+    if dt.minute <= 15:
+        minutes = 0
+    elif dt.minute <= 45:
+        minutes = 30
+    else:
+        minutes = 0
+        dt = dt + timedelta(hours=1)
+    return dt.replace(minute=minutes, second=0, microsecond=0)
+
+
+def group_questions_by_date_and_time(sessions: Union[Iterable[ChatSession], QATable]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group questions by the start day of their session, ordered by half-hour.
+    
+    Each question is placed at its own timestamp, else at its session's
+    start, rounded as by ``round_to_half_hour``. Empty questions are
+    skipped and the summary falls back to the question itself.
+    
+    Args:
+        sessions: Sessions, or a QA table already built from them
+    
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: Questions per 'YYYY-MM-DD' day in
+            ascending order, each with ``time``, ``time_str``, ``original``,
+            ``summary``, ``session_theme`` and ``session_filename``
+    """
+    table = sessions if isinstance(sessions, QATable) else QATable.from_sessions(sessions)
+    daily_questions = {}
+    
+    # Rows of a day are already ordered by their rounded time
+    for day, rows in table.iter_day_rows():
+        questions = []
+        for row in rows:
+            if not table.flags[row] & HAS_QUESTION:
+                continue
+            
+            question = table.questions[row].strip()
+            rounded_time = table.bucket_time(row)
+            session = table.session[row]
+            questions.append({
+                'time': rounded_time,
+                'time_str': rounded_time.strftime('%H:%M'),
+                'original': question,
+                'summary': table.summaries[row],
+                'session_theme': table.themes[session],
+                'session_filename': table.filenames[session]
+            })
+        if questions:
+            daily_questions[day.strftime('%Y-%m-%d')] = questions
+    
+    return daily_questions
+
+
+class DailyInsights:
+    """Grouped daily questions with filtering and day-level pagination.
+    
+    The grouping is done once per data version; queries then only walk
+    the prepared days. For search, each question keeps a lowercase copy
+    of its searchable text and each day one joined copy of all of them,
+    so days without a match are skipped with a single substring test.
+    """
+    
+    def __init__(self, daily_questions: Dict[str, List[Dict[str, Any]]]):
+        """Initialize from the output of ``group_questions_by_date_and_time``.
+        
+        Args:
+            daily_questions: Questions per 'YYYY-MM-DD' day
+        """
+        self.dates: List[str] = sorted(daily_questions)
+        self.days: List[List[Dict[str, Any]]] = []
+        self._haystacks: List[List[str]] = []
+        self._day_haystacks: List[str] = []
+        
+        for day in self.dates:
+            questions = [_serialize(question) for question in daily_questions[day]]
+            haystacks = [
+                '\n'.join((question['summary'], question['original'], question['session_theme'])).lower()
+                for question in daily_questions[day]
+            ]
+            self.days.append(questions)
+            self._haystacks.append(haystacks)
+            self._day_haystacks.append('\0'.join(haystacks))
+        
+        self.total_questions = sum(len(questions) for questions in self.days)
+    
+    @classmethod
+    def from_table(cls, table: QATable) -> 'DailyInsights':
+        """Build daily insights from a QA table."""
+        return cls(group_questions_by_date_and_time(table))
+    
+    def query(self, start: Optional[date] = None, end: Optional[date] = None, search: Optional[str] = None,
+              limit: Optional[int] = None, offset: int = 0, descending: bool = False) -> Dict[str, Any]:
+        """Filter days and questions and return one page of days.
+        
+        Args:
+            start: First day to include
+            end: Last day to include
+            search: Case-insensitive text matched against summary, question and theme
+            limit: Maximum number of days to return, or None for all
+            offset: Number of matching days to skip
+            descending: Return the newest days first
+        
+        Returns:
+            Dict[str, Any]: ``total_days`` and ``total_questions`` over all
+                matching days, the page's ``offset``, ``limit`` and ``days``,
+                each with ``date``, ``question_count`` and ``questions``
+        """
+        # Dates are sorted, so the range is a slice
+        first = bisect_left(self.dates, start.isoformat()) if start else 0
+        last = bisect_right(self.dates, end.isoformat()) if end else len(self.dates)
+        
+        query = search.strip().lower() if search else ''
+        matches: List[Tuple[int, List[Dict[str, Any]]]] = []
+        for i in range(first, last):
+            if not query:
+                matches.append((i, self.days[i]))
+            elif query in self._day_haystacks[i]:
+                questions = [question for question, haystack in zip(self.days[i], self._haystacks[i])
+                             if query in haystack]
+                if questions:
+                    matches.append((i, questions))
+        
+        if descending:
+            matches.reverse()
+        page = matches[offset:] if limit is None else matches[offset:offset + limit]
+        
+        return {
+            "total_days": len(matches),
+            "total_questions": sum(len(questions) for _, questions in matches),
+            "offset": offset,
+            "limit": limit,
+            "days": [
+                {"date": self.dates[i], "question_count": len(questions), "questions": questions}
+                for i, questions in page
+            ]
+        }
+    
+    def diff(self, previous: Optional['DailyInsights']) -> Dict[str, Any]:
+        """Get the days that changed since an earlier version.
+        
+        Args:
+            previous: Insights of the earlier data version, or None
+        
+        Returns:
+            Dict[str, Any]: ``days`` added or changed, in full and ascending
+                order, the ``removed_days`` dates and the new
+                ``total_days`` and ``total_questions``
+        """
+        before = dict(zip(previous.dates, previous.days)) if previous is not None else {}
+        changed = [
+            {"date": day, "question_count": len(questions), "questions": questions}
+            for day, questions in zip(self.dates, self.days)
+            if before.get(day) != questions
+        ]
+        current = set(self.dates)
+        return {
+            "days": changed,
+            "removed_days": sorted(day for day in before if day not in current),
+            "total_days": len(self.dates),
+            "total_questions": self.total_questions
+        }
+
+
+def _serialize(question: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a grouped question to its JSON form."""
+    original = question['original']
+    if len(original) > ORIGINAL_PREVIEW_LENGTH:
+        original = original[:ORIGINAL_PREVIEW_LENGTH] + "..."
+    return {
+        "time": question['time'].isoformat(),
+        "time_str": question['time_str'],
+        "summary": question['summary'],
+        "original": original,
+        "session_theme": question['session_theme'],
+        "session_filename": question['session_filename']
+    }
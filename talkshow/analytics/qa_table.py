@@ -0,0 +1,311 @@
+"""Columnar in-memory table of QA pairs for analytics."""
+
+from array import array
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..models.chat import ChatSession, LazyChatSession
+
+
+# Bits of the flags column
+QUESTION_SUMMARY = 1
+ANSWER_SUMMARY = 2
+HAS_TIMESTAMP = 4
+HAS_QUESTION = 8
+NAIVE_TIME = 16
+
+# Byte translation tables that map a flags byte to 1 when a bit is set
+_FLAG_MASKS = {bit: bytes(1 if value & bit else 0 for value in range(256))
+               for bit in (QUESTION_SUMMARY, ANSWER_SUMMARY, HAS_TIMESTAMP, HAS_QUESTION, NAIVE_TIME)}
+
+# Characters of each answer kept for previews
+ANSWER_PREVIEW_LENGTH = 100
+
+EPOCH = date(1970, 1, 1)
+
+
+class QATable:
+    """All QA pairs of an archive as parallel typed arrays.
+    
+    Each QA pair is one row; columns are ``array`` objects holding the
+    session index, position in the session, effective time (the QA
+    timestamp, else the session start) as epoch seconds and its UTC
+    offset, text lengths, a bit set of flags, the day of the session
+    start and the half-hour bucket of the QA time. Lists hold the
+    question, its summary (the stripped question if there is none), the
+    answer summary and the first ``ANSWER_PREVIEW_LENGTH`` characters of
+    the answer, so that no session has to be decoded again to show a
+    row. Days and buckets are computed on the wall clock of each
+    timestamp, as the parser recorded it, or in the fixed local time
+    given by ``utc_offset``.
+    
+    The table is built once per data version. Aggregates then run over
+    the raw column buffers instead of over QAPair objects, and the rows
+    ordered by day and bucket are computed once and shared by all
+    day-level queries.
+    """
+    
+    def __init__(self, utc_offset: Optional[int] = None):
+        """Initialize an empty table.
+        
+        Args:
+            utc_offset: Minutes east of UTC used for days, half-hour buckets and
+                returned times, or None to use the offset of each timestamp
+        """
+        self.utc_offset = utc_offset
+        
+        # Per-session columns; sessions without QA pairs have no rows
+        self.filenames: List[str] = []
+        self.themes: List[str] = []
+        self.session_ctime = array('d')
+        self.session_offset = array('l')
+        self.session_flags = array('B')
+        self.first_row = array('l')
+        
+        # Per-QA columns
+        self.session = array('l')
+        self.position = array('l')
+        self.timestamp = array('d')
+        self.offset = array('l')
+        self.question_length = array('l')
+        self.answer_length = array('l')
+        self.flags = array('B')
+        self.day = array('l')
+        self.bucket = array('q')
+        self.questions: List[str] = []
+        self.summaries: List[str] = []
+        self.answer_summaries: List[Optional[str]] = []
+        self.answer_previews: List[str] = []
+        
+        self._stats: Optional[Dict[str, Any]] = None
+        self._days: Optional[Tuple[array, array, array]] = None
+    
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[ChatSession], utc_offset: Optional[int] = None) -> 'QATable':
+        """Build a table from sessions.
+        
+        Args:
+            sessions: Sessions in the order rows should refer to them
+            utc_offset: Minutes east of UTC used for days, half-hour buckets and
+                returned times, or None to use the offset of each timestamp
+        
+        Returns:
+            QATable: The populated table
+        """
+        table = cls(utc_offset)
+        for session in sessions:
+            table.add_session(session)
+        return table
+    
+    def __len__(self) -> int:
+        return len(self.session)
+    
+    @property
+    def session_count(self) -> int:
+        """Number of sessions in the table."""
+        return len(self.filenames)
+    
+    def add_session(self, session: ChatSession) -> None:
+        """Append one session and the rows of its QA pairs.
+        
+        Sessions whose QA pairs have not been decoded yet are read from
+        their serialized records, without building QAPair objects.
+        """
+        rows = list(_qa_rows(session))
+        index = len(self.filenames)
+        ctime, ctime_offset = _epoch(session.meta.ctime)
+        
+        self.filenames.append(session.meta.filename)
+        self.themes.append(session.meta.theme)
+        self.session_ctime.append(ctime)
+        self.session_offset.append(self.utc_offset if self.utc_offset is not None else ctime_offset or 0)
+        self.session_flags.append(NAIVE_TIME if self.utc_offset is None and ctime_offset is None else 0)
+        self.first_row.append(len(self))
+        self._stats = None
+        if not rows:
+            return
+        
+        if rows[0][2] is not None:
+            start, start_offset = rows[0][2], rows[0][3]
+        else:
+            start, start_offset = ctime, ctime_offset
+        if self.utc_offset is not None:
+            start_offset = self.utc_offset
+        day = int((start + (start_offset or 0) * 60) // 86400)
+        
+        naive_start = start_offset is None
+        for position, (question, answer, timestamp, offset, summary, answer_summary) in enumerate(rows):
+            stripped = question.strip()
+            flags = (
+                (QUESTION_SUMMARY if summary else 0)
+                | (ANSWER_SUMMARY if answer_summary else 0)
+                | (HAS_TIMESTAMP if timestamp is not None else 0)
+                | (HAS_QUESTION if stripped else 0)
+            )
+            if timestamp is None:
+                timestamp, offset, naive = start, start_offset, naive_start
+            else:
+                naive = offset is None
+            if self.utc_offset is not None:
+                offset = self.utc_offset
+            elif naive:
+                # Naive times stay naive when turned back into datetimes
+                flags |= NAIVE_TIME
+            offset = offset or 0
+            
+            self.session.append(index)
+            self.position.append(position)
+            self.timestamp.append(timestamp)
+            self.offset.append(offset)
+            self.question_length.append(len(question))
+            self.answer_length.append(len(answer))
+            self.flags.append(flags)
+            self.day.append(day)
+            # :00-:15 rounds down to the hour, :16-:45 to the half hour, :46-:59 up to the next hour
+            self.bucket.append((int(timestamp // 60) + offset + 14) // 30 * 30)
+            self.questions.append(question)
+            self.summaries.append(summary or stripped)
+            self.answer_summaries.append(answer_summary or None)
+            self.answer_previews.append(answer[:ANSWER_PREVIEW_LENGTH])
+        
+        self._days = None
+    
+    def session_rows(self, index: int) -> range:
+        """Get the rows of a session."""
+        end = self.first_row[index + 1] if index + 1 < len(self.first_row) else len(self)
+        return range(self.first_row[index], end)
+    
+    def session_time(self, index: int) -> datetime:
+        """Get the creation time of a session in the time zone it was recorded in."""
+        return _datetime(self.session_ctime[index], self.session_offset[index],
+                         bool(self.session_flags[index] & NAIVE_TIME))
+    
+    def qa_time(self, row: int) -> datetime:
+        """Get the effective time of a row in the time zone it was recorded in."""
+        return _datetime(self.timestamp[row], self.offset[row], bool(self.flags[row] & NAIVE_TIME))
+    
+    def count_flag(self, bit: int) -> int:
+        """Count rows with a flag bit set, e.g. ``QUESTION_SUMMARY``."""
+        return self.flags.tobytes().translate(_FLAG_MASKS[bit]).count(1)
+    
+    def date_range(self) -> Tuple[Optional[datetime], Optional[datetime]]:
+        """Get the earliest and latest of all session creation times and QA times."""
+        if not self.session_count:
+            return None, None
+        return self._extreme_time(min), self._extreme_time(max)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get archive-wide counts and the overall date range.
+        
+        Returns:
+            Dict[str, Any]: ``total_sessions``, ``total_qa_pairs``,
+                ``question_summaries``, ``answer_summaries``,
+                ``average_qa_per_session`` and ``date_range``, as
+                ``/api/stats`` reports them
+        """
+        if self._stats is None:
+            total_sessions = self.session_count
+            total_qa_pairs = len(self)
+            start, end = self.date_range()
+            self._stats = {
+                "total_sessions": total_sessions,
+                "total_qa_pairs": total_qa_pairs,
+                "question_summaries": self.count_flag(QUESTION_SUMMARY),
+                "answer_summaries": self.count_flag(ANSWER_SUMMARY),
+                "average_qa_per_session": round(total_qa_pairs / total_sessions, 1) if total_sessions else 0,
+                "date_range": {
+                    "start": start.isoformat() if start else None,
+                    "end": end.isoformat() if end else None
+                }
+            }
+        return self._stats
+    
+    def iter_day_rows(self, first: int = 0, last: Optional[int] = None) -> Iterator[Tuple[date, array]]:
+        """Yield each day with its rows ordered by half-hour bucket.
+        
+        Rows in the same bucket keep their session and position order.
+        
+        Args:
+            first: Index of the first day to yield, in ascending day order
+            last: Index after the last day to yield
+        
+        Returns:
+            Iterator[Tuple[date, array]]: The day and the row indices of its QA pairs
+        """
+        day_numbers, starts, order = self._day_index()
+        last = len(day_numbers) if last is None else min(last, len(day_numbers))
+        for i in range(max(first, 0), last):
+            yield EPOCH + timedelta(days=day_numbers[i]), order[starts[i]:starts[i + 1]]
+    
+    def bucket_time(self, row: int) -> datetime:
+        """Get the rounded half-hour time of a row in the time zone it was bucketed in."""
+        wall = datetime(1970, 1, 1) + timedelta(minutes=self.bucket[row])
+        if self.flags[row] & NAIVE_TIME:
+            return wall
+        offset = self.offset[row]
+        return wall.replace(tzinfo=timezone(timedelta(minutes=offset)) if offset else timezone.utc)
+    
+    def _extreme_time(self, pick) -> datetime:
+        """Get the creation or QA time chosen by ``min`` or ``max`` over the whole time columns."""
+        ctime = pick(self.session_ctime)
+        if len(self):
+            qa_time = pick(self.timestamp)
+            # Creation times win ties, as they come first in each session
+            if pick(ctime, qa_time) != ctime:
+                return self.qa_time(self.timestamp.index(qa_time))
+        return self.session_time(self.session_ctime.index(ctime))
+    
+    def _day_index(self) -> Tuple[array, array, array]:
+        """Sort rows by day and rounded time once and record where each day starts."""
+        if self._days is None:
+            # Within a day rows are ordered by the instant of their rounded time
+            day = self.day
+            instants = [b - m for b, m in zip(self.bucket, self.offset)]
+            base = min(instants) if instants else 0
+            keys = [(d << 32) | (t - base) for d, t in zip(day, instants)]
+            order = array('l', sorted(range(len(keys)), key=keys.__getitem__))
+            
+            day_numbers = array('l')
+            starts = array('l')
+            previous = None
+            for i, row in enumerate(order):
+                if day[row] != previous:
+                    previous = day[row]
+                    day_numbers.append(previous)
+                    starts.append(i)
+            starts.append(len(order))
+            self._days = (day_numbers, starts, order)
+        return self._days
+
+
+def _epoch(dt: datetime) -> Tuple[float, Optional[int]]:
+    """Convert a datetime to epoch seconds and its UTC offset in minutes.
+    
+    Naive values are read as UTC and have no offset (None).
+    """
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc).timestamp(), None
+    offset = dt.utcoffset()
+    return dt.timestamp(), int(offset.total_seconds() // 60) if offset else 0
+
+
+def _datetime(seconds: float, offset: int, naive: bool) -> datetime:
+    """Convert epoch seconds back to a datetime with a UTC offset in minutes, or a naive one."""
+    if naive:
+        return datetime(1970, 1, 1) + timedelta(seconds=seconds)
+    return datetime.fromtimestamp(seconds, timezone(timedelta(minutes=offset)) if offset else timezone.utc)
+
+
+def _qa_rows(session: ChatSession) -> Iterator[Tuple[str, str, Optional[float], Optional[int],
+                                                     Optional[str], Optional[str]]]:
+    """Yield (question, answer, timestamp, UTC offset, question summary, answer summary) per QA pair."""
+    if isinstance(session, LazyChatSession) and not session.is_loaded:
+        for qa in session.to_dict()['qa_pairs']:
+            timestamp = qa['timestamp']
+            yield (qa['question'], qa['answer'],
+                   *(_epoch(datetime.fromisoformat(timestamp)) if timestamp else (None, None)),
+                   qa.get('question_summary'), qa.get('answer_summary'))
+    else:
+        for qa in session.qa_pairs:
+            yield (qa.question, qa.answer, *(_epoch(qa.timestamp) if qa.timestamp else (None, None)),
+                   qa.question_summary, qa.answer_summary)
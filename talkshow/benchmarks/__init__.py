@@ -0,0 +1,13 @@
+"""Performance benchmarks for TalkShow components."""
+
+from .corpus import generate_corpus
+from .memory import measure_footprint
+from .throughput import run_benchmarks
+from .time_extraction import measure_time_extraction
+
+__all__ = [
+    "generate_corpus",
+    "measure_footprint",
+    "measure_time_extraction",
+    "run_benchmarks",
+]
\ No newline at end of file
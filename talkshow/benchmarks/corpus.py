@@ -0,0 +1,168 @@
+"""Deterministic synthetic SpecStory history for benchmarks.
+
+Files look like the ones the SpecStory extension writes: a generated
+header, then alternating ``_**User**_`` and ``_**Assistant**_``
+sections separated by ``---``. Answers mix English and Chinese prose,
+fenced code blocks and, now and then, the output of a datetime command
+that the parsers take the QA timestamp from. The same arguments always
+produce byte-identical files. Generate a corpus with::
+
+    python -m talkshow.benchmarks.corpus DIRECTORY [files] [turns]
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List
+
+from ..parser.stream_parser import ASSISTANT_MARKER, SEPARATOR, USER_MARKER
+
+
+_TOPICS = [
+    "refactor-storage-layer", "debug-parser", "add-search-index", "fix-timezone-handling",
+    "speed-up-timeline", "llm-summary-retries", "sqlite-migration", "web-compression",
+]
+
+_WORDS = (
+    "the storage layer keeps every session in one file so each request reads it again "
+    "we can cache the parsed sessions per data version and rebuild the index only when "
+    "the manifest says a history file changed while the parser streams lines into a "
+    "state machine and emits question answer pairs as soon as they are complete"
+).split()
+
+_CJK_PHRASES = [
+    "可以先抽象出存储接口", "再逐步迁移调用方", "最后替换实现", "解析器按行读取文件",
+    "每个问答对都有时间戳", "缓存按数据版本失效", "增量解析只处理变化的文件", "摘要由大模型生成",
+    "搜索索引支持中文分词", "时间轴按半小时分组",
+]
+
+_CODE_LINES = [
+    "def load_sessions(path):",
+    "    with open(path, encoding='utf-8') as f:",
+    "        return [json.loads(line) for line in f]",
+    "for session in sessions:",
+    "    storage.save_session(session)",
+    "result = indexer.run(history_dir)",
+    "print(f\"parsed {len(result.parsed)} files\")",
+    "timestamps = sorted(set(timestamps))",
+]
+
+
+def _sentence(rng: random.Random, cjk_ratio: float) -> str:
+    """One sentence, Chinese with probability ``cjk_ratio``."""
+    if rng.random() < cjk_ratio:
+        return "，".join(rng.choice(_CJK_PHRASES) for _ in range(rng.randint(2, 4))) + "。"
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 18))]
+    return " ".join(words).capitalize() + "."
+
+
+def _question(rng: random.Random, cjk_ratio: float) -> str:
+    """A short user question."""
+    if rng.random() < cjk_ratio:
+        return "如何" + rng.choice(_CJK_PHRASES) + "？" + _sentence(rng, 0.0)
+    return "How can " + " ".join(rng.choice(_WORDS) for _ in range(rng.randint(5, 12))) + "?"
+
+
+def _code_block(rng: random.Random) -> str:
+    """A fenced code block of a few lines."""
+    lines = [rng.choice(_CODE_LINES) for _ in range(rng.randint(3, 12))]
+    return "```python\n" + "\n".join(lines) + "\n```"
+
+
+def _answer(rng: random.Random, timestamp: datetime, answer_chars: int, code_ratio: float,
+            cjk_ratio: float) -> str:
+    """An assistant answer of about ``answer_chars`` characters."""
+    blocks = []
+    if rng.random() < 0.5:
+        blocks.append('```bash\npython -c "from datetime import datetime;print(datetime.now())"\n```')
+        blocks.append(f"```\n{timestamp.isoformat(' ')}\n```")
+    
+    target = max(1, int(answer_chars * rng.uniform(0.5, 1.5)))
+    size = 0
+    while size < target:
+        if rng.random() < code_ratio:
+            block = _code_block(rng)
+        else:
+            block = " ".join(_sentence(rng, cjk_ratio) for _ in range(rng.randint(2, 5)))
+        blocks.append(block)
+        size += len(block)
+    return "\n\n".join(blocks)
+
+
+def make_session_markdown(index: int, turns: int = 20, answer_chars: int = 1500, code_ratio: float = 0.3,
+                          cjk_ratio: float = 0.3, seed: int = 0) -> str:
+    """Build the markdown of one synthetic session.
+    
+    Args:
+        index: Position of the file in the corpus; seeds its content
+        turns: Question and answer pairs in the file
+        answer_chars: Mean answer length in characters
+        code_ratio: Probability that an answer paragraph is a code block
+        cjk_ratio: Probability that a sentence is Chinese
+        seed: Corpus seed
+    
+    Returns:
+        str: The file content
+    """
+    rng = random.Random(seed * 1000003 + index)
+    timestamp = session_ctime(index)
+    parts = ["<!-- Generated by SpecStory -->", "", f"# Chat {index}", "", SEPARATOR, ""]
+    for _ in range(turns):
+        timestamp += timedelta(seconds=rng.randint(30, 900), microseconds=rng.randint(0, 999999))
+        parts += [USER_MARKER, "", _question(rng, cjk_ratio), "", SEPARATOR, ""]
+        parts += [ASSISTANT_MARKER, "", _answer(rng, timestamp, answer_chars, code_ratio, cjk_ratio), "",
+                  SEPARATOR, ""]
+    return "\n".join(parts)
+
+
+def session_ctime(index: int) -> datetime:
+    """Creation time of the ``index``-th synthetic session."""
+    return datetime(2025, 7, 1, 8, 0) + timedelta(hours=5 * index, minutes=7 * index % 60)
+
+
+def session_filename(index: int) -> str:
+    """SpecStory file name of the ``index``-th synthetic session."""
+    return f"{session_ctime(index):%Y-%m-%d_%H-%M}Z-{_TOPICS[index % len(_TOPICS)]}-{index}.md"
+
+
+def generate_corpus(directory: Path, files: int = 50, turns: int = 20, answer_chars: int = 1500,
+                    code_ratio: float = 0.3, cjk_ratio: float = 0.3, seed: int = 0) -> List[Path]:
+    """Write a synthetic history directory.
+    
+    Args:
+        directory: Directory to write the markdown files to; created if missing
+        files: Number of session files
+        turns: Question and answer pairs per file
+        answer_chars: Mean answer length in characters
+        code_ratio: Probability that an answer paragraph is a code block
+        cjk_ratio: Probability that a sentence is Chinese
+        seed: Seed; the same arguments give byte-identical files
+    
+    Returns:
+        List[Path]: Paths of the written files, in creation order
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(files):
+        path = directory / session_filename(index)
+        content = make_session_markdown(index, turns, answer_chars, code_ratio, cjk_ratio, seed)
+        path.write_bytes(content.encode('utf-8'))
+        paths.append(path)
+    return paths
+
+
+def main() -> None:
+    """Write a corpus to the directory given on the command line."""
+    if len(sys.argv) < 2:
+        print("Usage: python -m talkshow.benchmarks.corpus DIRECTORY [files] [turns]")
+        sys.exit(1)
+    files = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    turns = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    paths = generate_corpus(Path(sys.argv[1]), files, turns)
+    print(f"Wrote {len(paths)} files to {sys.argv[1]}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Per-instance memory footprint of the chat models.
+
+Compares the slotted ``QAPair`` and ``SessionMeta`` with equivalent
+plain dataclasses that keep a per-instance ``__dict__``. Run with::
+
+    python -m talkshow.benchmarks.memory [count]
+"""
+
+import gc
+import json
+import sys
+import tracemalloc
+from dataclasses import MISSING, fields, make_dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from ..models.chat import QAPair, SessionMeta
+
+
+def _unslotted(cls: type) -> type:
+    """Build a plain dataclass with the same fields as ``cls``."""
+    spec = [(f.name, f.type) if f.default is MISSING else (f.name, f.type, f.default)
+            for f in fields(cls)]
+    return make_dataclass(cls.__name__, spec)
+
+
+def _bytes_per_instance(factory: Callable[[int], Any], count: int) -> float:
+    """Measure the memory allocated per object created by ``factory``.
+    
+    The list holding the objects is excluded, so the result is the
+    object itself plus whatever it does not share with other objects.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = [factory(i) for i in range(count)]
+        allocated = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(objects)
+    finally:
+        tracemalloc.stop()
+    del objects
+    return allocated / count
+
+
+def measure_footprint(count: int = 100000) -> Dict[str, Dict[str, float]]:
+    """Measure bytes per instance of the chat models before and after slots.
+    
+    Field values are shared between instances, except for the theme,
+    which is rebuilt for every session the way decoding a stored record
+    does, so the ``SessionMeta`` figures include the effect of interning.
+    
+    Args:
+        count: Number of instances to create per measurement
+    
+    Returns:
+        Dict[str, Dict[str, float]]: For each model, ``dict`` and ``slots``
+            bytes per instance and the ``saved`` percentage
+    """
+    timestamp = datetime(2025, 7, 28, 15, 16, tzinfo=timezone.utc)
+    question, answer = "How are you?", "I'm doing well, thank you!"
+    themes: List[str] = ["talkshow-memory-benchmark", "refactor-storage-layer", "debug-parser"]
+    
+    def qa_factory(cls: type) -> Callable[[int], Any]:
+        return lambda i: cls(question, answer, timestamp, None, None)
+    
+    def meta_factory(cls: type) -> Callable[[int], Any]:
+        # A fresh copy of a repeated theme, as json.loads produces
+        return lambda i: cls("session.md", "".join(list(themes[i % len(themes)])), timestamp, 1000, 3)
+    
+    results = {}
+    for cls, factory in ((QAPair, qa_factory), (SessionMeta, meta_factory)):
+        before = _bytes_per_instance(factory(_unslotted(cls)), count)
+        after = _bytes_per_instance(factory(cls), count)
+        results[cls.__name__] = {
+            "dict": round(before, 1),
+            "slots": round(after, 1),
+            "saved": round(100 * (1 - after / before), 1)
+        }
+    return results
+
+
+def main() -> None:
+    """Print the footprint measurement as JSON."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(json.dumps({"count": count, "bytes_per_instance": measure_footprint(count)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
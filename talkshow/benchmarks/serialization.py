@@ -0,0 +1,141 @@
+"""Serialization time and bytes on the wire of the large list responses.
+
+Builds synthetic ``/api/timeline`` and ``/api/sessions/insights``
+payloads and compares FastAPI's default path for
+``response_model=List[Dict[str, Any]]`` (validate, serialize, then
+``json.dumps``) with ``talkshow.web.responses.dumps``, and the body
+size without compression, with gzip and, if installed, with Brotli.
+Run with::
+
+    python -m talkshow.benchmarks.serialization [sessions]
+"""
+
+import json
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+
+from ..web.compression import compressed_sizes
+from ..web.responses import dumps, orjson
+
+
+def make_payloads(session_count: int, qa_per_session: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+    """Build deterministic timeline and insights payloads.
+    
+    Args:
+        session_count: Number of synthetic sessions
+        qa_per_session: QA pairs per session
+    
+    Returns:
+        Dict[str, List[Dict[str, Any]]]: ``timeline`` and ``insights`` items
+            shaped like the responses of the web API
+    """
+    start = datetime(2025, 7, 1, 9, 0, tzinfo=timezone.utc)
+    timeline, insights = [], []
+    for s in range(session_count):
+        filename = f"{(start + timedelta(hours=s)).strftime('%Y-%m-%d_%H-%M')}Z-refactor-storage-layer-{s}.md"
+        theme = f"refactor-storage-layer-{s % 50}"
+        session_time = start + timedelta(hours=s)
+        timeline.append({
+            "filename": filename,
+            "theme": theme,
+            "time": session_time.isoformat(),
+            "qa_count": qa_per_session,
+            "type": "session_start",
+            "summary": f"{theme} ({qa_per_session} Q&As)"
+        })
+        qa_pairs = []
+        for i in range(qa_per_session):
+            timestamp = (session_time + timedelta(minutes=3 * i)).isoformat()
+            question = f"如何在第{i}步重构存储层并保持 JSONStorage 的接口兼容？ step {i} of session {s}"
+            timeline.append({
+                "filename": filename,
+                "theme": theme,
+                "time": timestamp,
+                "qa_index": i,
+                "type": "qa_pair",
+                "question": question[:50] + "...",
+                "answer": "可以先抽象出 StorageInterface，再逐步迁移调用方，最后替换实现。" * 2
+            })
+            qa_pairs.append({"question": question, "question_summary": f"重构存储层第{i}步", "timestamp": timestamp})
+        insights.append({
+            "filename": filename,
+            "theme": theme,
+            "markdown_filename": filename,
+            "created_time": session_time.isoformat(),
+            "qa_pairs": qa_pairs
+        })
+    return {"timeline": timeline, "insights": insights}
+
+
+def _default_render() -> Callable[[Any], bytes]:
+    """FastAPI's response path for a List[Dict[str, Any]] response model."""
+    try:
+        from pydantic import TypeAdapter
+    except ImportError:  # pydantic v1
+        from fastapi.encoders import jsonable_encoder
+        
+        def render(payload: Any) -> bytes:
+            return JSONResponse(jsonable_encoder(payload)).body
+        return render
+    
+    adapter = TypeAdapter(List[Dict[str, Any]])
+    
+    def render(payload: Any) -> bytes:
+        validated = adapter.validate_python(payload)
+        return JSONResponse(adapter.dump_python(validated, mode='json')).body
+    return render
+
+
+def _best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Best wall time of several runs, in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 2)
+
+
+def measure_serialization(session_count: int = 500, repeat: int = 5) -> Dict[str, Dict[str, Any]]:
+    """Measure serialization time and encoded sizes for each payload.
+    
+    Args:
+        session_count: Number of synthetic sessions
+        repeat: Runs per timing; the best run is reported
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: For each payload, the item count,
+            ``default_ms`` and ``fast_ms`` serialization times and
+            ``bytes`` per content encoding
+    """
+    default_render = _default_render()
+    results = {}
+    for name, payload in make_payloads(session_count).items():
+        body = dumps(payload)
+        if json.loads(body) != json.loads(default_render(payload)):
+            raise RuntimeError(f"The fast encoder disagrees with FastAPI's on the {name} payload")
+        results[name] = {
+            "items": len(payload),
+            "default_ms": _best_time(lambda: default_render(payload), repeat),
+            "fast_ms": _best_time(lambda: dumps(payload), repeat),
+            "bytes": dict(compressed_sizes(body))
+        }
+    return results
+
+
+def main() -> None:
+    """Print the serialization measurement as JSON."""
+    session_count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(json.dumps({
+        "sessions": session_count,
+        "encoder": "orjson" if orjson is not None else "json",
+        "payloads": measure_serialization(session_count)
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""Throughput and peak memory of parsing, storage, models and the web API.
+
+Generates a synthetic SpecStory corpus (see ``corpus``) in a temporary
+directory and measures, each in its own worker process so that peak
+RSS is attributable:
+
+- ``parse_file``: ``MDParser.parse_file`` over every file
+- ``stream_parse_file``: the same with ``StreamingMDParser``
+- ``parse_directory``: ``MDParser.parse_directory`` with ``jobs`` workers
+- ``storage_save`` / ``storage_load``: ``JSONStorage`` writing all
+  sessions and loading them with their QA pairs decoded
+- ``to_dict`` / ``from_dict``: ``ChatSession`` conversion
+- ``api``: the first request to each GET endpoint, then repeated
+  requests served from the response cache and ones that bypass it
+  (the two match for pages and markdown, which are never cached)
+
+Throughput is reported as MB/s of markdown or JSON handled and QA
+pairs per second, peak RSS in MB. Run with ``talkshow bench`` or::
+
+    python -m talkshow.benchmarks.throughput [files] [turns]
+"""
+
+import contextlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from ..models.chat import ChatSession
+from ..parser.md_parser import MDParser
+from ..parser.stream_parser import StreamingMDParser
+from ..storage.json_storage import JSONStorage
+from .corpus import generate_corpus
+
+
+BENCHMARKS = (
+    "parse_file", "stream_parse_file", "parse_directory", "storage_save", "storage_load",
+    "to_dict", "from_dict", "api",
+)
+
+# GET endpoints measured by the api benchmark; {filename} is the corpus' first session
+API_PATHS = (
+    "/", "/api/sessions", "/api/sessions/insights", "/api/insights/daily", "/api/stats",
+    "/api/timeline", "/api/search?q=storage", "/api/sessions/{filename}", "/api/markdown/{filename}",
+    "/view/{filename}",
+)
+
+_MB = 1024 * 1024
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process and its finished children, in MB."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return round(peak * scale / _MB, 1)
+
+
+def _best_time(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """Best wall time of several runs in seconds, with the last result."""
+    best, result = float('inf'), None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _rates(seconds: float, size: int, qa_count: int) -> Dict[str, float]:
+    """Throughput figures of one timed run."""
+    seconds = max(seconds, 1e-9)
+    return {
+        "seconds": round(seconds, 4),
+        "mb_per_s": round(size / _MB / seconds, 2),
+        "qa_per_s": round(qa_count / seconds, 1)
+    }
+
+
+def _parse_all(history: Path, parser: MDParser) -> List[ChatSession]:
+    """Parse every file of the corpus one after another."""
+    sessions = [parser.parse_file(str(path)) for path in sorted(history.glob("*.md"))]
+    return [session for session in sessions if session]
+
+
+def _qa_count(sessions: Sequence[ChatSession]) -> int:
+    """Total number of QA pairs."""
+    return sum(len(session.qa_pairs) for session in sessions)
+
+
+def _measure(name: str, root: Path, repeat: int, jobs: int) -> Dict[str, Any]:
+    """Run one benchmark against the corpus under ``root``."""
+    history = root / "history"
+    markdown_size = sum(path.stat().st_size for path in history.glob("*.md"))
+    baseline = peak_rss_mb()
+    
+    if name in ("parse_file", "stream_parse_file", "parse_directory"):
+        if name == "parse_directory":
+            seconds, sessions = _best_time(lambda: MDParser().parse_directory(str(history), jobs=jobs), repeat)
+        else:
+            parser = StreamingMDParser() if name == "stream_parse_file" else MDParser()
+            seconds, sessions = _best_time(lambda: _parse_all(history, parser), repeat)
+        result = _rates(seconds, markdown_size, _qa_count(sessions))
+    elif name == "api":
+        result = {"endpoints": _measure_api(root, _parse_all(history, MDParser()), repeat)}
+    else:
+        sessions = _parse_all(history, MDParser())
+        qa_count = _qa_count(sessions)
+        records = [session.to_dict() for session in sessions]
+        json_size = len(json.dumps(records, ensure_ascii=False, default=str).encode('utf-8'))
+        
+        if name == "to_dict":
+            seconds, _ = _best_time(lambda: [session.to_dict() for session in sessions], repeat)
+        elif name == "from_dict":
+            seconds, _ = _best_time(lambda: [ChatSession.from_dict(record) for record in records], repeat)
+        else:
+            storage_path = root / "bench" / "sessions.json"
+            
+            def save() -> None:
+                for path in storage_path.parent.glob("sessions.json*"):
+                    path.unlink()
+                JSONStorage(str(storage_path)).save_sessions(sessions)
+            
+            def load() -> int:
+                # Stored sessions decode their QA pairs lazily; count them to force it
+                return _qa_count(JSONStorage(str(storage_path)).load_all_sessions())
+            
+            save()
+            json_size = storage_path.stat().st_size
+            seconds, loaded = _best_time(save if name == "storage_save" else load, repeat)
+            if name == "storage_load" and loaded != qa_count:
+                raise RuntimeError(f"Loaded {loaded} QA pairs, expected {qa_count}")
+        result = _rates(seconds, json_size, qa_count)
+    
+    result["baseline_rss_mb"] = baseline
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def _measure_api(root: Path, sessions: List[ChatSession], repeat: int) -> Dict[str, Dict[str, Any]]:
+    """Time each GET endpoint of the web app against the parsed corpus.
+    
+    The app reads its configuration when imported, so storage paths are
+    pointed at the corpus through the environment first and the working
+    directory is the corpus root, where ``history/`` is looked up.
+    """
+    os.environ["TALKSHOW_DATA_FILE"] = str(root / "api" / "sessions.json")
+    os.environ["TALKSHOW_JSONL_FILE"] = str(root / "api" / "sessions.jsonl")
+    os.environ["TALKSHOW_DB_FILE"] = str(root / "api" / "sessions.db")
+    os.chdir(root)
+    
+    from fastapi.testclient import TestClient
+    from ..config.manager import ConfigManager
+    from ..storage.factory import create_storage
+    create_storage(ConfigManager()).save_sessions(sessions)
+    from ..web.app import app
+    
+    client = TestClient(app)
+    filename = quote(sessions[0].meta.filename) if sessions else ""
+    requests = max(10, repeat * 10)
+    results = {}
+    for template in API_PATHS:
+        path = template.format(filename=filename)
+        started = time.perf_counter()
+        response = _get(client, path)
+        first = time.perf_counter() - started
+        
+        # Repeating a URL is answered from the response cache; a query
+        # parameter no endpoint reads makes every request run the handler
+        separator = '&' if '?' in path else '?'
+        cached, _ = _best_time(lambda: [_get(client, path) for _ in range(requests)], 1)
+        uncached, _ = _best_time(lambda: [_get(client, f"{path}{separator}_bench={i}") for i in range(requests)], 1)
+        results[template] = {
+            "bytes": len(response.content),
+            "first_ms": round(first * 1000, 2),
+            "cached_requests_per_s": round(requests / max(cached, 1e-9), 1),
+            "uncached_requests_per_s": round(requests / max(uncached, 1e-9), 1)
+        }
+    return results
+
+
+def _get(client, path: str):
+    """GET a path, failing the benchmark on any status but 200."""
+    response = client.get(path)
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} returned {response.status_code}")
+    return response
+
+
+def _measure_quietly(name: str, root: Path, repeat: int, jobs: int) -> Dict[str, Any]:
+    """Worker process entry point; progress output goes to stderr, not into the JSON."""
+    with contextlib.redirect_stdout(sys.stderr):
+        return _measure(name, root, repeat, jobs)
+
+
+def run_benchmarks(names: Optional[Sequence[str]] = None, files: int = 50, turns: int = 20,
+                   answer_chars: int = 1500, code_ratio: float = 0.3, cjk_ratio: float = 0.3,
+                   seed: int = 0, repeat: int = 3, jobs: int = 1) -> Dict[str, Any]:
+    """Generate a corpus and run the selected benchmarks on it.
+    
+    Args:
+        names: Benchmarks to run, by default all of ``BENCHMARKS``
+        files: Number of session files in the corpus
+        turns: Question and answer pairs per file
+        answer_chars: Mean answer length in characters
+        code_ratio: Probability that an answer paragraph is a code block
+        cjk_ratio: Probability that a sentence is Chinese
+        seed: Corpus seed
+        repeat: Runs per timing; the best run is reported
+        jobs: Worker processes for ``parse_directory``
+    
+    Returns:
+        Dict[str, Any]: The ``environment``, the ``corpus`` parameters with
+            its size, and one entry per benchmark under ``benchmarks``
+    
+    Raises:
+        ValueError: If a benchmark name is unknown
+    """
+    names = list(names or BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {', '.join(unknown)}")
+    
+    with tempfile.TemporaryDirectory(prefix="talkshow-bench-") as tmp:
+        root = Path(tmp)
+        paths = generate_corpus(root / "history", files, turns, answer_chars, code_ratio, cjk_ratio, seed)
+        corpus = {
+            "files": files,
+            "turns": turns,
+            "answer_chars": answer_chars,
+            "code_ratio": code_ratio,
+            "cjk_ratio": cjk_ratio,
+            "seed": seed,
+            "bytes": sum(path.stat().st_size for path in paths)
+        }
+        
+        results = {}
+        for name in names:
+            # A fresh process per benchmark, so its peak RSS is its own
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                try:
+                    results[name] = executor.submit(_measure_quietly, name, root, repeat, jobs).result()
+                except Exception as e:
+                    results[name] = {"error": f"{type(e).__name__}: {e}"}
+    
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count()
+        },
+        "corpus": corpus,
+        "repeat": repeat,
+        "benchmarks": results
+    }
+
+
+def main() -> None:
+    """Print all benchmarks as JSON."""
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    turns = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(json.dumps(run_benchmarks(files=files, turns=turns), indent=2))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""Timestamp extraction time of the TimeExtractor.
+
+Compares the previous implementation (two overlapping patterns over
+the whole text with ``re.findall``, up to three ``strptime`` formats per
+match, then a set and a sort to take the first element) with the
+current one on synthetic answers: command output after a datetime
+command, prose without timestamps and log output full of them. Run
+with::
+
+    python -m talkshow.benchmarks.time_extraction [repeat]
+"""
+
+import json
+import re
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from ..parser.time_extractor import TimeExtractor
+
+
+_LEGACY_PATTERNS = [
+    r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?)',
+    r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+)',
+]
+
+_LEGACY_FORMATS = ['%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M']
+
+
+def _legacy_first_timestamp(content: str) -> Optional[datetime]:
+    """The earliest timestamp, as found before the fast path."""
+    timestamps = []
+    for pattern in _LEGACY_PATTERNS:
+        for match in re.findall(pattern, content):
+            for fmt in _LEGACY_FORMATS:
+                try:
+                    timestamps.append(datetime.strptime(match, fmt))
+                    break
+                except ValueError:
+                    continue
+    timestamps = sorted(list(set(timestamps)))
+    return timestamps[0] if timestamps else None
+
+
+def _legacy_assistant_timestamp(content: str) -> Optional[datetime]:
+    """The assistant section timestamp, as found before the fast path."""
+    found_datetime_command = False
+    for line in content.split('\n'):
+        if 'datetime' in line and ('print' in line or 'now()' in line):
+            found_datetime_command = True
+            continue
+        if found_datetime_command:
+            timestamp = _legacy_first_timestamp(line)
+            if timestamp:
+                return timestamp
+    return _legacy_first_timestamp(content)
+
+
+def make_answers(size: int = 20000) -> Dict[str, str]:
+    """Build deterministic assistant sections of roughly ``size`` characters.
+    
+    Returns:
+        Dict[str, str]: ``command``, ``prose`` and ``log`` answers
+    """
+    prose = "可以先抽象出 StorageInterface，再逐步迁移调用方，最后替换实现。 Then run the tests again.\n"
+    body = prose * (size // len(prose))
+    start = datetime(2025, 7, 28, 23, 16, 38, 431711)
+    log = "".join(f"{start + timedelta(seconds=7 * i)} INFO worker {i % 8}: indexed batch {i}\n"
+                  for i in range(size // 48))
+    return {
+        "command": ('Let me check the time.\n\n```bash\n'
+                    'python -c "from datetime import datetime;print(datetime.now())"\n```\n\n'
+                    f'```\n{start}\n```\n\n' + body),
+        "prose": body,
+        "log": log
+    }
+
+
+def _best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Best wall time of several runs, in microseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1e6, 1)
+
+
+def measure_time_extraction(size: int = 20000, repeat: int = 20) -> Dict[str, Dict[str, Any]]:
+    """Measure timestamp extraction times for each synthetic answer.
+    
+    Args:
+        size: Approximate characters per answer
+        repeat: Runs per timing; the best run is reported
+    
+    Returns:
+        Dict[str, Dict[str, Any]]: For each answer, its ``chars`` and the
+            ``legacy_us`` and ``fast_us`` times of ``extract_first_timestamp``
+            and ``extract_from_assistant_section``
+    """
+    results = {}
+    for name, content in make_answers(size).items():
+        calls: List[tuple] = [
+            ("extract_first_timestamp", _legacy_first_timestamp, TimeExtractor.extract_first_timestamp),
+            ("extract_from_assistant_section", _legacy_assistant_timestamp,
+             TimeExtractor.extract_from_assistant_section),
+        ]
+        timings: Dict[str, Any] = {"chars": len(content)}
+        for call, legacy, fast in calls:
+            if legacy(content) != fast(content):
+                raise RuntimeError(f"{call} disagrees with the previous implementation on the {name} answer")
+            timings[call] = {
+                "legacy_us": _best_time(lambda: legacy(content), repeat),
+                "fast_us": _best_time(lambda: fast(content), repeat)
+            }
+        results[name] = timings
+    return results
+
+
+def main() -> None:
+    """Print the time extraction measurement as JSON."""
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(json.dumps({"repeat": repeat, "answers": measure_time_extraction(repeat=repeat)}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
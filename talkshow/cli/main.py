@@ -5,6 +5,8 @@ TalkShow CLI Main Module
 Provides command-line interface for TalkShow functionality.
 """
 
+import json
+import os
 import click
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -16,6 +18,10 @@ from ..config.manager import ConfigManager
 
 console = Console()
 
+# Names of talkshow.benchmarks.throughput.BENCHMARKS, listed here so the CLI does not import it
+BENCHMARK_NAMES = ("parse_file", "stream_parse_file", "parse_directory", "storage_save", "storage_load",
+                   "to_dict", "from_dict", "api")
+
 # Global config manager
 config_manager = ConfigManager()
 
@@ -39,6 +45,42 @@ def save_config(config_path: Path, config: Dict[str, Any]) -> bool:
     """Save configuration to YAML file."""
     return config_manager.save_project_config(config)
 
+def create_indexer(config: Dict[str, Any], data_file: Path, use_llm: bool, jobs: Optional[int]):
+    """Create the incremental indexer used by parse and watch.
+    
+    Returns:
+        Tuple[IncrementalIndexer, Optional[SummaryCache]]: The indexer and
+        the summary cache to close when done, if caching is enabled
+    """
+    from ..parser.stream_parser import StreamingMDParser
+    from ..parser.manifest import FileManifest
+    from ..parser.incremental import IncrementalIndexer
+    from ..summarizer.rule_summarizer import RuleSummarizer
+    from ..summarizer.async_summarizer import AsyncLLMSummarizer
+    from ..summarizer.cache import SummaryCache
+    from ..storage.factory import create_storage
+    
+    # Initialize components
+    parser = StreamingMDParser()
+    storage = create_storage(config_manager, storage_path=str(data_file))
+    manifest = FileManifest.for_data_file(data_file)
+    
+    # Summaries are cached by content across sessions and runs
+    cache = None
+    cache_config = config.get("summarizer", {}).get("cache", {})
+    if cache_config.get("enabled", True):
+        cache = SummaryCache.for_data_file(data_file, max_entries=cache_config.get("max_entries", 100000))
+    
+    # Choose summarizer
+    if use_llm and config.get("summarizer", {}).get("llm", {}).get("enabled", False):
+        summarizer = AsyncLLMSummarizer(config_manager, cache=cache)
+        console.print(f"🧠 Using LLM summarization ({summarizer.concurrency} concurrent requests)")
+    else:
+        summarizer = RuleSummarizer(cache=cache)
+        console.print("📝 Using rule-based summarization")
+    
+    return IncrementalIndexer(storage, manifest, parser=parser, summarizer=summarizer, jobs=jobs), cache
+
 @click.group()
 @click.version_option(version="0.2.0")
 def cli():
@@ -119,8 +161,15 @@ def init():
 
 @cli.command()
 @click.option('--use-llm', is_flag=True, help='Use LLM for summarization')
-def parse(use_llm: bool):
-    """Parse chat history and generate JSON files."""
+@click.option('--full', is_flag=True, help='Re-parse every file, ignoring the manifest')
+@click.option('--jobs', '-j', type=int, default=None,
+              help='Number of parser processes (default: number of CPUs)')
+def parse(use_llm: bool, full: bool, jobs: Optional[int]):
+    """Parse chat history and generate JSON files.
+    
+    Only new or changed files are parsed; sessions of deleted files are
+    removed. Use --full to rebuild everything.
+    """
     console.print(Panel.fit(
         "[bold green]📁 TalkShow Parser[/bold green]\n"
         "Parsing chat history and generating summaries...",
@@ -136,7 +185,7 @@ def parse(use_llm: bool):
     # Get paths from config manager
     history_dir = config_manager.get_history_dir()
     output_dir = config_manager.get_output_dir()
-    data_file = config_manager.get_data_file_path()
+    data_file = config_manager.get_storage_path()
     
     if not history_dir.exists():
         console.print(f"[red]❌ History directory not found: {history_dir}[/red]")
@@ -146,65 +195,176 @@ def parse(use_llm: bool):
     console.print(f"📁 Parsing files from: {history_dir}")
     
     try:
-        # Import parser components
-        from ..parser.md_parser import MDParser
-        from ..summarizer.rule_summarizer import RuleSummarizer
-        from ..summarizer.llm_summarizer import LLMSummarizer
-        from ..storage.json_storage import JSONStorage
-        
-        # Initialize components
-        parser = MDParser()
-        storage = JSONStorage(str(data_file))
-        
-        # Choose summarizer
-        if use_llm and config.get("summarizer", {}).get("llm", {}).get("enabled", False):
-            summarizer = LLMSummarizer()
-            console.print("🧠 Using LLM summarization")
-        else:
-            summarizer = RuleSummarizer()
-            console.print("📝 Using rule-based summarization")
+        from ..storage.jsonl_storage import JSONLStorage
         
-        # Parse files
-        sessions = []
-        for md_file in history_dir.glob("*.md"):
-            try:
-                session = parser.parse_file(md_file)
-                if session:
-                    sessions.append(session)
-            except Exception as e:
-                console.print(f"[yellow]⚠️  Failed to parse {md_file.name}: {e}[/yellow]")
+        indexer, cache = create_indexer(config, data_file, use_llm, jobs)
+        storage = indexer.storage
         
-        console.print(f"✅ Found {len(sessions)} valid chat sessions")
+        # Parse new and changed files, summarize, save and prune
+        result = indexer.run(history_dir, full=full)
         
-        # Generate summaries
-        console.print("📝 Generating summaries...")
-        summary_count = 0
-        for session in sessions:
-            for qa in session.qa_pairs:
-                if summarizer.summarize_qa(qa):
-                    summary_count += 2  # question + answer
+        for name, error in result.failed.items():
+            console.print(f"[yellow]⚠️  Failed to parse {name}: {error}[/yellow]")
         
-        console.print(f"📝 Generated {summary_count} summaries")
+        console.print(f"✅ Parsed {len(result.parsed)} new or changed files "
+                      f"({len(result.sessions)} valid chat sessions), "
+                      f"{len(result.unchanged)} unchanged")
+        if result.removed:
+            console.print(f"🗑️  Removed {len(result.removed)} sessions of deleted files")
         
-        # Save sessions
-        storage.save_sessions(sessions)
+        console.print(f"📝 Generated {result.summary_count} summaries")
+        if cache:
+            stats = cache.stats()
+            console.print(f"🗃️  Summary cache: {stats['hits']} hits, {stats['misses']} misses, "
+                          f"{stats['entries']} entries")
+            cache.close()
         console.print(f"💾 Sessions saved to: {data_file}")
         
+        # Drop superseded records once the session log has accumulated enough
+        if isinstance(storage, JSONLStorage):
+            threshold = config.get("storage", {}).get("jsonl", {}).get("compact_threshold", 0.5)
+            if storage.compact(threshold=threshold):
+                console.print("🧹 Compacted session log")
+        
         # Print statistics
-        total_qa = sum(len(session.qa_pairs) for session in sessions)
+        total_qa = sum(len(session.qa_pairs) for session in result.sessions)
         file_size = data_file.stat().st_size if data_file.exists() else 0
         
         console.print(f"\n📊 Statistics:")
-        console.print(f"  📁 Sessions: {len(sessions)}")
-        console.print(f"  💬 Q&A pairs: {total_qa}")
+        console.print(f"  📁 Sessions: {storage.get_session_count()}")
+        console.print(f"  💬 Q&A pairs parsed: {total_qa}")
         console.print(f"  💾 File size: {file_size / 1024 / 1024:.1f}MB")
         
         return 0
-        
+    
     except Exception as e:
         console.print(f"[red]❌ Error during parsing: {e}[/red]")
         return 1
 
+@cli.command()
+@click.option('--use-llm', is_flag=True, help='Use LLM for summarization')
+@click.option('--jobs', '-j', type=int, default=1, show_default=True,
+              help='Number of parser processes per update')
+@click.option('--poll', is_flag=True, help='Poll for changes instead of using inotify')
+def watch(use_llm: bool, jobs: Optional[int], poll: bool):
+    """Watch the history directory and parse files as they change.
+    
+    Runs like parse once, then re-parses new and changed files after each
+    burst of changes. A running web server picks up every update and
+    pushes it to open pages.
+    """
+    import time
+    from ..parser.watcher import HistoryWatcher, InotifyWatcher, create_watcher
+    from ..storage.jsonl_storage import JSONLStorage
+    
+    console.print(Panel.fit(
+        "[bold green]👀 TalkShow Watch[/bold green]\n"
+        "Parsing chat history as it changes...",
+        border_style="green"
+    ))
+    
+    config = load_config(None)
+    if not config:
+        console.print("[red]❌ Failed to load configuration![/red]")
+        return 1
+    
+    history_dir = config_manager.get_history_dir()
+    data_file = config_manager.get_storage_path()
+    
+    if not history_dir.exists():
+        console.print(f"[red]❌ History directory not found: {history_dir}[/red]")
+        console.print("Please run [blue]talkshow init[/blue] first.")
+        return 1
+    
+    watch_config = config.get("parser", {}).get("watch", {})
+    indexer, cache = create_indexer(config, data_file, use_llm, jobs)
+    detector = create_watcher(history_dir, poll_interval=watch_config.get("poll_interval", 1.0),
+                              force_polling=poll or watch_config.get("force_polling", False))
+    watcher = HistoryWatcher(indexer, history_dir, watcher=detector, debounce=watch_config.get("debounce", 0.5))
+    
+    mode = "inotify" if isinstance(detector, InotifyWatcher) else f"polling every {detector.interval}s"
+    console.print(f"📁 Watching {history_dir} ({mode})")
+    console.print(f"💾 Sessions saved to: {data_file}")
+    console.print("🔄 Press Ctrl+C to stop")
+    
+    threshold = config.get("storage", {}).get("jsonl", {}).get("compact_threshold", 0.5)
+    
+    def report(result) -> None:
+        for name, error in result.failed.items():
+            console.print(f"[yellow]⚠️  Failed to parse {name}: {error}[/yellow]")
+        if result.changed:
+            qa_count = sum(len(session.qa_pairs) for session in result.sessions)
+            console.print(f"[dim]{time.strftime('%H:%M:%S')}[/dim] ✅ {len(result.parsed)} files parsed "
+                          f"({qa_count} Q&A pairs), {len(result.removed)} removed")
+        if isinstance(indexer.storage, JSONLStorage) and indexer.storage.compact(threshold=threshold):
+            console.print("🧹 Compacted session log")
+    
+    try:
+        watcher.watch(report)
+    except KeyboardInterrupt:
+        console.print("\n👋 Stopped watching.")
+    except Exception as e:
+        console.print(f"[red]❌ Error while watching: {e}[/red]")
+        return 1
+    finally:
+        if cache:
+            cache.close()
+    
+    return 0
+
+@cli.command()
+@click.argument('query')
+@click.option('--limit', '-n', type=int, default=20, show_default=True, help='Number of results to show')
+@click.option('--offset', type=int, default=0, show_default=True, help='Number of results to skip')
+def search(query: str, limit: int, offset: int):
+    """Full-text search over questions, answers and summaries."""
+    import time
+    from rich.table import Table
+    from ..storage.factory import create_storage
+    from ..search.index import SearchIndex
+    
+    data_file = config_manager.get_storage_path()
+    if not data_file.exists():
+        console.print(f"[red]❌ Data file not found: {data_file}[/red]")
+        console.print("Please run [blue]talkshow parse[/blue] first.")
+        return 1
+    
+    storage = create_storage(config_manager)
+    
+    start = time.perf_counter()
+    index = SearchIndex.from_sessions(storage.load_all_sessions())
+    build_ms = (time.perf_counter() - start) * 1000
+    
+    start = time.perf_counter()
+    total, hits = index.search(query, limit=limit, offset=offset)
+    query_ms = (time.perf_counter() - start) * 1000
+    
+    if not hits:
+        console.print(f"[yellow]No results for '{query}'[/yellow]")
+        return 0
+    
+    table = Table(title=f"🔍 {query} ({total} results)", show_lines=True)
+    table.add_column("#", style="dim", no_wrap=True)
+    table.add_column("Time", style="green", no_wrap=True)
+    table.add_column("Question", style="white")
+    table.add_column("Answer", style="cyan")
+    table.add_column("Theme", style="yellow")
+    
+    for rank, hit in enumerate(hits, start=offset + 1):
+        question = hit.question_summary or hit.question
+        table.add_row(
+            str(rank),
+            hit.timestamp.strftime('%Y-%m-%d %H:%M') if hit.timestamp else "",
+            question[:120],
+            hit.snippet,
+            hit.theme
+        )
+    
+    console.print(table)
+    console.print(f"[dim]Indexed {index.document_count} Q&A pairs in {build_ms:.0f}ms, "
+                  f"query took {query_ms:.1f}ms[/dim]")
+    return 0
+
 @cli.command()
 @click.option('--port', '-p', type=int, help='Server port (overrides config)')
 @click.option('--host', '-h', help='Server host (overrides config)')
@@ -234,8 +394,14 @@ def server(port: Optional[int], host: Optional[str], data_file: Optional[str]):
     # Get data file path
     if data_file:
         data_file_path = Path(data_file)
+        # Pass the override on to the server process
+        env_var = {
+            "sqlite": "TALKSHOW_DB_FILE",
+            "jsonl": "TALKSHOW_JSONL_FILE"
+        }.get(config_manager.get_storage_type(), "TALKSHOW_DATA_FILE")
+        os.environ[env_var] = str(data_file_path)
     else:
-        data_file_path = config_manager.get_data_file_path()
+        data_file_path = config_manager.get_storage_path()
     
     if not data_file_path.exists():
         console.print(f"[red]❌ Data file not found: {data_file_path}[/red]")
@@ -365,7 +531,7 @@ def stop(port: Optional[int], host: Optional[str], force: bool):
             console.print("\n[yellow]⚠️  No processes were stopped.[/yellow]")
         
         return 0
-        
+    
     except ImportError:
         console.print("[red]❌ psutil not available. Please install it: pip install psutil[/red]")
         console.print("Alternatively, you can manually stop the server using:")
@@ -375,6 +541,92 @@ def stop(port: Optional[int], host: Optional[str], force: bool):
         console.print(f"❌ Error stopping server: {e}")
         return 1
 
+@cli.command()
+@click.option('--threshold', type=float, default=None,
+              help='Only compact when this share of records is dead (default: storage.jsonl.compact_threshold)')
+@click.option('--force', is_flag=True, help='Compact even below the threshold')
+def compact(threshold: Optional[float], force: bool):
+    """Rewrite the JSONL session log without superseded and deleted records."""
+    from ..storage.factory import create_storage
+    
+    if config_manager.get_storage_type() != "jsonl":
+        console.print(f"[yellow]Storage type is '{config_manager.get_storage_type()}', "
+                      f"only the jsonl log needs compaction.[/yellow]")
+        return 0
+    
+    data_file = config_manager.get_storage_path()
+    if not data_file.exists():
+        console.print(f"[red]❌ Data file not found: {data_file}[/red]")
+        console.print("Please run [blue]talkshow parse[/blue] first.")
+        return 1
+    
+    storage = create_storage(config_manager)
+    
+    if force:
+        threshold = 0.0
+    elif threshold is None:
+        threshold = config_manager.get("storage.jsonl.compact_threshold", 0.5)
+    
+    before = storage.get_log_stats()
+    size_before = data_file.stat().st_size
+    console.print(f"📜 {data_file}: {before['records']} records, {before['live']} live "
+                  f"({before['dead_ratio']:.0%} dead)")
+    
+    if not storage.compact(threshold=threshold):
+        console.print(f"✅ Nothing to do, dead records are within the {threshold:.0%} threshold")
+        return 0
+    
+    after = storage.get_log_stats()
+    size_after = data_file.stat().st_size
+    console.print(f"🧹 Compacted to {after['records']} records, "
+                  f"{size_before / 1024 / 1024:.1f}MB → {size_after / 1024 / 1024:.1f}MB")
+    return 0
+
+@cli.command()
+@click.option('--files', type=int, default=50, show_default=True, help='Session files in the synthetic corpus')
+@click.option('--turns', type=int, default=20, show_default=True, help='Question and answer pairs per file')
+@click.option('--answer-chars', type=int, default=1500, show_default=True, help='Mean answer length in characters')
+@click.option('--code-ratio', type=float, default=0.3, show_default=True,
+              help='Probability that an answer paragraph is a code block')
+@click.option('--cjk-ratio', type=float, default=0.3, show_default=True,
+              help='Probability that a sentence is Chinese')
+@click.option('--seed', type=int, default=0, show_default=True, help='Corpus seed')
+@click.option('--repeat', type=int, default=3, show_default=True, help='Runs per timing; the best one is reported')
+@click.option('--jobs', '-j', type=int, default=1, show_default=True,
+              help='Worker processes for the parse_directory benchmark')
+@click.option('--only', multiple=True, type=click.Choice(BENCHMARK_NAMES),
+              help='Run only this benchmark (repeatable)')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='Write the JSON report to a file')
+def bench(files: int, turns: int, answer_chars: int, code_ratio: float, cjk_ratio: float, seed: int,
+          repeat: int, jobs: int, only: tuple, output: Optional[str]):
+    """Benchmark parsing, storage and the web API on a synthetic corpus."""
+    from ..benchmarks.throughput import run_benchmarks
+    
+    report = run_benchmarks(only or None, files=files, turns=turns, answer_chars=answer_chars,
+                            code_ratio=code_ratio, cjk_ratio=cjk_ratio, seed=seed, repeat=repeat, jobs=jobs)
+    text = json.dumps(report, indent=2)
+    
+    if not output:
+        # Only the report goes to stdout, so it can be piped
+        click.echo(text)
+        return 0
+    
+    Path(output).write_text(text + "\n", encoding='utf-8')
+    console.print(f"📊 Benchmarked {report['corpus']['files']} files "
+                  f"({report['corpus']['bytes'] / 1024 / 1024:.1f}MB), report written to {output}")
+    for name, result in report["benchmarks"].items():
+        if "error" in result:
+            console.print(f"  [red]{name}: {result['error']}[/red]")
+        elif "mb_per_s" in result:
+            console.print(f"  {name}: {result['mb_per_s']} MB/s, {result['qa_per_s']} QA/s, "
+                          f"peak RSS {result['peak_rss_mb']}MB")
+        else:
+            slowest = max(result["endpoints"].items(), key=lambda item: item[1]["first_ms"], default=None)
+            if slowest:
+                console.print(f"  {name}: {len(result['endpoints'])} endpoints, slowest first request "
+                              f"{slowest[0]} {slowest[1]['first_ms']}ms, peak RSS {result['peak_rss_mb']}MB")
+    return 0
+
 @cli.command()
 def config():
     """Show configuration information."""
@@ -397,7 +649,8 @@ def config():
         console.print(f"  Web Host: {server_config.get('host') or web_config.get('host', '127.0.0.1')}")
         console.print(f"  Web Port: {server_config.get('port') or web_config.get('port', 8000)}")
         console.print(f"  History Dir: {config.get('parser', {}).get('history_directory', '.specstory/history')}")
-        console.print(f"  Data File: {config.get('storage', {}).get('json', {}).get('file_path', '.specstory/data/sessions.json')}")
+        console.print(f"  Storage Type: {config_manager.get_storage_type()}")
+        console.print(f"  Data File: {config_manager.get_storage_path()}")
         console.print(f"  Summarizer Enabled: {config.get('summarizer', {}).get('enabled', True)}")
         console.print(f"  LLM Enabled: {config.get('summarizer', {}).get('llm', {}).get('enabled', False)}")
 
@@ -103,6 +103,9 @@ class ConfigManager:
             "TALKSHOW_PORT": ["web", "port"],
             "TALKSHOW_HISTORY_DIR": ["parser", "history_directory"],
             "TALKSHOW_OUTPUT_DIR": ["storage", "json", "file_path"],
+            "TALKSHOW_STORAGE_TYPE": ["storage", "type"],
+            "TALKSHOW_DB_FILE": ["storage", "sqlite", "database_path"],
+            "TALKSHOW_JSONL_FILE": ["storage", "jsonl", "file_path"],
         }
         
         for env_var, config_path in env_mappings.items():
@@ -162,6 +165,62 @@ class ConfigManager:
         # 4. Default fallback
         return Path("data/sessions.json")
     
+    def get_storage_type(self) -> str:
+        """Get the configured storage backend type (json, jsonl or sqlite)."""
+        return str(self.get("storage.type", "json")).lower()
+    
+    def get_database_path(self) -> Path:
+        """Get the SQLite database path with proper resolution."""
+        # 1. Environment variable (highest priority)
+        env_path = os.getenv("TALKSHOW_DB_FILE")
+        if env_path:
+            return Path(env_path)
+        
+        # 2. From project configuration (paths.output_dir)
+        output_dir = self.get("paths.output_dir")
+        if output_dir:
+            return self._get_project_root() / output_dir / "sessions.db"
+        
+        # 3. From storage configuration
+        config_path = self.get("storage.sqlite.database_path")
+        if config_path:
+            if not Path(config_path).is_absolute():
+                return self._get_project_root() / config_path
+            return Path(config_path)
+        
+        # 4. Next to the JSON data file
+        return self.get_data_file_path().with_suffix(".db")
+    
+    def get_log_file_path(self) -> Path:
+        """Get the JSON Lines session log path with proper resolution."""
+        # 1. Environment variable (highest priority)
+        env_path = os.getenv("TALKSHOW_JSONL_FILE")
+        if env_path:
+            return Path(env_path)
+        
+        # 2. From project configuration (paths.output_dir)
+        output_dir = self.get("paths.output_dir")
+        if output_dir:
+            return self._get_project_root() / output_dir / "sessions.jsonl"
+        
+        # 3. From storage configuration
+        config_path = self.get("storage.jsonl.file_path")
+        if config_path:
+            if not Path(config_path).is_absolute():
+                return self._get_project_root() / config_path
+            return Path(config_path)
+        
+        # 4. Next to the JSON data file
+        return self.get_data_file_path().with_suffix(".jsonl")
+    
+    def get_storage_path(self) -> Path:
+        """Get the file path of the configured storage backend."""
+        if self.get_storage_type() == "sqlite":
+            return self.get_database_path()
+        if self.get_storage_type() == "jsonl":
+            return self.get_log_file_path()
+        return self.get_data_file_path()
+    
     def get_history_dir(self) -> Path:
         """Get the history directory path."""
         # 1. Environment variable
@@ -229,7 +288,8 @@ class ConfigManager:
         console.print(f"  Default config: {self.default_config_path}")
         console.print(f"  Project config: {self.project_config_path}")
         console.print(f"  User config: {self.user_config_path}")
-        console.print(f"  Data file: {self.get_data_file_path()}")
+        console.print(f"  Storage type: {self.get_storage_type()}")
+        console.print(f"  Data file: {self.get_storage_path()}")
         console.print(f"  History dir: {self.get_history_dir()}")
         console.print(f"  Output dir: {self.get_output_dir()}")
         
@@ -1,11 +1,13 @@
 """Data models for TalkShow."""
 
-from .chat import ChatSession, QAPair, SessionMeta
+from .chat import ChatSession, LazyChatSession, QAPair, SessionDigest, SessionMeta
 from .storage import StorageInterface
 
 __all__ = [
     "ChatSession",
+    "LazyChatSession",
     "QAPair",
+    "SessionDigest",
     "SessionMeta", 
     "StorageInterface",
 ]
\ No newline at end of file
@@ -1,11 +1,40 @@
 """Chat data models for TalkShow."""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
+import json
 import re
+import sys
 
 
+def _with_slots(cls: type) -> type:
+    """Recreate a dataclass with ``__slots__`` instead of a per-instance ``__dict__``.
+    
+    Equivalent to ``@dataclass(slots=True)``, which needs Python 3.10.
+    Field defaults live in the generated ``__init__``, so the class
+    attributes holding them can be dropped in favour of slot descriptors.
+    """
+    field_names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in field_names and key not in ('__dict__', '__weakref__')}
+    namespace['__slots__'] = field_names
+    slotted = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp, treating naive values as UTC."""
+    if not value:
+        return None
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp
+
+
+@_with_slots
 @dataclass
 class QAPair:
     """Represents a single question-answer pair in a chat session."""
@@ -27,8 +56,31 @@ class QAPair:
         if use_summary and self.answer_summary:
             return self.answer_summary
         return self.answer
+    
+    def to_dict(self) -> dict:
+        """Convert QA pair to dictionary for serialization."""
+        return {
+            'question': self.question,
+            'answer': self.answer,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None,
+            'question_summary': self.question_summary,
+            'answer_summary': self.answer_summary
+        }
+    
+    @classmethod
+    def from_dict(cls, qa_data: dict) -> 'QAPair':
+        """Create QA pair from dictionary."""
+        return cls(
+            question=qa_data['question'],
+            answer=qa_data['answer'],
+            # 处理timestamp，确保时区一致性，没有时区信息时假设为UTC
+            timestamp=_parse_timestamp(qa_data['timestamp']),
+            question_summary=qa_data.get('question_summary'),
+            answer_summary=qa_data.get('answer_summary')
+        )
 
 
+@_with_slots
 @dataclass
 class SessionMeta:
     """Metadata for a chat session."""
@@ -39,6 +91,13 @@ class SessionMeta:
     file_size: int
     qa_count: int
     
+    def __post_init__(self):
+        """Intern the names: themes repeat across sessions, and the search index shares filenames."""
+        if type(self.filename) is str:
+            self.filename = sys.intern(self.filename)
+        if type(self.theme) is str:
+            self.theme = sys.intern(self.theme)
+    
     @classmethod
     def from_filename(cls, filename: str, ctime: datetime, file_size: int, qa_count: int) -> 'SessionMeta':
         """Create SessionMeta from filename, extracting theme and converting timezone."""
@@ -79,6 +138,37 @@ class SessionMeta:
             file_size=file_size,
             qa_count=qa_count
         )
+    
+    def to_dict(self) -> dict:
+        """Convert metadata to dictionary for serialization."""
+        return {
+            'filename': self.filename,
+            'theme': self.theme,
+            'ctime': self.ctime.isoformat(),
+            'file_size': self.file_size,
+            'qa_count': self.qa_count
+        }
+    
+    @classmethod
+    def from_dict(cls, meta_data: dict) -> 'SessionMeta':
+        """Create metadata from dictionary."""
+        # 处理ctime，确保时区一致性
+        ctime_str = meta_data['ctime']
+        if ctime_str:
+            ctime = datetime.fromisoformat(ctime_str)
+            # 如果没有时区信息，假设为UTC
+            if ctime.tzinfo is None:
+                ctime = ctime.replace(tzinfo=timezone.utc)
+        else:
+            ctime = datetime.now(timezone.utc)
+        
+        return cls(
+            filename=meta_data['filename'],
+            theme=meta_data['theme'],
+            ctime=ctime,
+            file_size=meta_data['file_size'],
+            qa_count=meta_data['qa_count']
+        )
 
 
 @dataclass
@@ -109,11 +199,11 @@ class ChatSession:
         """Calculate session duration in minutes."""
         if len(self.qa_pairs) < 2:
             return None
-            
+        
         timestamps = [qa.timestamp for qa in self.qa_pairs if qa.timestamp]
         if len(timestamps) < 2:
             return None
-            
+        
         duration = max(timestamps) - min(timestamps)
         return int(duration.total_seconds() / 60)
     
@@ -128,71 +218,175 @@ class ChatSession:
         
         if len(self.qa_pairs) > 3:
             qa_display.append(f"... and {len(self.qa_pairs) - 3} more QA pairs")
-            
+        
         return "\n".join(qa_display)
     
     def to_dict(self) -> dict:
         """Convert session to dictionary for serialization."""
         return {
-            'meta': {
-                'filename': self.meta.filename,
-                'theme': self.meta.theme,
-                'ctime': self.meta.ctime.isoformat(),
-                'file_size': self.meta.file_size,
-                'qa_count': self.meta.qa_count
-            },
-            'qa_pairs': [
-                {
-                    'question': qa.question,
-                    'answer': qa.answer,
-                    'timestamp': qa.timestamp.isoformat() if qa.timestamp else None,
-                    'question_summary': qa.question_summary,
-                    'answer_summary': qa.answer_summary
-                }
-                for qa in self.qa_pairs
-            ]
+            'meta': self.meta.to_dict(),
+            'qa_pairs': [qa.to_dict() for qa in self.qa_pairs]
         }
     
     @classmethod
     def from_dict(cls, data: dict) -> 'ChatSession':
         """Create session from dictionary."""
-        meta_data = data['meta']
-        
-        # 处理ctime，确保时区一致性
-        ctime_str = meta_data['ctime']
-        if ctime_str:
-            ctime = datetime.fromisoformat(ctime_str)
-            # 如果没有时区信息，假设为UTC
-            if ctime.tzinfo is None:
-                ctime = ctime.replace(tzinfo=timezone.utc)
-        else:
-            ctime = datetime.now(timezone.utc)
+        meta = SessionMeta.from_dict(data['meta'])
+        qa_pairs = [QAPair.from_dict(qa_data) for qa_data in data['qa_pairs']]
+        return cls(meta=meta, qa_pairs=qa_pairs)
+
+
+class LazyChatSession(ChatSession):
+    """ChatSession whose QA pairs are decoded on first access.
+    
+    Holds the serialized session record (JSON bytes, a memoryview into
+    a larger buffer, text, or an already decoded dict) next to its
+    metadata. Code that only reads
+    ``meta`` never builds a QAPair or parses a timestamp; the first
+    access to ``qa_pairs`` decodes the record and drops it.
+    """
+    
+    def __init__(self, meta: SessionMeta, record: Union[bytes, memoryview, str, dict]):
+        """Initialize the session.
         
-        meta = SessionMeta(
-            filename=meta_data['filename'],
-            theme=meta_data['theme'],
-            ctime=ctime,
-            file_size=meta_data['file_size'],
-            qa_count=meta_data['qa_count']
+        Args:
+            meta: Session metadata, already decoded
+            record: Serialized session with a ``qa_pairs`` list
+        """
+        self.meta = meta
+        self._record: Optional[Union[bytes, memoryview, str, dict]] = record
+        self._qa_pairs: Optional[List[QAPair]] = None
+    
+    @property
+    def qa_pairs(self) -> List[QAPair]:
+        """QA pairs of the session, decoded from the record on first access."""
+        if self._qa_pairs is None:
+            self._qa_pairs = [QAPair.from_dict(qa_data) for qa_data in self._raw_qa_pairs()]
+            self._record = None
+        return self._qa_pairs
+    
+    @qa_pairs.setter
+    def qa_pairs(self, qa_pairs: List[QAPair]) -> None:
+        self._qa_pairs = qa_pairs
+        self._record = None
+    
+    @property
+    def is_loaded(self) -> bool:
+        """Whether the QA pairs have been decoded."""
+        return self._qa_pairs is not None
+    
+    def to_dict(self) -> dict:
+        """Convert session to dictionary, passing undecoded QA pairs through as they are."""
+        if self._qa_pairs is not None:
+            return super().to_dict()
+        return {
+            'meta': self.meta.to_dict(),
+            'qa_pairs': self._raw_qa_pairs()
+        }
+    
+    def _raw_qa_pairs(self) -> List[dict]:
+        record = self._record
+        if isinstance(record, memoryview):
+            record = json.loads(record.tobytes())
+        elif not isinstance(record, dict):
+            record = json.loads(record)
+        return record['qa_pairs']
+    
+    def __getstate__(self) -> dict:
+        # A view into a shared buffer cannot be pickled, its bytes can
+        state = self.__dict__.copy()
+        if isinstance(state['_record'], memoryview):
+            state['_record'] = state['_record'].tobytes()
+        return state
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ChatSession):
+            return NotImplemented
+        return (self.meta, self.qa_pairs) == (other.meta, other.qa_pairs)
+
+# Characters of the first question kept in a SessionDigest
+PREVIEW_LENGTH = 100
+
+
+@dataclass
+class SessionDigest:
+    """Metadata and aggregate counts of a session, without its QA pairs.
+    
+    Digests are what session listings and statistics need. Storage
+    backends keep them next to the full records, so they can be loaded
+    without reading or decoding any question or answer.
+    """
+    
+    meta: SessionMeta
+    question_summaries: int = 0
+    answer_summaries: int = 0
+    first_question: Optional[str] = None
+    first_timestamp: Optional[datetime] = None
+    min_timestamp: Optional[datetime] = None
+    max_timestamp: Optional[datetime] = None
+    
+    @property
+    def qa_count(self) -> int:
+        """Number of QA pairs in the session."""
+        return self.meta.qa_count
+    
+    @property
+    def has_summaries(self) -> bool:
+        """Whether any question or answer of the session has a summary."""
+        return bool(self.question_summaries or self.answer_summaries)
+    
+    @classmethod
+    def from_session(cls, session: ChatSession) -> 'SessionDigest':
+        """Compute the digest of a session."""
+        timestamps = [qa.timestamp for qa in session.qa_pairs if qa.timestamp]
+        first = session.qa_pairs[0] if session.qa_pairs else None
+        return cls(
+            meta=session.meta,
+            question_summaries=sum(1 for qa in session.qa_pairs if qa.question_summary),
+            answer_summaries=sum(1 for qa in session.qa_pairs if qa.answer_summary),
+            first_question=first.question[:PREVIEW_LENGTH] if first else None,
+            first_timestamp=first.timestamp if first else None,
+            min_timestamp=min(timestamps) if timestamps else None,
+            max_timestamp=max(timestamps) if timestamps else None
         )
-        
-        qa_pairs = []
-        for qa_data in data['qa_pairs']:
-            # 处理timestamp，确保时区一致性
-            timestamp = None
-            if qa_data['timestamp']:
-                timestamp = datetime.fromisoformat(qa_data['timestamp'])
-                # 如果没有时区信息，假设为UTC
-                if timestamp.tzinfo is None:
-                    timestamp = timestamp.replace(tzinfo=timezone.utc)
-            
-            qa = QAPair(
-                question=qa_data['question'],
-                answer=qa_data['answer'],
-                timestamp=timestamp,
-                question_summary=qa_data.get('question_summary'),
-                answer_summary=qa_data.get('answer_summary')
-            )
-            qa_pairs.append(qa)
-        
-        return cls(meta=meta, qa_pairs=qa_pairs)
\ No newline at end of file
+    
+    @classmethod
+    def from_session_dict(cls, data: dict) -> 'SessionDigest':
+        """Compute the digest of a serialized session without building its QA pairs."""
+        qa_list = data['qa_pairs']
+        timestamps = [_parse_timestamp(qa['timestamp']) for qa in qa_list if qa['timestamp']]
+        first = qa_list[0] if qa_list else None
+        return cls(
+            meta=SessionMeta.from_dict(data['meta']),
+            question_summaries=sum(1 for qa in qa_list if qa.get('question_summary')),
+            answer_summaries=sum(1 for qa in qa_list if qa.get('answer_summary')),
+            first_question=first['question'][:PREVIEW_LENGTH] if first else None,
+            first_timestamp=_parse_timestamp(first['timestamp']) if first else None,
+            min_timestamp=min(timestamps) if timestamps else None,
+            max_timestamp=max(timestamps) if timestamps else None
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert digest to dictionary for serialization."""
+        return {
+            'meta': self.meta.to_dict(),
+            'question_summaries': self.question_summaries,
+            'answer_summaries': self.answer_summaries,
+            'first_question': self.first_question,
+            'first_timestamp': self.first_timestamp.isoformat() if self.first_timestamp else None,
+            'min_timestamp': self.min_timestamp.isoformat() if self.min_timestamp else None,
+            'max_timestamp': self.max_timestamp.isoformat() if self.max_timestamp else None
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SessionDigest':
+        """Create digest from dictionary."""
+        return cls(
+            meta=SessionMeta.from_dict(data['meta']),
+            question_summaries=data.get('question_summaries', 0),
+            answer_summaries=data.get('answer_summaries', 0),
+            first_question=data.get('first_question'),
+            first_timestamp=_parse_timestamp(data.get('first_timestamp')),
+            min_timestamp=_parse_timestamp(data.get('min_timestamp')),
+            max_timestamp=_parse_timestamp(data.get('max_timestamp'))
+        )
\ No newline at end of file
@@ -1,8 +1,8 @@
 """Storage interface and related models."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
-from .chat import ChatSession
+from typing import Iterable, List, Optional, Dict, Any
+from .chat import ChatSession, SessionDigest
 
 
 class StorageInterface(ABC):
@@ -28,6 +28,16 @@ class StorageInterface(ABC):
         """Load all stored chat sessions."""
         pass
     
+    def load_all_metas(self) -> List[SessionDigest]:
+        """Load the digests of all stored sessions, sorted by creation time.
+        
+        Backends override this to serve digests without reading QA pairs.
+        
+        Returns:
+            List[SessionDigest]: Metadata and counts of every session
+        """
+        return [SessionDigest.from_session(session) for session in self.load_all_sessions()]
+    
     @abstractmethod
     def session_exists(self, filename: str) -> bool:
         """Check if a session exists in storage."""
@@ -38,6 +48,23 @@ class StorageInterface(ABC):
         """Delete a session from storage."""
         pass
     
+    def update_sessions(self, sessions: List[ChatSession], deleted: Iterable[str] = ()) -> bool:
+        """Save and delete sessions as one batch.
+        
+        Backends override this to apply the whole batch in a single write.
+        
+        Args:
+            sessions: Sessions to insert or replace
+            deleted: Filenames of sessions to remove
+        
+        Returns:
+            bool: True if the batch was applied
+        """
+        ok = self.save_sessions(sessions) if sessions else True
+        for filename in deleted:
+            self.delete_session(filename)
+        return ok
+    
     @abstractmethod
     def get_session_count(self) -> int:
         """Get total number of stored sessions."""
@@ -46,4 +73,13 @@ class StorageInterface(ABC):
     @abstractmethod
     def get_storage_info(self) -> Dict[str, Any]:
         """Get information about the storage backend."""
+        pass
+    
+    @abstractmethod
+    def get_data_version(self) -> Any:
+        """Get an opaque token that changes whenever the stored data changes.
+        
+        Callers compare tokens for equality to decide whether cached data
+        derived from this storage is still valid.
+        """
         pass
\ No newline at end of file
@@ -1,9 +1,19 @@
 """MD file parsing components."""
 
 from .md_parser import MDParser
+from .stream_parser import StreamingMDParser
 from .time_extractor import TimeExtractor
+from .manifest import FileManifest
+from .incremental import IncrementalIndexer
+from .parallel import parse_files
+from .watcher import HistoryWatcher
 
 __all__ = [
     "MDParser",
+    "StreamingMDParser",
     "TimeExtractor",
+    "FileManifest",
+    "IncrementalIndexer",
+    "parse_files",
+    "HistoryWatcher",
 ]
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""Incremental parsing of a history directory."""
+
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..models.chat import ChatSession
+from ..models.storage import StorageInterface
+from .manifest import FileManifest, FileRecord
+from .md_parser import MDParser
+from .parallel import parse_files
+from .stream_parser import ParseCheckpoint, StreamingMDParser
+
+
+@dataclass
+class IndexResult:
+    """Outcome of an incremental indexing run."""
+    
+    parsed: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    resumed: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    sessions: List[ChatSession] = field(default_factory=list)
+    summary_count: int = 0
+    
+    @property
+    def changed(self) -> bool:
+        """Whether storage was modified."""
+        return bool(self.parsed or self.removed)
+
+
+class IncrementalIndexer:
+    """Keeps storage in sync with a history directory.
+    
+    Only files that are new or changed according to the manifest are
+    parsed, sessions of deleted files are dropped, and summaries of QA
+    pairs that did not change are carried over instead of regenerated.
+    
+    Recently modified files keep a parse checkpoint in the manifest. When
+    such a file has only grown, as the file of a conversation in progress
+    does, parsing resumes at the checkpoint and reads just the appended
+    bytes.
+    """
+    
+    def __init__(self, storage: StorageInterface, manifest: FileManifest,
+                 parser: Optional[MDParser] = None, summarizer: Optional[Any] = None,
+                 jobs: Optional[int] = 1, checkpoint_age: Optional[float] = 86400.0):
+        """Initialize the indexer.
+        
+        Args:
+            storage: Storage backend to update
+            manifest: Manifest of previously parsed files
+            parser: Parser for history files
+            summarizer: Object with a ``summarize_qa`` (or batch ``summarize_all``)
+                method, or None to skip summaries
+            jobs: Number of parser processes; None uses one per CPU
+            checkpoint_age: Keep checkpoints of files modified within this many
+                seconds; None keeps them for all files
+        """
+        self.storage = storage
+        self.manifest = manifest
+        self.parser = parser or StreamingMDParser()
+        self.summarizer = summarizer
+        self.jobs = jobs
+        self.checkpoint_age = checkpoint_age
+    
+    def run(self, history_dir: Path, full: bool = False) -> IndexResult:
+        """Bring storage up to date with the history directory.
+        
+        Args:
+            history_dir: Directory containing SpecStory markdown files
+            full: Re-parse every file regardless of the manifest
+        
+        Returns:
+            IndexResult: What was parsed, skipped and removed
+        """
+        result = IndexResult()
+        files = sorted(Path(history_dir).glob("*.md"))
+        present = {f.name for f in files}
+        
+        # Decide what needs parsing
+        pending: List[Tuple[Path, FileRecord]] = []
+        for md_file in files:
+            try:
+                record = self.manifest.check(md_file)
+            except OSError as e:
+                result.failed[md_file.name] = str(e)
+                continue
+            
+            known = self.manifest.records.get(md_file.name)
+            if full or record is not None or (known and known.has_session
+                                              and not self.storage.session_exists(md_file.name)):
+                if record is None:
+                    stat = md_file.stat()
+                    record = FileRecord(stat.st_mtime_ns, stat.st_size, FileManifest.hash_file(md_file))
+                pending.append((md_file, record))
+            else:
+                result.unchanged.append(md_file.name)
+        
+        # Sessions to drop, written together with the parsed ones
+        deleted: List[str] = []
+        records = dict(pending)
+        resumable = isinstance(self.parser, StreamingMDParser)
+        
+        # Files that only grew continue from their checkpoint
+        to_parse: List[Path] = []
+        for md_file, record in pending:
+            resumed = None
+            if not full and resumable and record.checkpoint is not None:
+                try:
+                    resumed = self._resume(md_file, record)
+                except Exception as e:
+                    result.failed[md_file.name] = f"{type(e).__name__}: {e}"
+                    continue
+            if resumed is None:
+                # Fully parsed files keep a content hash, so a later touch is recognized
+                record.sha256 = record.sha256 or FileManifest.hash_file(md_file)
+                to_parse.append(md_file)
+                continue
+            
+            session, checkpoint, previous = resumed
+            result.resumed.append(md_file.name)
+            # QA pairs completed before the old checkpoint are the stored ones
+            self._store(md_file, record, session, checkpoint, previous, result, deleted,
+                        start=record.checkpoint['emitted'])
+        
+        # Parse new and changed files
+        for outcome in parse_files(to_parse, jobs=self.jobs, parser=self.parser, checkpoints=resumable):
+            if outcome.error:
+                result.failed[outcome.path.name] = outcome.error
+                continue
+            
+            md_file = outcome.path
+            self._store(md_file, records[md_file], outcome.session, outcome.checkpoint,
+                        self.storage.load_session(md_file.name), result, deleted)
+        
+        # Summarize only QA pairs that still lack summaries
+        if self.summarizer is not None:
+            pending_qa = [qa for session in result.sessions for qa in session.qa_pairs
+                          if not (qa.question_summary and qa.answer_summary)]
+            if hasattr(self.summarizer, 'summarize_all'):
+                # Batch summarizers process all pairs concurrently
+                result.summary_count += 2 * self.summarizer.summarize_all(pending_qa)
+            else:
+                for qa in pending_qa:
+                    if self.summarizer.summarize_qa(qa):
+                        result.summary_count += 2  # question + answer
+        
+        # Drop sessions whose files were deleted
+        for name in sorted(set(self.manifest.records) - present):
+            if self.storage.session_exists(name):
+                deleted.append(name)
+            result.removed.append(name)
+        
+        # One batched write for all changes
+        if (result.sessions or deleted) and not self.storage.update_sessions(result.sessions, deleted):
+            raise IOError("Failed to save parsed sessions")
+        
+        for name in result.removed:
+            self.manifest.remove(name)
+        self.manifest.save()
+        return result
+    
+    def _resume(self, md_file: Path, record: FileRecord) -> Optional[Tuple[Optional[ChatSession], ParseCheckpoint, ChatSession]]:
+        """Parse only the bytes appended since the file's checkpoint.
+        
+        Returns:
+            Optional[Tuple]: The session, its new checkpoint and the stored
+                session it continues, or None if the file must be parsed in full
+        """
+        checkpoint = ParseCheckpoint.from_dict(record.checkpoint)
+        previous = self.storage.load_session(md_file.name)
+        if previous is None or len(previous.qa_pairs) < checkpoint.emitted:
+            return None
+        
+        resumed = self.parser.resume_file(str(md_file), checkpoint, previous.qa_pairs)
+        if resumed is None:
+            return None
+        return resumed[0], resumed[1], previous
+    
+    def _store(self, md_file: Path, record: FileRecord, session: Optional[ChatSession],
+               checkpoint: Optional[ParseCheckpoint], previous: Optional[ChatSession],
+               result: IndexResult, deleted: List[str], start: int = 0) -> None:
+        """Record a parsed file in the manifest and queue its session for writing."""
+        record.has_session = session is not None
+        record.checkpoint = checkpoint.to_dict() if checkpoint and self._is_active(record) else None
+        self.manifest.update(md_file.name, record)
+        result.parsed.append(md_file.name)
+        
+        if session is None:
+            # File no longer contains QA pairs
+            if self.storage.session_exists(md_file.name):
+                deleted.append(md_file.name)
+            return
+        
+        self._carry_over_summaries(session, previous, start)
+        result.sessions.append(session)
+    
+    def _is_active(self, record: FileRecord) -> bool:
+        """Whether a file was modified recently enough to be appended to again."""
+        if self.checkpoint_age is None:
+            return True
+        return time.time() - record.mtime_ns / 1e9 < self.checkpoint_age
+    
+    def _carry_over_summaries(self, session: ChatSession, previous: Optional[ChatSession], start: int = 0) -> None:
+        """Copy summaries from the stored version of a session to unchanged QA pairs.
+        
+        Pairs before ``start`` are taken over from the stored session as
+        they are and need no lookup.
+        """
+        if previous is None:
+            return
+        
+        summaries = {
+            (qa.question, qa.answer): (qa.question_summary, qa.answer_summary)
+            for qa in previous.qa_pairs[start:]
+        }
+        for qa in session.qa_pairs[start:]:
+            known = summaries.get((qa.question, qa.answer))
+            if known:
+                qa.question_summary = qa.question_summary or known[0]
+                qa.answer_summary = qa.answer_summary or known[1]
@@ -0,0 +1,118 @@
+"""File manifest for incremental parsing."""
+
+import hashlib
+import json
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ..storage.locking import atomic_write
+
+
+@dataclass
+class FileRecord:
+    """Fingerprint of a parsed history file."""
+    
+    mtime_ns: int
+    size: int
+    sha256: str
+    has_session: bool = True
+    # ParseCheckpoint.to_dict() of a file that may still be appended to
+    checkpoint: Optional[Dict[str, Any]] = None
+
+
+class FileManifest:
+    """Tracks path, mtime, size and content hash of every parsed file.
+    
+    A file is considered unchanged when its mtime and size match the
+    manifest. When they differ the content hash decides, so a file that
+    was only touched (e.g. by a checkout) is not parsed again. A file
+    with a parse checkpoint that has grown is not hashed at all: the
+    parser checks the bytes before the checkpoint and resumes there.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, manifest_path: str):
+        """Initialize the manifest.
+        
+        Args:
+            manifest_path: Path to the manifest JSON file
+        """
+        self.manifest_path = Path(manifest_path)
+        self.records: Dict[str, FileRecord] = {}
+        self.load()
+    
+    @classmethod
+    def for_data_file(cls, data_file: Path) -> 'FileManifest':
+        """Create the manifest stored alongside a data file."""
+        data_file = Path(data_file)
+        return cls(str(data_file.with_name(f"{data_file.stem}.manifest.json")))
+    
+    def load(self) -> None:
+        """Load records from disk; a missing or unreadable manifest is empty."""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                self.records = {}
+                return
+            self.records = {name: FileRecord(**record) for name, record in data['files'].items()}
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            self.records = {}
+    
+    def save(self) -> None:
+        """Write the manifest to disk."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            'version': self.VERSION,
+            'files': {name: asdict(record) for name, record in sorted(self.records.items())}
+        }
+        atomic_write(self.manifest_path, json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+    
+    def check(self, file_path: Path) -> Optional[FileRecord]:
+        """Check a file against the manifest.
+        
+        Args:
+            file_path: History file to check
+        
+        Returns:
+            Optional[FileRecord]: None if the file is unchanged, otherwise the
+            new fingerprint to store once the file has been processed; it
+            keeps the previous checkpoint when the file may have been appended to
+        """
+        stat = file_path.stat()
+        record = self.records.get(file_path.name)
+        
+        if record and record.mtime_ns == stat.st_mtime_ns and record.size == stat.st_size:
+            return None
+        
+        if record and record.checkpoint and stat.st_size > record.size:
+            # Probably appended to; hashing would read the whole file again
+            return FileRecord(mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256='',
+                              checkpoint=record.checkpoint)
+        
+        digest = self.hash_file(file_path)
+        if record and record.sha256 == digest and record.size == stat.st_size:
+            # Content is the same, only refresh the timestamp
+            record.mtime_ns = stat.st_mtime_ns
+            return None
+        
+        return FileRecord(mtime_ns=stat.st_mtime_ns, size=stat.st_size, sha256=digest)
+    
+    def update(self, name: str, record: FileRecord) -> None:
+        """Store the fingerprint of a processed file."""
+        self.records[name] = record
+    
+    def remove(self, name: str) -> None:
+        """Forget a file."""
+        self.records.pop(name, None)
+    
+    @staticmethod
+    def hash_file(file_path: Path) -> str:
+        """Compute the SHA-256 of a file's content."""
+        sha = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                sha.update(chunk)
+        return sha.hexdigest()
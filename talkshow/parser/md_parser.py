@@ -32,7 +32,14 @@ class MDParser:
         """Parse markdown content into a ChatSession."""
         filename = os.path.basename(file_path)
         file_size = len(content.encode('utf-8'))
+        ctime = self._resolve_ctime(filename, file_path)
         
+        # Extract QA pairs with ctime for fallback
+        qa_pairs = self._extract_qa_pairs(content, ctime)
+        return self._build_session(filename, ctime, file_size, qa_pairs)
+    
+    def _resolve_ctime(self, filename: str, file_path: str) -> datetime:
+        """Determine the creation time of a history file."""
         # Extract creation time from filename (converted to Shanghai timezone)
         ctime = self._extract_creation_time_from_filename(filename)
         if not ctime:
@@ -44,9 +51,11 @@ class MDParser:
                     ctime = ctime.replace(tzinfo=timezone.utc)
             except OSError:
                 ctime = datetime.now(timezone.utc)
-        
-        # Extract QA pairs with ctime for fallback
-        qa_pairs = self._extract_qa_pairs(content, ctime)
+        return ctime
+    
+    def _build_session(self, filename: str, ctime: datetime, file_size: int,
+                       qa_pairs: List[QAPair]) -> Optional[ChatSession]:
+        """Wrap parsed QA pairs into a ChatSession."""
         if not qa_pairs:
             print(f"No QA pairs found in {filename}")
             return None
@@ -115,10 +124,8 @@ class MDParser:
         
         # Extract timestamp from the complete combined content (not just assistant content)
         # This allows finding timestamps in command output sections
+        # It already falls back to the earliest timestamp anywhere in the sections
         timestamp = self.time_extractor.extract_from_assistant_section(combined_content)
-        if not timestamp:
-            # Fallback: try to extract any timestamp from the combined sections
-            timestamp = self.time_extractor.extract_first_timestamp(combined_content)
         
         # If still no timestamp found, use ctime as fallback
         if not timestamp:
@@ -266,8 +273,15 @@ class MDParser:
                 return qa.timestamp
         return None
     
-    def parse_directory(self, directory_path: str) -> List[ChatSession]:
-        """Parse all markdown files in a directory."""
+    def parse_directory(self, directory_path: str, jobs: int = 1) -> List[ChatSession]:
+        """Parse all markdown files in a directory.
+        
+        Args:
+            directory_path: Directory containing markdown files
+            jobs: Number of worker processes; None uses one per CPU
+        """
+        from .parallel import parse_files
+        
         sessions = []
         directory = Path(directory_path)
         
@@ -276,12 +290,13 @@ class MDParser:
             return sessions
         
         # Find all .md files
-        md_files = list(directory.glob("*.md"))
+        md_files = sorted(directory.glob("*.md"))
         
-        for md_file in md_files:
-            session = self.parse_file(str(md_file))
-            if session:
-                sessions.append(session)
+        for outcome in parse_files(md_files, jobs=jobs, parser=self):
+            if outcome.error:
+                print(f"Error parsing file {outcome.path}: {outcome.error}")
+            elif outcome.session:
+                sessions.append(outcome.session)
         
         # Sort sessions by creation time
         sessions.sort(key=lambda s: s.meta.ctime)
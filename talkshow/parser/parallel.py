@@ -0,0 +1,96 @@
+"""Parallel parsing of history files with a process pool."""
+
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Union
+
+from ..models.chat import ChatSession
+from .md_parser import MDParser
+from .stream_parser import ParseCheckpoint, StreamingMDParser
+
+
+class ParseOutcome(NamedTuple):
+    """Result of parsing one file; ``error`` is set when parsing raised."""
+    
+    path: Path
+    session: Optional[ChatSession]
+    error: Optional[str]
+    checkpoint: Optional[ParseCheckpoint] = None
+
+
+# Parser instance of the current worker process, set by _init_worker
+_worker_parser: Optional[MDParser] = None
+
+
+def _init_worker(parser: MDParser) -> None:
+    """Install the parser in a freshly started worker process."""
+    global _worker_parser
+    _worker_parser = parser
+
+
+def _parse_one(parser: MDParser, path: Path, checkpoints: bool = False) -> ParseOutcome:
+    """Parse a single file, turning exceptions into an error outcome."""
+    try:
+        if checkpoints:
+            session, checkpoint = parser.parse_file_checkpointed(str(path))
+            return ParseOutcome(path, session, None, checkpoint)
+        return ParseOutcome(path, parser.parse_file(str(path)), None)
+    except Exception as e:
+        return ParseOutcome(path, None, f"{type(e).__name__}: {e}")
+
+
+def _parse_in_worker(path: Path, checkpoints: bool = False) -> ParseOutcome:
+    """Process pool entry point."""
+    return _parse_one(_worker_parser, path, checkpoints)
+
+
+def default_jobs() -> int:
+    """Default number of worker processes: one per CPU."""
+    return os.cpu_count() or 1
+
+
+def parse_files(paths: Sequence[Union[str, Path]], jobs: Optional[int] = None,
+                parser: Optional[MDParser] = None, checkpoints: bool = False) -> Iterator[ParseOutcome]:
+    """Parse files across a process pool.
+    
+    Outcomes are yielded in the order of ``paths`` as soon as they are
+    available. A file that fails to parse yields an outcome with
+    ``error`` set instead of stopping the run, and if a worker process
+    dies the remaining files are parsed in the current process.
+    
+    Args:
+        paths: Files to parse
+        jobs: Number of worker processes, defaults to the CPU count
+        parser: Parser to use in every worker
+        checkpoints: Also return a resume checkpoint per file; needs a
+            parser with ``parse_file_checkpointed``
+    
+    Returns:
+        Iterator[ParseOutcome]: One outcome per path, in input order
+    """
+    paths: List[Path] = [Path(p) for p in paths]
+    parser = parser or StreamingMDParser()
+    jobs = default_jobs() if jobs is None else max(1, jobs)
+    jobs = min(jobs, len(paths))
+    
+    if jobs <= 1:
+        for path in paths:
+            yield _parse_one(parser, path, checkpoints)
+        return
+    
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(parser,)) as executor:
+            chunksize = max(1, len(paths) // (jobs * 4))
+            worker = functools.partial(_parse_in_worker, checkpoints=checkpoints)
+            for outcome in executor.map(worker, paths, chunksize=chunksize):
+                done += 1
+                yield outcome
+    except BrokenProcessPool:
+        # A worker crashed (e.g. killed for memory); finish in-process
+        for path in paths[done:]:
+            yield _parse_one(parser, path, checkpoints)
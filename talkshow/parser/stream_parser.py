@@ -0,0 +1,455 @@
+"""One-pass streaming parser for SpecStory chat history."""
+
+import hashlib
+import os
+import re
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from ..models.chat import ChatSession, QAPair
+from .md_parser import MDParser
+from .time_extractor import TimeExtractor
+
+
+USER_MARKER = '_**User**_'
+ASSISTANT_MARKER = '_**Assistant**_'
+SEPARATOR = '---'
+
+# Command prompts and bare timestamps, as in MDParser._clean_assistant_content
+ARTIFACT_LINE = re.compile(r'[a-zA-Z0-9_-]+@[a-zA-Z0-9_-]+:|\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+
+# Cheap pre-check before handing a line to the TimeExtractor
+TIMESTAMP_HINT = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}')
+
+# Bytes before a checkpoint that must be unchanged for parsing to resume there
+TAIL_WINDOW = 4096
+
+# StreamState attributes saved in a checkpoint; _route follows from section_type
+_STATE_FIELDS = (
+    'bytes_read', 'question', 'has_answer', 'section_type', 'section_pending', 'section_last',
+    'section_blanks', 'question_lines', 'found_user_marker', 'answer_lines', 'answer_started',
+    'in_code_block', 'after_datetime_command'
+)
+_STATE_TIMES = ('ctime', 'command_timestamp', 'first_timestamp')
+
+
+class StreamState:
+    """State machine that turns lines of a history file into QA pairs.
+    
+    Lines are fed one at a time and QA pairs are returned as soon as
+    the next question starts, so only the pair being assembled is kept
+    in memory. The output is identical to ``MDParser``: the text is cut
+    into sections at every ``---``, each section is stripped, typed by
+    its first marker line, and the assistant (and trailing untyped)
+    sections of a question make up its answer.
+    """
+    
+    def __init__(self, ctime: datetime, time_extractor: Optional[TimeExtractor] = None):
+        """Initialize the state machine.
+        
+        Args:
+            ctime: Timestamp for QA pairs whose answer contains none
+            time_extractor: Extractor for timestamps in answers
+        """
+        self.ctime = ctime
+        self.time_extractor = time_extractor or TimeExtractor()
+        self.bytes_read = 0
+        
+        # Current question and whether assistant sections follow it
+        self.question: Optional[str] = None
+        self.has_answer = False
+        
+        # Section being read
+        self.section_type: Optional[str] = None
+        self.section_pending: List[str] = []
+        self.section_last: Optional[str] = None
+        self.section_blanks: List[str] = []
+        self.question_lines: List[str] = []
+        self.found_user_marker = False
+        
+        # Answer being assembled
+        self.answer_lines: List[str] = []
+        self.answer_started = False
+        self.in_code_block = False
+        self.after_datetime_command = False
+        self.command_timestamp: Optional[datetime] = None
+        self.first_timestamp: Optional[datetime] = None
+        
+        self._ready: List[QAPair] = []
+        self._route = self._untyped_line
+    
+    def feed(self, line: str) -> Sequence[QAPair]:
+        """Consume one line of the file.
+        
+        Args:
+            line: Line including its trailing newline, if any
+        
+        Returns:
+            Sequence[QAPair]: QA pairs completed by this line
+        """
+        self.bytes_read += len(line) if line.isascii() else len(line.encode('utf-8'))
+        if line.endswith('\n'):
+            line = line[:-1]
+        
+        if SEPARATOR in line:
+            pieces = line.split(SEPARATOR)
+            self._section_line(pieces[0])
+            for piece in pieces[1:]:
+                self._end_section()
+                self._section_line(piece)
+        else:
+            self._section_line(line)
+        
+        return self._drain()
+    
+    def close(self) -> Sequence[QAPair]:
+        """Finish the file and return the last QA pairs."""
+        self._end_section()
+        if self.question and self.has_answer:
+            self._emit()
+        return self._drain()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Capture the state between two lines for resuming later."""
+        state = {name: getattr(self, name) for name in _STATE_FIELDS}
+        for name in ('section_pending', 'section_blanks', 'question_lines', 'answer_lines'):
+            state[name] = list(state[name])
+        for name in _STATE_TIMES:
+            value = getattr(self, name)
+            state[name] = value.isoformat() if value else None
+        return state
+    
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any], time_extractor: Optional[TimeExtractor] = None) -> 'StreamState':
+        """Restore a state captured by ``to_dict``."""
+        restored = cls(datetime.fromisoformat(state['ctime']), time_extractor)
+        for name in _STATE_FIELDS:
+            setattr(restored, name, state[name])
+        for name in ('command_timestamp', 'first_timestamp'):
+            setattr(restored, name, datetime.fromisoformat(state[name]) if state[name] else None)
+        restored._route = {
+            'user': restored._question_line,
+            'assistant': restored._answer_line
+        }.get(restored.section_type, restored._untyped_line)
+        return restored
+    
+    def _drain(self) -> Sequence[QAPair]:
+        ready = self._ready
+        if not ready:
+            return ()
+        self._ready = []
+        return ready
+    
+    def _section_line(self, line: str) -> None:
+        """Add a line to the current section, stripping the section as a whole."""
+        if not line.strip():
+            # Blank lines only count between non-blank ones
+            if self.section_last is not None:
+                self.section_blanks.append(line)
+            return
+        
+        if self.section_last is None:
+            line = line.lstrip()
+        else:
+            self._route(self.section_last)
+            if self.section_blanks:
+                for blank in self.section_blanks:
+                    self._route(blank)
+                self.section_blanks = []
+        self.section_last = line
+    
+    def _end_section(self) -> None:
+        """Close the current section at a separator or the end of the file."""
+        if self.section_last is None:
+            # Empty sections are dropped
+            self.section_blanks = []
+            return
+        
+        self._route(self.section_last.rstrip())
+        
+        if self.section_type == 'user':
+            self.question = '\n'.join(self.question_lines).strip()
+        elif self.section_type is None and self.question and self.has_answer:
+            # Untyped sections continue the current answer
+            for pending in self.section_pending:
+                self._answer_line(pending)
+        
+        self.section_type = None
+        self._route = self._untyped_line
+        self.section_pending = []
+        self.section_last = None
+        self.section_blanks = []
+        self.question_lines = []
+        self.found_user_marker = False
+    
+    def _untyped_line(self, line: str) -> None:
+        """Handle a line of a section whose type is not known yet."""
+        stripped = line.strip()
+        if stripped.startswith(USER_MARKER):
+            if self.question and self.has_answer:
+                self._emit()
+            self.section_type = 'user'
+            self._route = self._question_line
+            self.section_pending = []
+            self._question_line(line)
+        elif stripped.startswith(ASSISTANT_MARKER):
+            self.section_type = 'assistant'
+            self._route = self._answer_line
+            self.has_answer = True
+            for pending in self.section_pending:
+                self._answer_line(pending)
+            self.section_pending = []
+            self._answer_line(line)
+        else:
+            self.section_pending.append(line)
+    
+    def _question_line(self, line: str) -> None:
+        stripped = line.strip()
+        if stripped == USER_MARKER:
+            self.found_user_marker = True
+        elif self.found_user_marker and stripped:
+            self.question_lines.append(stripped)
+    
+    def _answer_line(self, line: str) -> None:
+        """Extract timestamps and answer text from a line of the answer."""
+        if self.command_timestamp is None:
+            timestamp = None
+            if ':' in line and TIMESTAMP_HINT.search(line):
+                timestamp = self.time_extractor.extract_first_timestamp(line)
+                if timestamp and (self.first_timestamp is None or timestamp < self.first_timestamp):
+                    self.first_timestamp = timestamp
+            
+            # The first timestamp printed after a datetime command wins
+            if 'datetime' in line and ('print' in line or 'now()' in line):
+                self.after_datetime_command = True
+            elif self.after_datetime_command and timestamp:
+                self.command_timestamp = timestamp
+        
+        stripped = line.strip()
+        if stripped == ASSISTANT_MARKER:
+            return
+        
+        # Skip command execution blocks
+        if stripped.startswith('```'):
+            self.in_code_block = not self.in_code_block
+            return
+        if self.in_code_block:
+            return
+        
+        # Skip empty lines at the beginning
+        if not self.answer_started and not stripped:
+            return
+        self.answer_started = True
+        
+        # Skip command prompts and bare timestamps
+        if ARTIFACT_LINE.match(stripped):
+            return
+        
+        self.answer_lines.append(line)
+    
+    def _emit(self) -> None:
+        """Turn the current question and answer into a QA pair."""
+        answer = '\n'.join(self.answer_lines).strip()
+        timestamp = self.command_timestamp or self.first_timestamp
+        if not timestamp:
+            timestamp = self.ctime
+        elif timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        
+        if answer:
+            self._ready.append(QAPair(question=self.question, answer=answer, timestamp=timestamp))
+        
+        self.has_answer = False
+        self.answer_lines = []
+        self.answer_started = False
+        self.in_code_block = False
+        self.after_datetime_command = False
+        self.command_timestamp = None
+        self.first_timestamp = None
+
+
+@dataclass
+class ParseCheckpoint:
+    """Point after the last complete line of a file where parsing can resume.
+    
+    Files that are still being written only grow at the end, so the next
+    parse can seek to ``offset``, restore ``state`` and read just the
+    appended bytes. The first ``emitted`` QA pairs were complete at the
+    checkpoint and cannot change by appending; only the pair in progress
+    and new ones are parsed again.
+    """
+    
+    offset: int
+    tail_sha256: str
+    emitted: int
+    state: Dict[str, Any]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the checkpoint to a JSON-compatible dictionary."""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ParseCheckpoint':
+        """Create a checkpoint from a dictionary."""
+        return cls(**data)
+
+
+class StreamingMDParser(MDParser):
+    """Line-oriented parser that reads a file in a single pass.
+    
+    Produces the same sessions as ``MDParser`` without loading the whole
+    file or re-splitting sections, so time is linear in the file size
+    and memory is bounded by the largest QA pair.
+    """
+    
+    def parse_file(self, file_path: str) -> Optional[ChatSession]:
+        """Parse a single markdown file into a ChatSession."""
+        filename = os.path.basename(file_path)
+        ctime = self._resolve_ctime(filename, file_path)
+        state = StreamState(ctime, self.time_extractor)
+        
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                qa_pairs = list(self._iter_state(state, f))
+        except (FileNotFoundError, IOError, UnicodeDecodeError) as e:
+            print(f"Error reading file {file_path}: {e}")
+            return None
+        
+        return self._build_session(filename, ctime, state.bytes_read, qa_pairs)
+    
+    def parse_content(self, content: str, file_path: str) -> Optional[ChatSession]:
+        """Parse markdown content into a ChatSession."""
+        filename = os.path.basename(file_path)
+        ctime = self._resolve_ctime(filename, file_path)
+        state = StreamState(ctime, self.time_extractor)
+        qa_pairs = list(self._iter_state(state, _split_lines(content)))
+        return self._build_session(filename, ctime, state.bytes_read, qa_pairs)
+    
+    def iter_qa_pairs(self, lines: Iterable[str], ctime: datetime) -> Iterator[QAPair]:
+        """Yield QA pairs from lines of a history file as each one completes.
+        
+        Args:
+            lines: Lines with their trailing newlines, e.g. an open file
+            ctime: Timestamp for QA pairs whose answer contains none
+        
+        Returns:
+            Iterator[QAPair]: QA pairs in file order
+        """
+        return self._iter_state(StreamState(ctime, self.time_extractor), lines)
+    
+    def parse_file_checkpointed(self, file_path: str) -> Tuple[Optional[ChatSession], Optional[ParseCheckpoint]]:
+        """Parse a file and record where a later parse can resume.
+        
+        Args:
+            file_path: History file to parse
+        
+        Returns:
+            Tuple[Optional[ChatSession], Optional[ParseCheckpoint]]: The
+                session as ``parse_file`` returns it, and the checkpoint after
+                the last complete line, or None if the file could not be read
+        """
+        filename = os.path.basename(file_path)
+        ctime = self._resolve_ctime(filename, file_path)
+        try:
+            with open(file_path, 'rb') as f:
+                state = StreamState(ctime, self.time_extractor)
+                qa_pairs, checkpoint = self._read_from(f, state, 0, 0)
+        except (FileNotFoundError, IOError, UnicodeDecodeError) as e:
+            print(f"Error reading file {file_path}: {e}")
+            return None, None
+        
+        return self._build_session(filename, ctime, state.bytes_read, qa_pairs), checkpoint
+    
+    def resume_file(self, file_path: str, checkpoint: ParseCheckpoint,
+                    completed: Sequence[QAPair]) -> Optional[Tuple[Optional[ChatSession], ParseCheckpoint]]:
+        """Parse only what was appended to a file since a checkpoint.
+        
+        Args:
+            file_path: History file parsed before
+            checkpoint: Checkpoint of the previous parse
+            completed: The first ``checkpoint.emitted`` QA pairs of the previous parse
+        
+        Returns:
+            Optional[Tuple[Optional[ChatSession], ParseCheckpoint]]: The
+                updated session and the new checkpoint, or None if the file
+                no longer ends its checkpointed part with the same bytes, in
+                which case it has to be parsed in full
+        """
+        with open(file_path, 'rb') as f:
+            if _tail_sha256(f, checkpoint.offset) != checkpoint.tail_sha256:
+                return None
+            
+            state = StreamState.from_dict(checkpoint.state, self.time_extractor)
+            f.seek(checkpoint.offset)
+            qa_pairs, new_checkpoint = self._read_from(f, state, checkpoint.offset, checkpoint.emitted)
+        
+        session = self._build_session(os.path.basename(file_path), state.ctime, state.bytes_read,
+                                      list(completed[:checkpoint.emitted]) + qa_pairs)
+        return session, new_checkpoint
+    
+    @staticmethod
+    def _read_from(f: BinaryIO, state: StreamState, offset: int, emitted: int) -> Tuple[List[QAPair], ParseCheckpoint]:
+        """Feed a binary file from ``offset`` to its end into a state.
+        
+        Lines are split as in text mode with universal newlines. A last
+        line without a newline may still be being written, so the
+        checkpoint is taken before it.
+        
+        Returns:
+            Tuple[List[QAPair], ParseCheckpoint]: QA pairs completed after
+                ``offset`` and the checkpoint after the last complete line
+        """
+        qa_pairs: List[QAPair] = []
+        partial = b''
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                partial = raw
+                break
+            offset += len(raw)
+            qa_pairs.extend(_feed_text(state, raw.decode('utf-8')))
+        
+        checkpoint = ParseCheckpoint(offset=offset, tail_sha256=_tail_sha256(f, offset),
+                                     emitted=emitted + len(qa_pairs), state=state.to_dict())
+        if partial:
+            qa_pairs.extend(_feed_text(state, partial.decode('utf-8', errors='ignore')))
+        qa_pairs.extend(state.close())
+        return qa_pairs, checkpoint
+    
+    @staticmethod
+    def _iter_state(state: StreamState, lines: Iterable[str]) -> Iterator[QAPair]:
+        for line in lines:
+            ready = state.feed(line)
+            if ready:
+                yield from ready
+        yield from state.close()
+
+
+def _split_lines(content: str) -> Iterator[str]:
+    """Split text at ``\\n`` only, keeping the newlines."""
+    start = 0
+    while True:
+        end = content.find('\n', start) + 1
+        if not end:
+            break
+        yield content[start:end]
+        start = end
+    if start < len(content):
+        yield content[start:]
+
+
+def _feed_text(state: StreamState, text: str) -> List[QAPair]:
+    """Feed decoded text, translating \\r\\n and \\r newlines like text mode."""
+    if '\r' not in text:
+        return list(state.feed(text))
+    qa_pairs: List[QAPair] = []
+    for line in _split_lines(text.replace('\r\n', '\n').replace('\r', '\n')):
+        qa_pairs.extend(state.feed(line))
+    return qa_pairs
+
+
+def _tail_sha256(f: BinaryIO, offset: int) -> str:
+    """Hash the ``TAIL_WINDOW`` bytes of a file before ``offset``."""
+    start = max(0, offset - TAIL_WINDOW)
+    f.seek(start)
+    return hashlib.sha256(f.read(offset - start)).hexdigest()
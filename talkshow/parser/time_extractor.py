@@ -2,50 +2,47 @@
 
 import re
 from datetime import datetime
-from typing import Optional, List
+from typing import Iterator, List, Optional
+
+
+# Longest timestamp strptime's %f accepts: 'YYYY-MM-DD HH:MM:SS.ffffff'
+_MAX_TIMESTAMP_LENGTH = 26
 
 
 class TimeExtractor:
     """Extracts timestamps from markdown content."""
     
-    # Pattern for datetime in command output
-    DATETIME_PATTERNS = [
-        # 2025-07-28 23:16:38.431711
-        r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?)',
-        # 2025-07-25 20:55:32.182798 
-        r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+)',
-        # More patterns can be added as needed
-    ]
+    # Datetime in command output, e.g. 2025-07-28 23:16:38.431711
+    DATETIME_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?')
     
     @classmethod
     def extract_first_timestamp(cls, content: str) -> Optional[datetime]:
-        """Extract the first timestamp found in content."""
-        timestamps = cls.extract_all_timestamps(content)
-        return timestamps[0] if timestamps else None
+        """Extract the earliest timestamp found in content."""
+        return min(cls._iter_timestamps(content), default=None)
     
     @classmethod
     def extract_all_timestamps(cls, content: str) -> List[datetime]:
-        """Extract all timestamps found in content."""
-        timestamps = []
-        
-        for pattern in cls.DATETIME_PATTERNS:
-            matches = re.findall(pattern, content)
-            for match in matches:
-                try:
-                    # Try to parse the datetime string
-                    dt = cls._parse_datetime_string(match)
-                    if dt:
-                        timestamps.append(dt)
-                except ValueError:
-                    continue
-        
-        # Sort timestamps and remove duplicates
-        timestamps = sorted(list(set(timestamps)))
-        return timestamps
+        """Extract all timestamps found in content, sorted and without duplicates."""
+        return sorted(set(cls._iter_timestamps(content)))
+    
+    @classmethod
+    def _iter_timestamps(cls, content: str) -> Iterator[datetime]:
+        """Yield the valid timestamps of content in reading order."""
+        for match in cls.DATETIME_PATTERN.finditer(content):
+            dt = cls._parse_datetime_string(match.group())
+            if dt:
+                yield dt
     
     @classmethod
     def _parse_datetime_string(cls, dt_str: str) -> Optional[datetime]:
         """Parse datetime string with various formats."""
+        # Fast path; older Pythons only accept 3 or 6 fractional digits here
+        if len(dt_str) <= _MAX_TIMESTAMP_LENGTH:
+            try:
+                return datetime.fromisoformat(dt_str)
+            except ValueError:
+                pass
+        
         # Common datetime formats
         formats = [
             '%Y-%m-%d %H:%M:%S.%f',
@@ -68,20 +65,22 @@ class TimeExtractor:
         # Common pattern: python -c "from datetime import datetime;print(datetime.now())"
         # Followed by the actual timestamp
         
-        lines = assistant_content.split('\n')
-        found_datetime_command = False
-        
-        for line in lines:
-            # Check if this line contains datetime command
-            if 'datetime' in line and ('print' in line or 'now()' in line):
-                found_datetime_command = True
-                continue
+        # Content without a datetime command goes straight to the fallback
+        if 'datetime' in assistant_content:
+            lines = assistant_content.split('\n')
+            found_datetime_command = False
             
-            # If we found datetime command, next lines might contain timestamp
-            if found_datetime_command:
-                timestamp = cls.extract_first_timestamp(line)
-                if timestamp:
-                    return timestamp
+            for line in lines:
+                # Check if this line contains datetime command
+                if 'datetime' in line and ('print' in line or 'now()' in line):
+                    found_datetime_command = True
+                    continue
+                
+                # If we found datetime command, next lines might contain timestamp
+                if found_datetime_command and ':' in line:
+                    timestamp = cls.extract_first_timestamp(line)
+                    if timestamp:
+                        return timestamp
         
         # Fallback: extract any timestamp from the content
         return cls.extract_first_timestamp(assistant_content)
\ No newline at end of file
@@ -0,0 +1,248 @@
+"""Watching a history directory and re-indexing it as files change.
+
+On Linux the directory is watched with inotify through ``ctypes``, so
+no extra package is needed; elsewhere, or when inotify is unavailable,
+the directory is polled by comparing file mtimes and sizes. Bursts of
+events (an editor saving, SpecStory appending in chunks) are debounced
+into one incremental indexing run.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from .incremental import IncrementalIndexer, IndexResult
+
+
+# inotify(7) constants
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+              | IN_DELETE_SELF | IN_MOVE_SELF)
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class PollingWatcher:
+    """Detects changes by comparing the mtime and size of every file."""
+    
+    def __init__(self, directory: Path, suffix: str = ".md", interval: float = 1.0):
+        """Initialize the watcher.
+        
+        Args:
+            directory: Directory to watch
+            suffix: Only files with this suffix are considered
+            interval: Seconds between two scans
+        """
+        self.directory = Path(directory)
+        self.suffix = suffix
+        self.interval = interval
+        self._snapshot = self._scan()
+    
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Get the mtime and size of every watched file."""
+        snapshot = {}
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith(self.suffix):
+                        try:
+                            stat = entry.stat()
+                        except FileNotFoundError:
+                            continue
+                        snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+        return snapshot
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a watched file changes.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+        
+        Returns:
+            bool: True if something changed, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            if snapshot != self._snapshot:
+                self._snapshot = snapshot
+                return True
+            
+            remaining = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if remaining <= 0:
+                return False
+            time.sleep(remaining)
+    
+    def close(self) -> None:
+        """Release resources; nothing to do for polling."""
+
+
+class InotifyWatcher:
+    """Detects changes with Linux inotify, without polling."""
+    
+    def __init__(self, directory: Path, suffix: str = ".md"):
+        """Start watching a directory.
+        
+        Args:
+            directory: Directory to watch
+            suffix: Only events for files with this suffix are reported
+        
+        Raises:
+            OSError: If inotify is not available or the directory cannot be watched
+        """
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+        
+        self.directory = Path(directory)
+        self.suffix = suffix.encode('utf-8')
+        
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError("libc does not provide inotify")
+        
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        
+        if libc.inotify_add_watch(self._fd, os.fsencode(str(self.directory)), WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(errno, os.strerror(errno), str(self.directory))
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until a watched file changes.
+        
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+        
+        Returns:
+            bool: True if something changed, False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return False
+            if self._drain():
+                return True
+    
+    def _drain(self) -> bool:
+        """Read all pending events and tell whether any of them is relevant."""
+        relevant = False
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return relevant
+            
+            offset = 0
+            while offset < len(buffer):
+                _, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                name = buffer[offset + _EVENT_HEADER.size:offset + _EVENT_HEADER.size + length].rstrip(b'\0')
+                offset += _EVENT_HEADER.size + length
+                # Overflowed queues and a moved or deleted directory need a full check
+                if mask & (IN_Q_OVERFLOW | IN_DELETE_SELF | IN_MOVE_SELF) or name.endswith(self.suffix):
+                    relevant = True
+    
+    def close(self) -> None:
+        """Stop watching."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(directory: Path, poll_interval: float = 1.0, force_polling: bool = False):
+    """Create an inotify watcher for a directory, falling back to polling.
+    
+    Args:
+        directory: Directory to watch
+        poll_interval: Seconds between scans when polling
+        force_polling: Always poll, e.g. for network file systems
+    
+    Returns:
+        InotifyWatcher or PollingWatcher: Object with ``wait(timeout)`` and ``close()``
+    """
+    if not force_polling:
+        try:
+            return InotifyWatcher(directory)
+        except OSError:
+            pass
+    return PollingWatcher(directory, interval=poll_interval)
+
+
+class HistoryWatcher:
+    """Keeps storage in sync with a history directory while it changes.
+    
+    Every update is an ``IncrementalIndexer`` run, so only new and changed
+    files are parsed and written. The storage data version changes with
+    each write, which is how running web servers pick up the new data.
+    """
+    
+    def __init__(self, indexer: IncrementalIndexer, history_dir: Path, watcher=None,
+                 debounce: float = 0.5):
+        """Initialize the watcher.
+        
+        Args:
+            indexer: Indexer that updates storage
+            history_dir: Directory containing SpecStory markdown files
+            watcher: Change detector, by default ``create_watcher(history_dir)``
+            debounce: Seconds without further events before re-indexing
+        """
+        self.indexer = indexer
+        self.history_dir = Path(history_dir)
+        self.watcher = watcher if watcher is not None else create_watcher(self.history_dir)
+        self.debounce = debounce
+    
+    def update(self) -> IndexResult:
+        """Re-index the history directory once."""
+        return self.indexer.run(self.history_dir)
+    
+    def watch(self, on_update: Callable[[IndexResult], None], stop: Optional[threading.Event] = None,
+              timeout: float = 1.0) -> None:
+        """Index once, then re-index after every burst of changes until stopped.
+        
+        Args:
+            on_update: Called with the result of each run that changed storage or failed on a file
+            stop: Event that ends the loop when set
+            timeout: Seconds between checks of ``stop``
+        """
+        stop = stop or threading.Event()
+        try:
+            result = self.update()
+            if result.changed or result.failed:
+                on_update(result)
+            
+            while not stop.is_set():
+                if not self.watcher.wait(timeout):
+                    continue
+                # Let a burst of writes settle before parsing
+                while not stop.is_set() and self.watcher.wait(self.debounce):
+                    pass
+                
+                result = self.update()
+                if result.changed or result.failed:
+                    on_update(result)
+        finally:
+            self.watcher.close()
@@ -0,0 +1,9 @@
+"""Full-text search components."""
+
+from .index import SearchIndex, SearchHit, tokenize
+
+__all__ = [
+    "SearchIndex",
+    "SearchHit",
+    "tokenize",
+]
\ No newline at end of file
@@ -0,0 +1,214 @@
+"""Inverted index for full-text search over QA pairs."""
+
+import heapq
+import math
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.chat import ChatSession
+
+
+# Kana, CJK ideographs and Hangul: scripts written without spaces between words
+CJK_RANGES = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff'
+TOKEN_PATTERN = re.compile(f'([{CJK_RANGES}]+)|([^\\W{CJK_RANGES}]+)')
+
+# Field weights: a match in the question counts more than one in the answer
+FIELD_WEIGHTS = (
+    ('question', 3),
+    ('question_summary', 2),
+    ('answer_summary', 2),
+    ('answer', 1),
+)
+
+
+def tokenize(text: str, for_query: bool = False) -> List[str]:
+    """Split text into search tokens.
+    
+    Latin text is split into lowercase words. CJK runs have no word
+    boundaries, so they are indexed as character unigrams and bigrams;
+    queries use bigrams (or the unigram for a single character), which
+    makes multi-character CJK queries behave like phrase matches.
+    
+    Args:
+        text: Text to tokenize
+        for_query: Produce query tokens instead of index tokens
+    
+    Returns:
+        List[str]: Tokens in text order
+    """
+    tokens = []
+    for match in TOKEN_PATTERN.finditer(text.lower()):
+        cjk, word = match.groups()
+        if word:
+            tokens.append(word)
+            continue
+        
+        if len(cjk) == 1:
+            tokens.append(cjk)
+            continue
+        
+        if not for_query:
+            tokens.extend(cjk)
+        tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+
+@dataclass
+class SearchHit:
+    """A ranked search result pointing at one QA pair."""
+    
+    filename: str
+    theme: str
+    qa_index: int
+    score: float
+    question: str
+    question_summary: Optional[str]
+    snippet: str
+    timestamp: Optional[datetime]
+    
+    def to_dict(self) -> dict:
+        """Convert hit to dictionary for serialization."""
+        return {
+            'filename': self.filename,
+            'theme': self.theme,
+            'qa_index': self.qa_index,
+            'score': round(self.score, 4),
+            'question': self.question,
+            'question_summary': self.question_summary,
+            'snippet': self.snippet,
+            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+        }
+
+
+class SearchIndex:
+    """BM25-ranked inverted index over questions, answers and summaries.
+    
+    Every QA pair is one document. Postings map a token to the weighted
+    term frequency per document, so a query only touches the postings of
+    its own tokens.
+    """
+    
+    K1 = 1.2
+    B = 0.75
+    SNIPPET_LENGTH = 120
+    
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_lengths: List[int] = []
+        self._docs: List[Tuple[ChatSession, int]] = []
+        self._total_length = 0
+    
+    @classmethod
+    def from_sessions(cls, sessions: Iterable[ChatSession]) -> 'SearchIndex':
+        """Build an index over all QA pairs of the given sessions."""
+        index = cls()
+        for session in sessions:
+            index.add_session(session)
+        return index
+    
+    @property
+    def document_count(self) -> int:
+        """Number of indexed QA pairs."""
+        return len(self._docs)
+    
+    def add_session(self, session: ChatSession) -> None:
+        """Index every QA pair of a session."""
+        for qa_index, qa in enumerate(session.qa_pairs):
+            doc_id = len(self._docs)
+            self._docs.append((session, qa_index))
+            
+            frequencies: Dict[str, int] = {}
+            length = 0
+            for field, weight in FIELD_WEIGHTS:
+                text = getattr(qa, field)
+                if not text:
+                    continue
+                for token in tokenize(text):
+                    frequencies[token] = frequencies.get(token, 0) + weight
+                    length += 1
+            
+            for token, frequency in frequencies.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = {}
+                postings[doc_id] = frequency
+            
+            self._doc_lengths.append(length)
+            self._total_length += length
+    
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> Tuple[int, List[SearchHit]]:
+        """Search the index.
+        
+        All query tokens must occur in a QA pair for it to match.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of hits to return
+            offset: Number of top-ranked hits to skip
+        
+        Returns:
+            Tuple[int, List[SearchHit]]: Total number of matches and the requested page
+        """
+        terms = list(dict.fromkeys(tokenize(query, for_query=True)))
+        if not terms or not self._docs:
+            return 0, []
+        
+        postings = [self._postings.get(term) for term in terms]
+        if any(p is None for p in postings):
+            return 0, []
+        
+        # Intersect starting from the rarest term
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates.intersection_update(p.keys())
+            if not candidates:
+                return 0, []
+        
+        doc_count = len(self._docs)
+        average_length = self._total_length / doc_count or 1
+        idfs = [math.log(1 + (doc_count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+        
+        def score(doc_id: int) -> float:
+            norm = self.K1 * (1 - self.B + self.B * self._doc_lengths[doc_id] / average_length)
+            total = 0.0
+            for p, idf in zip(postings, idfs):
+                tf = p[doc_id]
+                total += idf * tf * (self.K1 + 1) / (tf + norm)
+            return total
+        
+        ranked = heapq.nlargest(offset + limit, ((score(d), -d) for d in candidates))
+        hits = [self._make_hit(-neg_doc_id, s, query) for s, neg_doc_id in ranked[offset:]]
+        return len(candidates), hits
+    
+    def _make_hit(self, doc_id: int, score: float, query: str) -> SearchHit:
+        """Build a SearchHit with a snippet around the first match."""
+        session, qa_index = self._docs[doc_id]
+        qa = session.qa_pairs[qa_index]
+        return SearchHit(
+            filename=session.meta.filename,
+            theme=session.meta.theme,
+            qa_index=qa_index,
+            score=score,
+            question=qa.question,
+            question_summary=qa.question_summary,
+            snippet=self._snippet(qa.answer, query),
+            timestamp=qa.timestamp
+        )
+    
+    def _snippet(self, text: str, query: str) -> str:
+        """Cut a window of the text around the first occurrence of the query."""
+        lowered = text.lower()
+        position = -1
+        for needle in [query.lower().strip()] + tokenize(query, for_query=True):
+            if needle:
+                position = lowered.find(needle)
+                if position >= 0:
+                    break
+        
+        start = max(0, position - self.SNIPPET_LENGTH // 3) if position >= 0 else 0
+        end = start + self.SNIPPET_LENGTH
+        snippet = ' '.join(text[start:end].split())
+        return ('...' if start > 0 else '') + snippet + ('...' if end < len(text) else '')
@@ -1,7 +1,17 @@
 """Data storage components."""
 
 from .json_storage import JSONStorage
+from .jsonl_storage import JSONLStorage
+from .sqlite_storage import SQLiteStorage
+from .repository import SessionRepository
+from .async_repository import AsyncSessionRepository
+from .factory import create_storage
 
 __all__ = [
     "JSONStorage",
+    "JSONLStorage",
+    "SQLiteStorage",
+    "SessionRepository",
+    "AsyncSessionRepository",
+    "create_storage",
 ]
\ No newline at end of file
@@ -0,0 +1,106 @@
+"""Awaitable facade over the session repository for async web handlers."""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from ..analytics.insights import DailyInsights
+from ..analytics.qa_table import QATable
+from ..models.chat import ChatSession, SessionDigest
+from ..search.index import SearchIndex
+from .repository import SessionRepository
+
+
+class AsyncSessionRepository:
+    """Run blocking repository and storage calls off the event loop.
+    
+    Calls go to a bounded thread pool, so a slow load of a large archive
+    occupies a worker thread instead of the event loop, and at most
+    ``max_workers`` blocking calls run at once. Concurrent identical
+    calls on the same data version are coalesced: the first one starts
+    the work and the others await the same in-flight future.
+    """
+    
+    def __init__(self, repository: SessionRepository, max_workers: int = 4):
+        """Initialize the facade.
+        
+        Args:
+            repository: Repository whose blocking methods are offloaded
+            max_workers: Size of the thread pool for blocking calls
+        """
+        self.repository = repository
+        self.storage = repository.storage
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="talkshow-io")
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+    
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking call on the thread pool and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    async def get_data_version(self) -> Any:
+        """Get the storage data version; for SQLite this is a query, so it runs on the pool."""
+        return await self.run(self.storage.get_data_version)
+    
+    async def coalesce(self, key: Hashable, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking call once for all concurrent callers with the same key.
+        
+        The data version is part of the key: a caller arriving after a
+        write must not join a call that may have read the older data, or
+        its response would be cached under the new version. A caller
+        that is cancelled stops waiting without cancelling the shared
+        call for the others.
+        
+        Args:
+            key: Identifies calls that produce the same result
+            func: Blocking callable
+        
+        Returns:
+            Any: The result of the shared call
+        """
+        key = (key, await self.get_data_version())
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self.run(func, *args, **kwargs))
+            self._inflight[key] = future
+            future.add_done_callback(functools.partial(self._forget, key))
+        return await asyncio.shield(future)
+    
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        """Drop a finished call so the next caller starts a fresh one."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+    
+    async def get_version(self) -> Any:
+        """Get the data version of the cached sessions, reloading them if stale."""
+        return await self.coalesce("version", lambda: self.repository.version)
+    
+    async def get_all_sessions(self) -> List[ChatSession]:
+        """Get all sessions sorted by creation time."""
+        return await self.coalesce("sessions", self.repository.get_all_sessions)
+    
+    async def get_all_metas(self) -> List[SessionDigest]:
+        """Get the digests of all sessions sorted by creation time."""
+        return await self.coalesce("metas", self.repository.get_all_metas)
+    
+    async def get_session(self, filename: str) -> Optional[ChatSession]:
+        """Get a single session by filename."""
+        return await self.coalesce(("session", filename), self.repository.get_session, filename)
+    
+    async def get_search_index(self) -> SearchIndex:
+        """Get the full-text index for the current data."""
+        return await self.coalesce("search_index", self.repository.get_search_index)
+    
+    async def get_qa_table(self) -> QATable:
+        """Get the columnar QA table for the current data."""
+        return await self.coalesce("qa_table", self.repository.get_qa_table)
+    
+    async def get_daily_insights(self) -> DailyInsights:
+        """Get the questions grouped by day for the current data."""
+        return await self.coalesce("daily_insights", self.repository.get_daily_insights)
+    
+    def close(self) -> None:
+        """Shut down the thread pool without waiting for running calls."""
+        self._executor.shutdown(wait=False)
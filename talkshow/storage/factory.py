@@ -0,0 +1,38 @@
+"""Storage backend selection."""
+
+from typing import Optional
+
+from ..config.manager import ConfigManager
+from ..models.storage import StorageInterface
+from .json_storage import JSONStorage
+from .jsonl_storage import JSONLStorage
+from .sqlite_storage import SQLiteStorage
+
+
+STORAGE_TYPES = ("json", "jsonl", "sqlite")
+
+
+def create_storage(config_manager: Optional[ConfigManager] = None,
+                   storage_type: Optional[str] = None,
+                   storage_path: Optional[str] = None) -> StorageInterface:
+    """Create the storage backend selected by ``storage.type``.
+    
+    Args:
+        config_manager: Configuration manager instance
+        storage_type: Backend name, overrides the configured ``storage.type``
+        storage_path: Backend file path, overrides the configured path
+        
+    Returns:
+        StorageInterface: The configured storage backend
+    """
+    config_manager = config_manager or ConfigManager()
+    storage_type = (storage_type or config_manager.get_storage_type()).lower()
+    
+    if storage_type == "sqlite":
+        return SQLiteStorage(str(storage_path or config_manager.get_database_path()))
+    if storage_type == "json":
+        return JSONStorage(str(storage_path or config_manager.get_data_file_path()))
+    if storage_type == "jsonl":
+        return JSONLStorage(str(storage_path or config_manager.get_log_file_path()))
+    
+    raise ValueError(f"Unknown storage type '{storage_type}', expected one of: {', '.join(STORAGE_TYPES)}")
@@ -4,14 +4,21 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple, BinaryIO
 
-from ..models.chat import ChatSession
+from ..models.chat import ChatSession, LazyChatSession, SessionDigest, SessionMeta
 from ..models.storage import StorageInterface
+from .locking import FileLock, atomic_write
 
 
 class JSONStorage(StorageInterface):
-    """JSON file-based storage for chat sessions."""
+    """JSON file-based storage for chat sessions.
+    
+    Writes replace the file atomically (temp file, fsync, rename), so
+    readers never see a partial file and need no lock. Read-modify-write
+    cycles hold an advisory lock on a ``.lock`` sidecar file, so a parse
+    job and the web server can share one data file.
+    """
     
     def __init__(self, storage_path: str = "data/sessions.json"):
         """Initialize JSON storage.
@@ -22,16 +29,26 @@ class JSONStorage(StorageInterface):
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # Sidecar offset table: filename -> byte range and digest of the session record
+        self.index_path = self.storage_path.with_name(self.storage_path.name + '.idx')
+        self._index_cache: Optional[Tuple[Tuple[int, ...], Dict[str, List[int]], Dict[str, Any]]] = None
+        
+        # Serializes read-modify-write cycles across processes
+        self.lock = FileLock(self.storage_path.with_name(self.storage_path.name + '.lock'))
+        
         # Initialize empty storage if file doesn't exist
         if not self.storage_path.exists():
-            self._save_data({})
+            with self.lock:
+                if not self.storage_path.exists():
+                    self._save_data({})
     
     def save_session(self, session: ChatSession) -> bool:
         """Save a single chat session."""
         try:
-            data = self._load_data()
-            data[session.meta.filename] = session.to_dict()
-            self._save_data(data)
+            with self.lock:
+                data = self._load_data()
+                data[session.meta.filename] = session.to_dict()
+                self._save_data(data)
             return True
         except Exception as e:
             print(f"Error saving session {session.meta.filename}: {e}")
@@ -39,60 +56,105 @@ class JSONStorage(StorageInterface):
     
     def save_sessions(self, sessions: List[ChatSession]) -> bool:
         """Save multiple chat sessions."""
+        return self.update_sessions(sessions)
+    
+    def update_sessions(self, sessions: List[ChatSession], deleted: Iterable[str] = ()) -> bool:
+        """Save and delete sessions with a single rewrite of the file."""
         try:
-            data = self._load_data()
-            for session in sessions:
-                data[session.meta.filename] = session.to_dict()
-            self._save_data(data)
+            with self.lock:
+                data = self._load_data()
+                for filename in deleted:
+                    data.pop(filename, None)
+                for session in sessions:
+                    data[session.meta.filename] = session.to_dict()
+                self._save_data(data)
             return True
         except Exception as e:
             print(f"Error saving sessions: {e}")
             return False
     
     def load_session(self, filename: str) -> Optional[ChatSession]:
-        """Load a single chat session by filename."""
+        """Load a single chat session by filename.
+        
+        Only the requested record is read and deserialized, using the
+        offset table kept next to the data file.
+        """
         try:
-            data = self._load_data()
-            if filename in data:
-                return ChatSession.from_dict(data[filename])
+            with open(self.storage_path, 'rb') as f:
+                entries = self._get_index(f)
+                if filename not in entries:
+                    return None
+                offset, length = entries[filename]
+                f.seek(offset)
+                record = f.read(length)
+            return ChatSession.from_dict(json.loads(record.decode('utf-8')))
+        except FileNotFoundError:
             return None
         except Exception as e:
             print(f"Error loading session {filename}: {e}")
             return None
     
     def load_all_sessions(self) -> List[ChatSession]:
-        """Load all stored chat sessions."""
+        """Load all stored chat sessions.
+        
+        Sessions are returned as ``LazyChatSession`` objects built from the
+        offset table: each keeps a view of its own record in the file
+        contents and decodes its QA pairs only when they are first accessed.
+        """
         try:
-            data = self._load_data()
+            with open(self.storage_path, 'rb') as f:
+                _, entries, digests = self._get_index_state(f)
+                f.seek(0)
+                raw = memoryview(f.read())
+            
             sessions = []
-            for session_data in data.values():
-                session = ChatSession.from_dict(session_data)
-                sessions.append(session)
+            for filename, (offset, length) in entries.items():
+                meta = SessionMeta.from_dict(digests[filename]['meta'])
+                sessions.append(LazyChatSession(meta, raw[offset:offset + length]))
             
             # Sort by creation time
             sessions.sort(key=lambda s: s.meta.ctime)
             return sessions
+        except FileNotFoundError:
+            return []
         except Exception as e:
             print(f"Error loading sessions: {e}")
             return []
     
+    def load_all_metas(self) -> List[SessionDigest]:
+        """Load the digests of all stored sessions from the offset table.
+        
+        The data file itself is not read unless the table has to be rebuilt.
+        """
+        try:
+            with open(self.storage_path, 'rb') as f:
+                digests = self._get_digests(f)
+            metas = [SessionDigest.from_dict(digest) for digest in digests.values()]
+            metas.sort(key=lambda d: d.meta.ctime)
+            return metas
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Error loading session metadata: {e}")
+            return []
+    
     def session_exists(self, filename: str) -> bool:
         """Check if a session exists in storage."""
         try:
-            data = self._load_data()
-            return filename in data
+            return filename in self._load_index()
         except Exception:
             return False
     
     def delete_session(self, filename: str) -> bool:
         """Delete a session from storage."""
         try:
-            data = self._load_data()
-            if filename in data:
+            with self.lock:
+                data = self._load_data()
+                if filename not in data:
+                    return False
                 del data[filename]
                 self._save_data(data)
-                return True
-            return False
+            return True
         except Exception as e:
             print(f"Error deleting session {filename}: {e}")
             return False
@@ -100,8 +162,7 @@ class JSONStorage(StorageInterface):
     def get_session_count(self) -> int:
         """Get total number of stored sessions."""
         try:
-            data = self._load_data()
-            return len(data)
+            return len(self._load_index())
         except Exception:
             return 0
     
@@ -123,18 +184,157 @@ class JSONStorage(StorageInterface):
         
         return info
     
+    def get_data_version(self) -> Any:
+        """Get the (mtime_ns, size, inode) signature of the storage file."""
+        try:
+            stat = self.storage_path.stat()
+            return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except FileNotFoundError:
+            return None
+    
     def _load_data(self) -> Dict[str, Any]:
-        """Load data from JSON file."""
+        """Load data from JSON file.
+        
+        A missing file is empty storage. A file that cannot be parsed
+        raises instead, so that a save does not overwrite it with nothing.
+        """
         try:
             with open(self.storage_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        except FileNotFoundError:
             return {}
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Storage file {self.storage_path} is corrupted: {e}") from e
     
     def _save_data(self, data: Dict[str, Any]) -> None:
-        """Save data to JSON file."""
-        with open(self.storage_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        """Atomically replace the JSON file and refresh the offset table.
+        
+        The output is byte-for-byte what ``json.dump(data, indent=2)``
+        produces, built one record at a time so that the byte range
+        of every session can be recorded.
+        """
+        entries: Dict[str, List[int]] = {}
+        digests = {filename: SessionDigest.from_session_dict(record).to_dict()
+                   for filename, record in data.items()}
+        if not data:
+            parts = [b'{}']
+        else:
+            parts = [b'{']
+            position = 1
+            for i, (filename, record) in enumerate(data.items()):
+                key = json.dumps(filename, ensure_ascii=False)
+                prefix = (('\n  ' if i == 0 else ',\n  ') + key + ': ').encode('utf-8')
+                value = json.dumps(record, indent=2, ensure_ascii=False)
+                value_bytes = value.replace('\n', '\n  ').encode('utf-8')
+                position += len(prefix)
+                entries[filename] = [position, len(value_bytes)]
+                position += len(value_bytes)
+                parts.append(prefix)
+                parts.append(value_bytes)
+            parts.append(b'\n}')
+        
+        atomic_write(self.storage_path, b''.join(parts))
+        self._save_index(self._file_signature(os.stat(self.storage_path)), entries, digests)
+    
+    @staticmethod
+    def _file_signature(stat: os.stat_result) -> Tuple[int, ...]:
+        """Signature used to tie the offset table to one version of the data file."""
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+    
+    def _load_index(self) -> Dict[str, List[int]]:
+        """Get the offset table for the current data file."""
+        try:
+            with open(self.storage_path, 'rb') as f:
+                return self._get_index(f)
+        except FileNotFoundError:
+            return {}
+    
+    def _get_index(self, f: BinaryIO) -> Dict[str, List[int]]:
+        """Get the offset table matching the already opened data file."""
+        return self._get_index_state(f)[1]
+    
+    def _get_digests(self, f: BinaryIO) -> Dict[str, Any]:
+        """Get the serialized session digests matching the already opened data file."""
+        return self._get_index_state(f)[2]
+    
+    def _get_index_state(self, f: BinaryIO) -> Tuple[Tuple[int, ...], Dict[str, List[int]], Dict[str, Any]]:
+        """Get the offset table and digests matching the already opened data file.
+        
+        The table is validated against ``fstat`` of the open handle, so the
+        offsets always describe the bytes that will be read from ``f``.
+        """
+        signature = self._file_signature(os.fstat(f.fileno()))
+        
+        if self._index_cache and self._index_cache[0] == signature:
+            return self._index_cache
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as idx:
+                index = json.load(idx)
+            if tuple(index.get('signature', ())) == signature:
+                self._index_cache = (signature, index['entries'], index['digests'])
+                return self._index_cache
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+            pass
+        
+        # Data file written elsewhere (older version, backup restore, ...)
+        raw = f.read()
+        entries = self._scan_offsets(raw)
+        digests = {filename: SessionDigest.from_session_dict(record).to_dict()
+                   for filename, record in json.loads(raw.decode('utf-8')).items()}
+        self._save_index(signature, entries, digests)
+        return self._index_cache
+    
+    def _save_index(self, signature: Tuple[int, ...], entries: Dict[str, List[int]],
+                    digests: Dict[str, Any]) -> None:
+        """Write the offset table sidecar file.
+        
+        The table can always be rebuilt from the data file, so it is
+        replaced atomically but not synced to disk.
+        """
+        self._index_cache = (signature, entries, digests)
+        try:
+            index = {'signature': list(signature), 'entries': entries, 'digests': digests}
+            atomic_write(self.index_path, json.dumps(index, ensure_ascii=False).encode('utf-8'), durable=False)
+        except OSError as e:
+            print(f"Error writing index {self.index_path}: {e}")
+    
+    @staticmethod
+    def _scan_offsets(raw: bytes) -> Dict[str, List[int]]:
+        """Compute record byte ranges of a top-level JSON object.
+        
+        The bytes are decoded as latin-1 so that string positions equal
+        byte positions; keys are re-decoded from their UTF-8 bytes.
+        """
+        text = raw.decode('latin-1')
+        decoder = json.JSONDecoder()
+        whitespace = ' \t\n\r'
+        entries: Dict[str, List[int]] = {}
+        
+        def skip(pos: int) -> int:
+            while pos < len(text) and text[pos] in whitespace:
+                pos += 1
+            return pos
+        
+        pos = skip(0)
+        if pos >= len(text) or text[pos] != '{':
+            raise ValueError("Storage file is not a JSON object")
+        pos = skip(pos + 1)
+        
+        while pos < len(text) and text[pos] != '}':
+            _, key_end = decoder.raw_decode(text, pos)
+            key = json.loads(raw[pos:key_end].decode('utf-8'))
+            pos = skip(key_end)
+            if text[pos] != ':':
+                raise ValueError(f"Malformed storage file at byte {pos}")
+            value_start = skip(pos + 1)
+            _, value_end = decoder.raw_decode(text, value_start)
+            entries[key] = [value_start, value_end - value_start]
+            pos = skip(value_end)
+            if pos < len(text) and text[pos] == ',':
+                pos = skip(pos + 1)
+        
+        return entries
     
     def backup_storage(self, backup_path: Optional[str] = None) -> bool:
         """Create a backup of the storage file."""
@@ -160,8 +360,8 @@ class JSONStorage(StorageInterface):
                 print(f"Backup file not found: {backup_path}")
                 return False
             
-            import shutil
-            shutil.copy2(backup_path, self.storage_path)
+            with self.lock:
+                atomic_write(self.storage_path, Path(backup_path).read_bytes())
             return True
         except Exception as e:
             print(f"Error restoring from backup: {e}")
@@ -170,7 +370,8 @@ class JSONStorage(StorageInterface):
     def clear_all(self) -> bool:
         """Clear all stored sessions."""
         try:
-            self._save_data({})
+            with self.lock:
+                self._save_data({})
             return True
         except Exception as e:
             print(f"Error clearing storage: {e}")
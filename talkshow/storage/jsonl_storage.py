@@ -0,0 +1,453 @@
+"""Append-only JSON Lines storage implementation."""
+
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Iterable, Tuple, BinaryIO
+
+from ..models.chat import ChatSession, LazyChatSession, SessionDigest, SessionMeta
+from ..models.storage import StorageInterface
+from .locking import FileLock, atomic_write, atomic_writer
+
+
+# Longest first line read when looking for the generation header
+_GENERATION_LINE_MAX = 256
+
+
+class JSONLStorage(StorageInterface):
+    """Append-only log of chat sessions in JSON Lines format.
+    
+    Every upsert appends a header line ``{"op": "put", "filename": ...,
+    "size": n, "digest": {...}}`` followed by the session on a line of
+    ``n`` bytes, and
+    every delete appends ``{"op": "del", "filename": ...}``. Saving a
+    session therefore costs one append no matter how large the log is.
+    
+    An in-memory table of the latest record of every session is built by
+    reading only the header lines and skipping over the bodies; it also
+    holds the session digests, so listings never touch a body. It is
+    caught up incrementally when the log grows and rebuilt when the file
+    is replaced, so a parse job and the web server can share one log.
+    Superseded and deleted records stay in the file until ``compact``
+    rewrites it. Each file starts with a ``{"op": "log", "generation":
+    ...}`` line with a random id, so a reader notices a replaced file
+    even when the new one reuses the old inode and is already larger.
+    """
+    
+    def __init__(self, storage_path: str = "data/sessions.jsonl", durable: bool = True):
+        """Initialize JSONL storage.
+        
+        Args:
+            storage_path: Path to the JSON Lines log file
+            durable: fsync every append so that it survives a crash
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.durable = durable
+        
+        # Serializes appends and compaction across processes
+        self.lock = FileLock(self.storage_path.with_name(self.storage_path.name + '.lock'))
+        
+        # filename -> (offset, length) of the body of its latest record
+        self._entries: Dict[str, Tuple[int, int]] = {}
+        self._digests: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._inode: Optional[int] = None
+        self._generation: Optional[str] = None
+        self._end = 0
+        self._records = 0
+        self._index_lock = threading.RLock()
+        
+        if not self.storage_path.exists():
+            with self.lock:
+                if not self.storage_path.exists():
+                    atomic_write(self.storage_path, self._generation_header(), durable=self.durable)
+        
+        self._load_index()
+    
+    def save_session(self, session: ChatSession) -> bool:
+        """Save a single chat session."""
+        try:
+            self._append(self._put_record(session))
+            return True
+        except Exception as e:
+            print(f"Error saving session {session.meta.filename}: {e}")
+            return False
+    
+    def save_sessions(self, sessions: List[ChatSession]) -> bool:
+        """Save multiple chat sessions."""
+        return self.update_sessions(sessions)
+    
+    def update_sessions(self, sessions: List[ChatSession], deleted: Iterable[str] = ()) -> bool:
+        """Save and delete sessions with a single append to the log."""
+        try:
+            deleted = list(deleted)
+            records = [self._put_record(session) for session in sessions]
+            self._append(b''.join(records), deleted)
+            return True
+        except Exception as e:
+            print(f"Error saving sessions: {e}")
+            return False
+    
+    def load_session(self, filename: str) -> Optional[ChatSession]:
+        """Load a single chat session by filename."""
+        try:
+            with open(self.storage_path, 'rb') as f:
+                entries = self._sync_index(f)
+                if filename not in entries:
+                    return None
+                offset, length = entries[filename]
+                f.seek(offset)
+                record = f.read(length)
+            return ChatSession.from_dict(json.loads(record))
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error loading session {filename}: {e}")
+            return None
+    
+    def load_all_sessions(self) -> List[ChatSession]:
+        """Load all stored chat sessions.
+        
+        Sessions whose header carries a digest are returned as
+        ``LazyChatSession`` objects holding the bytes of their record,
+        so QA pairs are only decoded when they are first accessed.
+        """
+        try:
+            sessions = []
+            with open(self.storage_path, 'rb') as f:
+                with self._index_lock:
+                    entries = dict(self._sync_index(f))
+                    digests = dict(self._digests)
+                # Read in file order so the log is scanned front to back
+                for filename, (offset, length) in sorted(entries.items(), key=lambda item: item[1]):
+                    f.seek(offset)
+                    record = f.read(length)
+                    digest = digests.get(filename)
+                    if digest is None:
+                        sessions.append(ChatSession.from_dict(json.loads(record)))
+                    else:
+                        sessions.append(LazyChatSession(SessionMeta.from_dict(digest['meta']), record))
+            
+            # Sort by creation time
+            sessions.sort(key=lambda s: s.meta.ctime)
+            return sessions
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Error loading sessions: {e}")
+            return []
+    
+    def load_all_metas(self) -> List[SessionDigest]:
+        """Load the digests of all stored sessions from the record headers."""
+        try:
+            with open(self.storage_path, 'rb') as f:
+                with self._index_lock:
+                    entries = self._sync_index(f)
+                    digests = []
+                    for filename, (offset, length) in entries.items():
+                        digest = self._digests.get(filename)
+                        if digest is None:
+                            # Written without a digest in its header
+                            f.seek(offset)
+                            digest = SessionDigest.from_session_dict(json.loads(f.read(length))).to_dict()
+                            self._digests[filename] = digest
+                        digests.append(digest)
+            metas = [SessionDigest.from_dict(digest) for digest in digests]
+            metas.sort(key=lambda d: d.meta.ctime)
+            return metas
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Error loading session metadata: {e}")
+            return []
+    
+    def session_exists(self, filename: str) -> bool:
+        """Check if a session exists in storage."""
+        try:
+            return filename in self._load_index()
+        except Exception:
+            return False
+    
+    def delete_session(self, filename: str) -> bool:
+        """Delete a session from storage."""
+        try:
+            return self._append(b'', [filename]) > 0
+        except Exception as e:
+            print(f"Error deleting session {filename}: {e}")
+            return False
+    
+    def get_session_count(self) -> int:
+        """Get total number of stored sessions."""
+        try:
+            return len(self._load_index())
+        except Exception:
+            return 0
+    
+    def get_log_stats(self) -> Dict[str, Any]:
+        """Get the number of live and dead records in the log.
+        
+        Returns:
+            Dict[str, Any]: ``records``, ``live`` and ``dead`` record counts
+                and ``dead_ratio``, the share of records compaction would drop
+        """
+        with self._index_lock:
+            live = len(self._load_index())
+            records = self._records
+        dead = records - live
+        return {
+            'records': records,
+            'live': live,
+            'dead': dead,
+            'dead_ratio': dead / records if records else 0.0
+        }
+    
+    def get_storage_info(self) -> Dict[str, Any]:
+        """Get information about the storage backend."""
+        stats = self.get_log_stats()
+        info = {
+            'storage_type': 'JSONL',
+            'storage_path': str(self.storage_path),
+            'file_exists': self.storage_path.exists(),
+            'session_count': stats['live'],
+            'record_count': stats['records'],
+            'dead_records': stats['dead']
+        }
+        
+        if self.storage_path.exists():
+            stat = self.storage_path.stat()
+            info.update({
+                'file_size_bytes': stat.st_size,
+                'last_modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
+        
+        return info
+    
+    def get_data_version(self) -> Any:
+        """Get the (mtime_ns, size, inode) signature of the log file.
+        
+        Appends change the size and compaction replaces the file, so the
+        signature changes with every write.
+        """
+        try:
+            stat = self.storage_path.stat()
+            return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+        except FileNotFoundError:
+            return None
+    
+    def compact(self, threshold: float = 0.0) -> bool:
+        """Rewrite the log with only the latest record of every live session.
+        
+        The new log is written next to the old one and renamed over it,
+        so readers see either file in full. Appends wait for the lock.
+        
+        Args:
+            threshold: Only compact when the share of dead records exceeds this
+        
+        Returns:
+            bool: True if the log was rewritten
+        """
+        try:
+            with self.lock:
+                with open(self.storage_path, 'rb') as src:
+                    with self._index_lock:
+                        entries = self._sync_index(src)
+                        dead = self._records - len(entries)
+                        if dead <= 0 or dead / self._records <= threshold:
+                            return False
+                        
+                        with atomic_writer(self.storage_path, durable=self.durable) as dst:
+                            dst.write(self._generation_header())
+                            by_offset = sorted(entries.items(), key=lambda item: item[1])
+                            for filename, (offset, length) in by_offset:
+                                src.seek(offset)
+                                body = src.read(length)
+                                digest = self._digests.get(filename)
+                                if digest is None:
+                                    digest = SessionDigest.from_session_dict(json.loads(body)).to_dict()
+                                dst.write(self._header(filename, length, digest))
+                                dst.write(body)
+                        self._reset_index()
+            return True
+        except Exception as e:
+            print(f"Error compacting {self.storage_path}: {e}")
+            return False
+    
+    def backup_storage(self, backup_path: Optional[str] = None) -> bool:
+        """Create a backup of the log file."""
+        if not self.storage_path.exists():
+            return False
+        
+        if backup_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path = f"{self.storage_path}.backup_{timestamp}"
+        
+        try:
+            import shutil
+            shutil.copy2(self.storage_path, backup_path)
+            return True
+        except Exception as e:
+            print(f"Error creating backup: {e}")
+            return False
+    
+    def clear_all(self) -> bool:
+        """Clear all stored sessions."""
+        try:
+            with self.lock:
+                atomic_write(self.storage_path, self._generation_header(), durable=self.durable)
+                with self._index_lock:
+                    self._reset_index()
+            return True
+        except Exception as e:
+            print(f"Error clearing storage: {e}")
+            return False
+    
+    @staticmethod
+    def _generation_header() -> bytes:
+        """First line of a new log file, identifying this version of the file."""
+        return json.dumps({"op": "log", "generation": uuid.uuid4().hex}).encode('utf-8') + b'\n'
+    
+    @staticmethod
+    def _read_generation(f: BinaryIO) -> Optional[str]:
+        """Get the generation id of an opened log file; None for logs written without one."""
+        f.seek(0)
+        line = f.readline(_GENERATION_LINE_MAX)
+        if not (line.startswith(b'{"op": "log"') and line.endswith(b'\n')):
+            return None
+        try:
+            return json.loads(line).get("generation")
+        except ValueError:
+            return None
+    
+    @staticmethod
+    def _header(filename: str, size: int, digest: Dict[str, Any]) -> bytes:
+        header = {"op": "put", "filename": filename, "size": size, "digest": digest}
+        return json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n'
+    
+    def _put_record(self, session: ChatSession) -> bytes:
+        """Encode an upsert record: header line, then the session on one line."""
+        body = json.dumps(session.to_dict(), ensure_ascii=False).encode('utf-8') + b'\n'
+        digest = SessionDigest.from_session(session).to_dict()
+        return self._header(session.meta.filename, len(body), digest) + body
+    
+    def _append(self, data: bytes, deleted: Iterable[str] = ()) -> int:
+        """Append records to the log under the lock.
+        
+        Delete records are only written for sessions that exist. A torn
+        record left at the end of the log by a crashed writer is cut off
+        before appending.
+        
+        Args:
+            data: Encoded upsert records
+            deleted: Filenames of sessions to delete
+        
+        Returns:
+            int: Number of delete records written
+        """
+        with self.lock, self._index_lock:
+            with open(self.storage_path, 'a+b') as f:
+                entries = self._sync_index(f)
+                
+                removed = [filename for filename in dict.fromkeys(deleted) if filename in entries]
+                for filename in removed:
+                    record = {"op": "del", "filename": filename}
+                    data += json.dumps(record, ensure_ascii=False).encode('utf-8') + b'\n'
+                if not data:
+                    return 0
+                
+                size = os.fstat(f.fileno()).st_size
+                if size > self._end:
+                    f.truncate(self._end)
+                    size = self._end
+                if size == 0:
+                    data = self._generation_header() + data
+                f.write(data)
+                f.flush()
+                if self.durable:
+                    os.fsync(f.fileno())
+                self._sync_index(f)
+            return len(removed)
+    
+    def _load_index(self) -> Dict[str, Tuple[int, int]]:
+        """Get the record table for the current log file."""
+        try:
+            with open(self.storage_path, 'rb') as f:
+                return self._sync_index(f)
+        except FileNotFoundError:
+            with self._index_lock:
+                self._reset_index()
+                return self._entries
+    
+    def _reset_index(self) -> None:
+        self._entries = {}
+        self._digests = {}
+        self._inode = None
+        self._generation = None
+        self._end = 0
+        self._records = 0
+    
+    def _sync_index(self, f: BinaryIO) -> Dict[str, Tuple[int, int]]:
+        """Bring the record table up to date with the already opened log file.
+        
+        Records appended since the last call are read incrementally; a
+        replaced or truncated file is indexed from the start. The inode
+        alone does not identify a replaced file, since it can be reused
+        after compaction's rename, so the generation id is compared too.
+        """
+        stat = os.fstat(f.fileno())
+        generation = self._read_generation(f)
+        with self._index_lock:
+            if stat.st_ino != self._inode or stat.st_size < self._end or generation != self._generation:
+                self._reset_index()
+                self._inode = stat.st_ino
+                self._generation = generation
+            if stat.st_size > self._end:
+                self._scan_records(f, stat.st_size)
+            return self._entries
+    
+    def _scan_records(self, f: BinaryIO, size: int) -> None:
+        """Index the records between the indexed end and ``size``.
+        
+        Only header lines are parsed; session bodies are skipped by their
+        recorded size. Scanning stops at an incomplete record at the end,
+        which is a write still in progress or torn by a crash.
+        """
+        position = self._end
+        f.seek(position)
+        while position < size:
+            line = f.readline()
+            if not line.endswith(b'\n'):
+                break
+            
+            try:
+                record = json.loads(line)
+                op = record["op"]
+                if op == "log":
+                    position += len(line)
+                    self._end = position
+                    continue
+                filename = record["filename"]
+                if op == "put":
+                    body_size = int(record["size"])
+                elif op != "del":
+                    raise ValueError(f"unknown op {op!r}")
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"Storage log {self.storage_path} is corrupted at byte {position}: {e}") from e
+            
+            if op == "put":
+                body = position + len(line)
+                if body + body_size > size:
+                    break
+                self._entries[filename] = (body, body_size)
+                self._digests[filename] = record.get("digest")
+                position = body + body_size
+                f.seek(position)
+            else:
+                self._entries.pop(filename, None)
+                self._digests.pop(filename, None)
+                position += len(line)
+            
+            self._records += 1
+            self._end = position
@@ -0,0 +1,161 @@
+"""File locking and atomic file replacement."""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """Advisory inter-process lock backed by a lock file.
+    
+    Uses ``flock`` on POSIX and ``msvcrt.locking`` on Windows. The lock
+    is re-entrant within a process: nested acquisitions by the owning
+    thread only increase a counter, while other threads of the same
+    process wait as other processes do.
+    """
+    
+    def __init__(self, lock_path: Union[str, Path], timeout: Optional[float] = 60.0):
+        """Initialize the lock.
+        
+        Args:
+            lock_path: Path of the lock file, created on first use
+            timeout: Seconds to wait for the lock, or None to wait forever
+        """
+        self.lock_path = Path(lock_path)
+        self.timeout = timeout
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd: Optional[int] = None
+    
+    def acquire(self) -> None:
+        """Acquire the lock, raising TimeoutError if it stays busy."""
+        if not self._thread_lock.acquire(timeout=-1 if self.timeout is None else self.timeout):
+            raise TimeoutError(f"Timed out waiting for lock {self.lock_path}")
+        
+        if self._depth == 0:
+            try:
+                self._fd = self._lock_file()
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+    
+    def release(self) -> None:
+        """Release one level of the lock."""
+        self._depth -= 1
+        if self._depth == 0:
+            fd, self._fd = self._fd, None
+            try:
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                else:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+            finally:
+                os.close(fd)
+        self._thread_lock.release()
+    
+    def _lock_file(self) -> int:
+        """Open the lock file and lock it for this process."""
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(self.lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        try:
+            while True:
+                try:
+                    if fcntl:
+                        fcntl.flock(fd, fcntl.LOCK_EX | (fcntl.LOCK_NB if deadline else 0))
+                    else:
+                        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+                    return fd
+                except OSError:
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise TimeoutError(f"Timed out waiting for lock {self.lock_path}")
+                    time.sleep(0.05)
+        except BaseException:
+            os.close(fd)
+            raise
+    
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+
+def atomic_write(path: Union[str, Path], data: bytes, durable: bool = True) -> None:
+    """Replace a file with new content so readers see the old or the new file, never a mix.
+    
+    Args:
+        path: File to replace
+        data: Complete new content
+        durable: fsync the file and directory so the write survives a crash
+    """
+    with atomic_writer(path, durable=durable) as f:
+        f.write(data)
+
+
+@contextmanager
+def atomic_writer(path: Union[str, Path], durable: bool = True) -> Iterator[BinaryIO]:
+    """Open a temporary file that replaces ``path`` when the block exits cleanly.
+    
+    The content is written to a temporary file in the same directory,
+    flushed to disk and renamed over the target. If the block raises,
+    the temporary file is removed and the target is left untouched.
+    
+    Args:
+        path: File to replace
+        durable: fsync the file and directory so the write survives a crash
+    
+    Returns:
+        Iterator[BinaryIO]: Binary file handle to write the new content to
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+        try:
+            os.chmod(temp_path, path.stat().st_mode & 0o777)
+        except FileNotFoundError:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    
+    if durable:
+        _fsync_directory(path.parent)
+
+
+def _fsync_directory(directory: Path) -> None:
+    """Persist a rename by syncing its directory, where the platform allows it."""
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(str(directory), os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,132 @@
+"""Process-wide in-memory session repository."""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from ..models.chat import ChatSession, SessionDigest
+from ..models.storage import StorageInterface
+from ..search.index import SearchIndex
+from ..analytics.qa_table import QATable
+from ..analytics.insights import DailyInsights
+
+
+class SessionRepository:
+    """In-memory view of a storage backend, indexed by filename.
+    
+    Sessions are loaded once and served from memory. The backend's data
+    version is checked on every access and the cache is rebuilt only when
+    the stored data has actually changed.
+    """
+    
+    def __init__(self, storage: StorageInterface):
+        """Initialize the repository.
+        
+        Args:
+            storage: Storage backend to read sessions from
+        """
+        self.storage = storage
+        self._lock = threading.RLock()
+        self._version: Any = None
+        self._loaded = False
+        self._sessions: List[ChatSession] = []
+        self._by_filename: Dict[str, ChatSession] = {}
+        self._search_index: Optional[SearchIndex] = None
+        self._qa_table: Optional[QATable] = None
+        self._daily_insights: Optional[DailyInsights] = None
+        self._metas: Optional[List[SessionDigest]] = None
+        self._metas_version: Any = None
+    
+    @property
+    def version(self) -> Any:
+        """Data version of the currently cached sessions."""
+        self._refresh_if_stale()
+        return self._version
+    
+    def get_all_sessions(self) -> List[ChatSession]:
+        """Get all sessions sorted by creation time."""
+        self._refresh_if_stale()
+        return self._sessions
+    
+    def get_all_metas(self) -> List[SessionDigest]:
+        """Get the digests of all sessions sorted by creation time.
+        
+        Digests come from the backend's projection, so listings do not
+        load the full sessions when nothing else needs them.
+        """
+        version = self.storage.get_data_version()
+        metas = self._metas
+        if metas is not None and version == self._metas_version:
+            return metas
+        
+        with self._lock:
+            version = self.storage.get_data_version()
+            if self._metas is None or version != self._metas_version:
+                self._metas = self.storage.load_all_metas()
+                self._metas_version = version
+            return self._metas
+    
+    def get_session(self, filename: str) -> Optional[ChatSession]:
+        """Get a single session by filename.
+        
+        Served from the in-memory index when it is current; otherwise the
+        backend loads just this one session instead of the whole archive.
+        """
+        if self._loaded and self.storage.get_data_version() == self._version:
+            return self._by_filename.get(filename)
+        return self.storage.load_session(filename)
+    
+    def get_session_count(self) -> int:
+        """Get the number of cached sessions."""
+        self._refresh_if_stale()
+        return len(self._sessions)
+    
+    def get_search_index(self) -> SearchIndex:
+        """Get the full-text index for the current data, building it on first use."""
+        self._refresh_if_stale()
+        with self._lock:
+            if self._search_index is None:
+                self._search_index = SearchIndex.from_sessions(self._sessions)
+            return self._search_index
+    
+    def get_qa_table(self) -> QATable:
+        """Get the columnar QA table for the current data, building it on first use."""
+        self._refresh_if_stale()
+        with self._lock:
+            if self._qa_table is None:
+                self._qa_table = QATable.from_sessions(self._sessions)
+            return self._qa_table
+    
+    def get_daily_insights(self) -> DailyInsights:
+        """Get the questions grouped by day for the current data, building them on first use."""
+        self._refresh_if_stale()
+        with self._lock:
+            if self._daily_insights is None:
+                self._daily_insights = DailyInsights.from_table(self.get_qa_table())
+            return self._daily_insights
+    
+    def invalidate(self) -> None:
+        """Drop the cached data so the next access reloads it."""
+        with self._lock:
+            self._loaded = False
+            self._metas = None
+    
+    def _refresh_if_stale(self) -> None:
+        """Reload sessions if the backing storage has changed."""
+        version = self.storage.get_data_version()
+        if self._loaded and version == self._version:
+            return
+        
+        with self._lock:
+            # Another thread may have reloaded while we waited for the lock
+            version = self.storage.get_data_version()
+            if self._loaded and version == self._version:
+                return
+            
+            sessions = self.storage.load_all_sessions()
+            self._sessions = sessions
+            self._by_filename = {s.meta.filename: s for s in sessions}
+            self._search_index = None
+            self._qa_table = None
+            self._daily_insights = None
+            self._version = version
+            self._loaded = True
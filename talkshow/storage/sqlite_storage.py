@@ -0,0 +1,464 @@
+"""SQLite-based storage implementation."""
+
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+
+from ..models.chat import ChatSession, QAPair, SessionDigest, SessionMeta
+from ..models.storage import StorageInterface
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    filename TEXT NOT NULL UNIQUE,
+    theme TEXT NOT NULL,
+    ctime TEXT NOT NULL,
+    ctime_ts REAL NOT NULL,
+    file_size INTEGER NOT NULL,
+    qa_count INTEGER NOT NULL,
+    question_summaries INTEGER NOT NULL DEFAULT 0,
+    answer_summaries INTEGER NOT NULL DEFAULT 0,
+    first_question TEXT,
+    first_timestamp TEXT,
+    min_timestamp TEXT,
+    max_timestamp TEXT
+);
+
+CREATE TABLE IF NOT EXISTS qa_pairs (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    timestamp TEXT,
+    timestamp_ts REAL,
+    question_summary TEXT,
+    answer_summary TEXT
+);
+
+CREATE TABLE IF NOT EXISTS storage_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+-- sessions.filename is indexed through its UNIQUE constraint
+CREATE INDEX IF NOT EXISTS idx_sessions_ctime ON sessions(ctime_ts);
+CREATE INDEX IF NOT EXISTS idx_qa_pairs_session ON qa_pairs(session_id, position);
+CREATE INDEX IF NOT EXISTS idx_qa_pairs_timestamp ON qa_pairs(timestamp_ts);
+
+INSERT OR IGNORE INTO storage_meta (key, value) VALUES ('generation', 0);
+"""
+
+SESSION_COLUMNS = "id, filename, theme, ctime, file_size, qa_count"
+QA_COLUMNS = "session_id, question, answer, timestamp, question_summary, answer_summary"
+
+# Per-session aggregates served by load_all_metas, added to older databases on open
+DIGEST_COLUMNS = {
+    "question_summaries": "INTEGER NOT NULL DEFAULT 0",
+    "answer_summaries": "INTEGER NOT NULL DEFAULT 0",
+    "first_question": "TEXT",
+    "first_timestamp": "TEXT",
+    "min_timestamp": "TEXT",
+    "max_timestamp": "TEXT",
+}
+
+
+def _to_epoch(dt: datetime) -> float:
+    """Convert a datetime to a POSIX timestamp, treating naive values as UTC."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _from_iso(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO datetime string, treating naive values as UTC."""
+    if not value:
+        return None
+    dt = datetime.fromisoformat(value)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+class SQLiteStorage(StorageInterface):
+    """SQLite database storage for chat sessions.
+    
+    Sessions and QA pairs live in separate tables, indexed by filename,
+    session creation time and QA timestamp, so single-session loads,
+    counts and date-range queries do not touch the rest of the archive.
+    """
+    
+    def __init__(self, storage_path: str = "data/sessions.db"):
+        """Initialize SQLite storage.
+        
+        Args:
+            storage_path: Path to the SQLite database file
+        """
+        self.storage_path = Path(storage_path)
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        conn.commit()
+        self._add_digest_columns(conn)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get the connection for the current thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.storage_path), timeout=30)
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def close(self) -> None:
+        """Close the connection of the current thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    def _add_digest_columns(self, conn: sqlite3.Connection) -> None:
+        """Add and fill the digest columns of a database created before they existed."""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+        missing = [name for name in DIGEST_COLUMNS if name not in existing]
+        if not missing:
+            return
+        
+        with conn:
+            for name in missing:
+                conn.execute(f"ALTER TABLE sessions ADD COLUMN {name} {DIGEST_COLUMNS[name]}")
+            for session in self._load_sessions("", ()):
+                self._write_digest(conn, session)
+    
+    def save_session(self, session: ChatSession) -> bool:
+        """Save a single chat session."""
+        return self.save_sessions([session])
+    
+    def save_sessions(self, sessions: List[ChatSession]) -> bool:
+        """Save multiple chat sessions in one transaction."""
+        conn = self._connect()
+        try:
+            with conn:
+                for session in sessions:
+                    self._write_session(conn, session)
+                self._bump_generation(conn)
+            return True
+        except Exception as e:
+            print(f"Error saving sessions: {e}")
+            return False
+    
+    def update_sessions(self, sessions: List[ChatSession], deleted: Iterable[str] = ()) -> bool:
+        """Save and delete sessions in one transaction."""
+        conn = self._connect()
+        try:
+            with conn:
+                for session in sessions:
+                    self._write_session(conn, session)
+                conn.executemany("DELETE FROM sessions WHERE filename = ?",
+                                 [(filename,) for filename in deleted])
+                self._bump_generation(conn)
+            return True
+        except Exception as e:
+            print(f"Error updating sessions: {e}")
+            return False
+    
+    def load_session(self, filename: str) -> Optional[ChatSession]:
+        """Load a single chat session by filename."""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                f"SELECT {SESSION_COLUMNS} FROM sessions WHERE filename = ?", (filename,)
+            ).fetchone()
+            if row is None:
+                return None
+            qa_rows = conn.execute(
+                f"SELECT {QA_COLUMNS} FROM qa_pairs WHERE session_id = ? ORDER BY position",
+                (row[0],)
+            ).fetchall()
+            return self._build_session(row, qa_rows)
+        except Exception as e:
+            print(f"Error loading session {filename}: {e}")
+            return None
+    
+    def load_all_sessions(self) -> List[ChatSession]:
+        """Load all stored chat sessions sorted by creation time."""
+        try:
+            return self._load_sessions("", ())
+        except Exception as e:
+            print(f"Error loading sessions: {e}")
+            return []
+    
+    def load_all_metas(self) -> List[SessionDigest]:
+        """Load the digests of all sessions from the sessions table alone."""
+        try:
+            rows = self._connect().execute(
+                "SELECT filename, theme, ctime, file_size, qa_count, question_summaries, "
+                "answer_summaries, first_question, first_timestamp, min_timestamp, max_timestamp "
+                "FROM sessions ORDER BY ctime_ts, id"
+            ).fetchall()
+        except Exception as e:
+            print(f"Error loading session metadata: {e}")
+            return []
+        
+        return [
+            SessionDigest(
+                meta=SessionMeta(filename=filename, theme=theme, ctime=_from_iso(ctime),
+                                 file_size=file_size, qa_count=qa_count),
+                question_summaries=question_summaries,
+                answer_summaries=answer_summaries,
+                first_question=first_question,
+                first_timestamp=_from_iso(first_timestamp),
+                min_timestamp=_from_iso(min_timestamp),
+                max_timestamp=_from_iso(max_timestamp)
+            )
+            for (filename, theme, ctime, file_size, qa_count, question_summaries, answer_summaries,
+                 first_question, first_timestamp, min_timestamp, max_timestamp) in rows
+        ]
+    
+    def load_sessions_between(self, start: Optional[datetime] = None,
+                              end: Optional[datetime] = None) -> List[ChatSession]:
+        """Load sessions whose creation time falls in [start, end)."""
+        clauses = []
+        params: List[float] = []
+        if start is not None:
+            clauses.append("ctime_ts >= ?")
+            params.append(_to_epoch(start))
+        if end is not None:
+            clauses.append("ctime_ts < ?")
+            params.append(_to_epoch(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        try:
+            return self._load_sessions(where, tuple(params))
+        except Exception as e:
+            print(f"Error loading sessions: {e}")
+            return []
+    
+    def count_qa_pairs_between(self, start: Optional[datetime] = None,
+                               end: Optional[datetime] = None) -> int:
+        """Count QA pairs whose timestamp falls in [start, end)."""
+        clauses = []
+        params: List[float] = []
+        if start is not None:
+            clauses.append("timestamp_ts >= ?")
+            params.append(_to_epoch(start))
+        if end is not None:
+            clauses.append("timestamp_ts < ?")
+            params.append(_to_epoch(end))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        
+        row = self._connect().execute(f"SELECT COUNT(*) FROM qa_pairs {where}", params).fetchone()
+        return row[0]
+    
+    def session_exists(self, filename: str) -> bool:
+        """Check if a session exists in storage."""
+        try:
+            row = self._connect().execute(
+                "SELECT 1 FROM sessions WHERE filename = ?", (filename,)
+            ).fetchone()
+            return row is not None
+        except Exception:
+            return False
+    
+    def delete_session(self, filename: str) -> bool:
+        """Delete a session from storage."""
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.execute("DELETE FROM sessions WHERE filename = ?", (filename,))
+                if cursor.rowcount == 0:
+                    return False
+                self._bump_generation(conn)
+            return True
+        except Exception as e:
+            print(f"Error deleting session {filename}: {e}")
+            return False
+    
+    def get_session_count(self) -> int:
+        """Get total number of stored sessions."""
+        try:
+            return self._connect().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        except Exception:
+            return 0
+    
+    def get_storage_info(self) -> Dict[str, Any]:
+        """Get information about the storage backend."""
+        info = {
+            'storage_type': 'SQLite',
+            'storage_path': str(self.storage_path),
+            'file_exists': self.storage_path.exists(),
+            'session_count': self.get_session_count()
+        }
+        
+        if self.storage_path.exists():
+            stat = self.storage_path.stat()
+            info.update({
+                'file_size_bytes': stat.st_size,
+                'last_modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
+            })
+        
+        return info
+    
+    def get_data_version(self) -> Any:
+        """Get the write generation counter of the database."""
+        try:
+            row = self._connect().execute(
+                "SELECT value FROM storage_meta WHERE key = 'generation'"
+            ).fetchone()
+            return row[0] if row else None
+        except Exception:
+            return None
+    
+    def backup_storage(self, backup_path: Optional[str] = None) -> bool:
+        """Create a consistent backup of the database."""
+        if backup_path is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path = f"{self.storage_path}.backup_{timestamp}"
+        
+        try:
+            target = sqlite3.connect(backup_path)
+            try:
+                self._connect().backup(target)
+            finally:
+                target.close()
+            return True
+        except Exception as e:
+            print(f"Error creating backup: {e}")
+            return False
+    
+    def clear_all(self) -> bool:
+        """Clear all stored sessions."""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM sessions")
+                self._bump_generation(conn)
+            return True
+        except Exception as e:
+            print(f"Error clearing storage: {e}")
+            return False
+    
+    def _write_session(self, conn: sqlite3.Connection, session: ChatSession) -> None:
+        """Insert or replace one session and its QA pairs."""
+        meta = session.meta
+        conn.execute(
+            """
+            INSERT INTO sessions (filename, theme, ctime, ctime_ts, file_size, qa_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(filename) DO UPDATE SET
+                theme = excluded.theme,
+                ctime = excluded.ctime,
+                ctime_ts = excluded.ctime_ts,
+                file_size = excluded.file_size,
+                qa_count = excluded.qa_count
+            """,
+            (meta.filename, meta.theme, meta.ctime.isoformat(), _to_epoch(meta.ctime),
+             meta.file_size, meta.qa_count)
+        )
+        session_id = conn.execute(
+            "SELECT id FROM sessions WHERE filename = ?", (meta.filename,)
+        ).fetchone()[0]
+        
+        conn.execute("DELETE FROM qa_pairs WHERE session_id = ?", (session_id,))
+        conn.executemany(
+            """
+            INSERT INTO qa_pairs (session_id, position, question, answer, timestamp,
+                                  timestamp_ts, question_summary, answer_summary)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (session_id, position, qa.question, qa.answer,
+                 qa.timestamp.isoformat() if qa.timestamp else None,
+                 _to_epoch(qa.timestamp) if qa.timestamp else None,
+                 qa.question_summary, qa.answer_summary)
+                for position, qa in enumerate(session.qa_pairs)
+            ]
+        )
+        self._write_digest(conn, session)
+    
+    @staticmethod
+    def _write_digest(conn: sqlite3.Connection, session: ChatSession) -> None:
+        """Store the digest columns of one session."""
+        digest = SessionDigest.from_session(session)
+        conn.execute(
+            """
+            UPDATE sessions SET question_summaries = ?, answer_summaries = ?, first_question = ?,
+                                first_timestamp = ?, min_timestamp = ?, max_timestamp = ?
+            WHERE filename = ?
+            """,
+            (digest.question_summaries, digest.answer_summaries, digest.first_question,
+             digest.first_timestamp.isoformat() if digest.first_timestamp else None,
+             digest.min_timestamp.isoformat() if digest.min_timestamp else None,
+             digest.max_timestamp.isoformat() if digest.max_timestamp else None,
+             session.meta.filename)
+        )
+    
+    @staticmethod
+    def _bump_generation(conn: sqlite3.Connection) -> None:
+        """Advance the data version inside the current transaction."""
+        conn.execute("UPDATE storage_meta SET value = value + 1 WHERE key = 'generation'")
+    
+    def _load_sessions(self, where: str, params: Tuple) -> List[ChatSession]:
+        """Load sessions matching a WHERE clause, ordered by creation time.
+        
+        Both queries run in one read transaction, so a concurrent writer
+        cannot add or remove sessions between them; under WAL the reader
+        sees a consistent snapshot without blocking the writer.
+        """
+        conn = self._connect()
+        # Inside a caller's transaction the snapshot is already fixed
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            conn.execute("BEGIN")
+        try:
+            session_rows = conn.execute(
+                f"SELECT {SESSION_COLUMNS} FROM sessions {where} ORDER BY ctime_ts, id", params
+            ).fetchall()
+            if not session_rows:
+                return []
+            
+            qa_by_session: Dict[int, List[Tuple]] = {row[0]: [] for row in session_rows}
+            qa_rows = conn.execute(
+                f"SELECT {QA_COLUMNS} FROM qa_pairs "
+                f"WHERE session_id IN (SELECT id FROM sessions {where}) "
+                f"ORDER BY session_id, position",
+                params
+            ).fetchall()
+        finally:
+            if own_transaction:
+                conn.commit()
+        
+        for qa_row in qa_rows:
+            qa_by_session[qa_row[0]].append(qa_row)
+        
+        return [self._build_session(row, qa_by_session[row[0]]) for row in session_rows]
+    
+    @staticmethod
+    def _build_session(row: Tuple, qa_rows: Iterable[Tuple]) -> ChatSession:
+        """Build a ChatSession from a session row and its QA rows."""
+        _, filename, theme, ctime, file_size, qa_count = row
+        meta = SessionMeta(
+            filename=filename,
+            theme=theme,
+            ctime=_from_iso(ctime),
+            file_size=file_size,
+            qa_count=qa_count
+        )
+        qa_pairs = [
+            QAPair(
+                question=question,
+                answer=answer,
+                timestamp=_from_iso(timestamp),
+                question_summary=question_summary,
+                answer_summary=answer_summary
+            )
+            for _, question, answer, timestamp, question_summary, answer_summary in qa_rows
+        ]
+        return ChatSession(meta=meta, qa_pairs=qa_pairs)
@@ -2,8 +2,12 @@
 
 from .rule_summarizer import RuleSummarizer
 from .llm_summarizer import LLMSummarizer
+from .async_summarizer import AsyncLLMSummarizer
+from .cache import SummaryCache
 
 __all__ = [
     "RuleSummarizer",
     "LLMSummarizer",
+    "AsyncLLMSummarizer",
+    "SummaryCache",
 ]
\ No newline at end of file
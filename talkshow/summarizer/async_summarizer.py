@@ -0,0 +1,351 @@
+"""
+Concurrent LLM summarizer for TalkShow.
+
+Summarizes many Q&A pairs at once with ``litellm.acompletion``, bounded
+by a concurrency limit and request/token rate limits.
+"""
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import litellm
+from litellm import acompletion
+
+from ..config.manager import ConfigManager
+from ..models.chat import QAPair
+from .cache import SummaryCache
+from .llm_summarizer import LLMSummarizer
+
+
+# Instructions for batched requests; the items follow as a JSON array
+BATCH_PROMPT = (
+    "请分别总结下面 JSON 数组中每一项的 text，每个摘要不超过该项 max_length 个字符。"
+    "只返回一个 JSON 数组，每个元素形如 {\"id\": 编号, \"summary\": \"摘要\"}，不要输出其他内容。"
+)
+
+# Errors worth retrying: throttling, timeouts and server-side failures
+RETRYABLE_ERRORS = (
+    litellm.RateLimitError,
+    litellm.APIConnectionError,
+    litellm.Timeout,
+    litellm.InternalServerError,
+    litellm.ServiceUnavailableError,
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimate the token count of a text.
+    
+    One token per three UTF-8 bytes: about one per CJK character and
+    slightly more than real tokenizers for Latin text.
+    """
+    return max(1, len(text.encode('utf-8')) // 3)
+
+
+class BatchItem(NamedTuple):
+    """A text waiting for a summary in a batched request."""
+    
+    qa: QAPair
+    field: str
+    text: str
+    max_length: int
+
+
+class TokenBucket:
+    """Asynchronous token bucket refilled at a fixed rate per minute."""
+    
+    def __init__(self, per_minute: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the bucket.
+        
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Maximum burst size, defaults to one minute's worth
+            clock: Monotonic time source in seconds
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until ``amount`` tokens are available and take them."""
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+
+class AsyncLLMSummarizer(LLMSummarizer):
+    """LLM summarizer that processes many Q&A pairs concurrently.
+    
+    Configured through ``summarizer.llm``:
+    
+    - ``concurrency``: maximum number of requests in flight (default 8)
+    - ``requests_per_minute`` / ``tokens_per_minute``: rate limits, unset for none
+    - ``max_retries``: retries of throttled or failed requests (default 5)
+    - ``retry_base_delay`` / ``retry_max_delay``: exponential backoff bounds in seconds
+    - ``batch_size``: texts per request; above 1, texts are packed into one
+      JSON prompt up to ``batch_token_budget`` prompt tokens (default 3000)
+    """
+    
+    def __init__(self, config_manager: Optional[ConfigManager] = None,
+                 cache: Optional[SummaryCache] = None):
+        """Initialize async LLM summarizer.
+        
+        Args:
+            config_manager: Configuration manager instance
+            cache: Summary cache to consult before calling the LLM
+        """
+        super().__init__(config_manager, cache)
+        self.concurrency = max(1, int(self.llm_config.get("concurrency", 8)))
+        self.requests_per_minute = self.llm_config.get("requests_per_minute")
+        self.tokens_per_minute = self.llm_config.get("tokens_per_minute")
+        self.max_retries = int(self.llm_config.get("max_retries", 5))
+        self.retry_base_delay = float(self.llm_config.get("retry_base_delay", 1.0))
+        self.retry_max_delay = float(self.llm_config.get("retry_max_delay", 30.0))
+        self.batch_size = max(1, int(self.llm_config.get("batch_size", 1)))
+        self.batch_token_budget = int(self.llm_config.get("batch_token_budget", 3000))
+        
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._request_bucket: Optional[TokenBucket] = None
+        self._token_bucket: Optional[TokenBucket] = None
+    
+    def summarize_all(self, qa_pairs: List[QAPair]) -> int:
+        """Summarize Q&A pairs concurrently, blocking until all are done.
+        
+        Args:
+            qa_pairs: Q&A pairs to summarize; existing summaries are kept
+        
+        Returns:
+            int: Number of Q&A pairs summarized successfully
+        """
+        if not qa_pairs:
+            return 0
+        return asyncio.run(self.summarize_many(qa_pairs))
+    
+    async def summarize_many(self, qa_pairs: List[QAPair]) -> int:
+        """Summarize Q&A pairs concurrently.
+        
+        Args:
+            qa_pairs: Q&A pairs to summarize; existing summaries are kept
+        
+        Returns:
+            int: Number of Q&A pairs summarized successfully
+        """
+        if self.batch_size > 1:
+            return await self._summarize_batched(qa_pairs)
+        
+        results = await asyncio.gather(*(self.summarize_qa_async(qa) for qa in qa_pairs))
+        return sum(results)
+    
+    async def summarize_qa_async(self, qa_pair: QAPair) -> bool:
+        """Summarize the question and answer of a Q&A pair concurrently."""
+        max_question_length, max_answer_length = self._max_lengths()
+        
+        async def summarize(existing: Optional[str], text: str, max_length: int) -> Optional[str]:
+            return existing or await self._summarize_text_async(text, max_length)
+        
+        question_summary, answer_summary = await asyncio.gather(
+            summarize(qa_pair.question_summary, qa_pair.question, max_question_length),
+            summarize(qa_pair.answer_summary, qa_pair.answer, max_answer_length)
+        )
+        qa_pair.question_summary = question_summary
+        qa_pair.answer_summary = answer_summary
+        return question_summary is not None and answer_summary is not None
+    
+    async def _summarize_text_async(self, text: str, max_length: int) -> Optional[str]:
+        """Summarize text using LLM, with rate limiting and retries."""
+        if not text or len(text.strip()) <= max_length:
+            return text.strip()
+        
+        key = self._cache_key(text, max_length)
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            return cached
+        
+        response = await self._acompletion(self._completion_request(text, max_length))
+        if response is None:
+            return None
+        
+        summary = self._finish_summary(response, max_length)
+        if self.cache:
+            self.cache.put(key, summary)
+        return summary
+    
+    async def _acompletion(self, request: Dict[str, Any]) -> Optional[Any]:
+        """Send a completion request within the concurrency and rate limits.
+        
+        Returns:
+            Optional[Any]: The response, or None if the request failed
+        """
+        request["max_retries"] = 0  # Retries and backoff are handled here
+        tokens = estimate_tokens(request["messages"][0]["content"]) + request["max_tokens"]
+        
+        self._bind_limits()
+        
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    if self._request_bucket:
+                        await self._request_bucket.acquire(1)
+                    if self._token_bucket:
+                        await self._token_bucket.acquire(tokens)
+                    return await acompletion(**request)
+            
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_retries:
+                    print(f"LLM summarization failed after {attempt + 1} attempts: {e}")
+                    return None
+                await asyncio.sleep(self._backoff_delay(attempt))
+            
+            except Exception as e:
+                print(f"LLM summarization failed: {e}")
+                return None
+        
+        return None
+    
+    async def _summarize_batched(self, qa_pairs: List[QAPair]) -> int:
+        """Summarize Q&A pairs with several texts per request."""
+        max_question_length, max_answer_length = self._max_lengths()
+        
+        # Collect the texts that need the LLM; short and cached ones are filled in directly
+        items: List[BatchItem] = []
+        for qa in qa_pairs:
+            for field, text, max_length in (
+                ('question_summary', qa.question, max_question_length),
+                ('answer_summary', qa.answer, max_answer_length),
+            ):
+                if getattr(qa, field):
+                    continue
+                if not text or len(text.strip()) <= max_length:
+                    setattr(qa, field, text.strip())
+                    continue
+                
+                cached = self.cache.get(self._cache_key(text, max_length, BATCH_PROMPT)) if self.cache else None
+                if cached is not None:
+                    setattr(qa, field, cached)
+                else:
+                    items.append(BatchItem(qa, field, text, max_length))
+        
+        await asyncio.gather(*(self._summarize_batch(batch) for batch in self._pack_batches(items)))
+        
+        return sum(1 for qa in qa_pairs
+                   if qa.question_summary is not None and qa.answer_summary is not None)
+    
+    def _pack_batches(self, items: List['BatchItem']) -> List[List['BatchItem']]:
+        """Group items into batches within the item count and prompt token budget."""
+        batches: List[List[BatchItem]] = []
+        batch: List[BatchItem] = []
+        budget = 0
+        for item in items:
+            tokens = estimate_tokens(item.text)
+            if batch and (len(batch) >= self.batch_size or budget + tokens > self.batch_token_budget):
+                batches.append(batch)
+                batch, budget = [], 0
+            batch.append(item)
+            budget += tokens
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    async def _summarize_batch(self, batch: List['BatchItem']) -> None:
+        """Summarize a batch in one request, falling back to one request per item."""
+        missing = batch
+        if len(batch) > 1:
+            response = await self._acompletion(self._batch_request(batch))
+            summaries = self._parse_batch_response(response, len(batch)) if response is not None else {}
+            
+            missing = []
+            for index, item in enumerate(batch):
+                summary = summaries.get(index)
+                if not summary:
+                    missing.append(item)
+                    continue
+                
+                if len(summary) > item.max_length:
+                    summary = summary[:item.max_length-3] + "..."
+                setattr(item.qa, item.field, summary)
+                if self.cache:
+                    self.cache.put(self._cache_key(item.text, item.max_length, BATCH_PROMPT), summary)
+        
+        summaries = await asyncio.gather(*(self._summarize_text_async(item.text, item.max_length)
+                                           for item in missing))
+        for item, summary in zip(missing, summaries):
+            setattr(item.qa, item.field, summary)
+    
+    def _batch_request(self, batch: List['BatchItem']) -> Dict[str, Any]:
+        """Build the completion arguments for a batch of texts."""
+        payload = [
+            {"id": index, "max_length": item.max_length, "text": item.text}
+            for index, item in enumerate(batch)
+        ]
+        request = self._prompt_request(BATCH_PROMPT + "\n\n" + json.dumps(payload, ensure_ascii=False))
+        # Room for every summary plus JSON overhead
+        request["max_tokens"] = sum(item.max_length + 20 for item in batch) + 50
+        return request
+    
+    @staticmethod
+    def _parse_batch_response(response: Any, count: int) -> Dict[int, str]:
+        """Parse the JSON array of a batch response.
+        
+        Returns:
+            Dict[int, str]: Summaries by item index; malformed entries are left out
+        """
+        try:
+            content = response.choices[0].message.content or ""
+        except (AttributeError, IndexError):
+            return {}
+        
+        # Tolerate code fences or text around the array
+        start, end = content.find('['), content.rfind(']')
+        if start < 0 or end < start:
+            return {}
+        try:
+            data = json.loads(content[start:end + 1])
+        except json.JSONDecodeError:
+            return {}
+        if not isinstance(data, list):
+            return {}
+        
+        summaries = {}
+        for position, entry in enumerate(data):
+            if isinstance(entry, dict):
+                index, summary = entry.get("id"), entry.get("summary")
+            elif isinstance(entry, str) and len(data) == count:
+                index, summary = position, entry
+            else:
+                continue
+            if isinstance(index, int) and 0 <= index < count and isinstance(summary, str) and summary.strip():
+                summaries[index] = summary.strip()
+        return summaries
+    
+    def _bind_limits(self) -> None:
+        """Create the concurrency and rate limits for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        
+        self._loop = loop
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._request_bucket = TokenBucket(self.requests_per_minute) if self.requests_per_minute else None
+        self._token_bucket = TokenBucket(self.tokens_per_minute) if self.tokens_per_minute else None
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter."""
+        delay = min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt))
+        return random.uniform(delay / 2, delay)
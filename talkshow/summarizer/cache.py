@@ -0,0 +1,120 @@
+"""Persistent content-addressed cache for summaries."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries(last_used);
+"""
+
+
+class SummaryCache:
+    """SQLite cache of summaries keyed by what produced them.
+    
+    The key is a hash of the text, the maximum summary length, the model
+    and the prompt template, so the same text met again in another
+    session or after a re-parse is not summarized twice, while changing
+    the model or prompt invalidates old entries. The cache holds at most
+    ``max_entries`` summaries and evicts the least recently used ones.
+    """
+    
+    def __init__(self, cache_path: str, max_entries: int = 100000):
+        """Initialize the cache.
+        
+        Args:
+            cache_path: Path to the SQLite database file
+            max_entries: Maximum number of cached summaries
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.hits = 0
+        self.misses = 0
+        
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+    
+    @classmethod
+    def for_data_file(cls, data_file: Path, max_entries: int = 100000) -> 'SummaryCache':
+        """Create the cache stored alongside a data file."""
+        data_file = Path(data_file)
+        return cls(str(data_file.with_name("summary_cache.db")), max_entries=max_entries)
+    
+    @staticmethod
+    def make_key(text: str, max_length: int, model: str, template: str) -> str:
+        """Compute the cache key of a summary request."""
+        payload = json.dumps([text, max_length, model, template], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Look up a summary, marking it as recently used.
+        
+        Returns:
+            Optional[str]: The cached summary, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            with self._conn:
+                self._conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (time.time(), key))
+            return row[0]
+    
+    def put(self, key: str, summary: str) -> None:
+        """Store a summary, evicting old entries if the cache is full."""
+        with self._lock:
+            with self._conn:
+                now = time.time()
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO summaries (key, summary, last_used) VALUES (?, ?, ?)",
+                    (key, summary, now)
+                )
+                if cursor.rowcount:
+                    self._count += 1
+                else:
+                    self._conn.execute(
+                        "UPDATE summaries SET summary = ?, last_used = ? WHERE key = ?",
+                        (summary, now, key)
+                    )
+                
+                if self._count > self.max_entries:
+                    self._evict()
+    
+    def _evict(self) -> None:
+        """Drop the least recently used entries down to 90% of capacity."""
+        target = max(1, int(self.max_entries * 0.9))
+        self._conn.execute(
+            "DELETE FROM summaries WHERE key IN "
+            "(SELECT key FROM summaries ORDER BY last_used LIMIT ?)",
+            (self._count - target,)
+        )
+        self._count = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+    
+    def stats(self) -> Dict[str, int]:
+        """Get hit and miss counts of this run and the number of entries."""
+        return {"hits": self.hits, "misses": self.misses, "entries": self._count}
+    
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -4,30 +4,34 @@ LLM-based summarizer for TalkShow.
 Uses LiteLLM to generate intelligent summaries of questions and answers.
 """
 
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from litellm import completion
 from ..config.manager import ConfigManager
 from ..models.chat import QAPair
+from .cache import SummaryCache
 
 
 class LLMSummarizer:
     """LLM-based text summarizer using various LLM providers."""
     
-    def __init__(self, config_manager: Optional[ConfigManager] = None):
+    PROMPT_TEMPLATE = "请将以下文本总结为不超过{max_length}个字符的简洁描述：\n\n{text}"
+    
+    def __init__(self, config_manager: Optional[ConfigManager] = None,
+                 cache: Optional[SummaryCache] = None):
         """Initialize LLM summarizer.
         
         Args:
             config_manager: Configuration manager instance
+            cache: Summary cache to consult before calling the LLM
         """
         self.config_manager = config_manager or ConfigManager()
         self.llm_config = self.config_manager.get("summarizer.llm", {})
+        self.cache = cache
     
     def summarize_qa(self, qa_pair: QAPair) -> bool:
         """Summarize both question and answer in a Q&A pair."""
         try:
-            # Get max lengths from config
-            max_question_length = self.config_manager.get("summarizer.rule.max_question_length", 20)
-            max_answer_length = self.config_manager.get("summarizer.rule.max_answer_length", 80)
+            max_question_length, max_answer_length = self._max_lengths()
             
             # Summarize question
             if not qa_pair.question_summary:
@@ -48,43 +52,72 @@ class LLMSummarizer:
             print(f"Error summarizing Q&A: {e}")
             return False
     
+    def _max_lengths(self) -> Tuple[int, int]:
+        """Get the maximum question and answer summary lengths from config."""
+        return (
+            self.config_manager.get("summarizer.rule.max_question_length", 20),
+            self.config_manager.get("summarizer.rule.max_answer_length", 80)
+        )
+    
     def _summarize_text(self, text: str, max_length: int = 50) -> Optional[str]:
         """Summarize text using LLM."""
         if not text or len(text.strip()) <= max_length:
             return text.strip()
         
+        key = self._cache_key(text, max_length)
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            return cached
+        
         try:
-            # Prepare prompt
-            prompt = f"请将以下文本总结为不超过{max_length}个字符的简洁描述：\n\n{text}"
-            
-            # Get LLM configuration
-            model = self.llm_config.get("model", "moonshot/kimi-k2-0711-preview")
-            max_tokens = self.llm_config.get("max_tokens", 150)
-            temperature = self.llm_config.get("temperature", 0.3)
-            api_base = self.llm_config.get("api_base", "https://api.moonshot.cn/v1")
-            api_key = self.llm_config.get("api_key")
-            
-            # Call LLM
-            response = completion(
-                model=model,
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=max_tokens,
-                temperature=temperature,
-                api_base=api_base,
-                api_key=api_key
-            )
-            
-            summary = response.choices[0].message.content.strip()
-            
-            # Ensure summary doesn't exceed max_length
-            if len(summary) > max_length:
-                summary = summary[:max_length-3] + "..."
-            
-            return summary
+            response = completion(**self._completion_request(text, max_length))
+            summary = self._finish_summary(response, max_length)
             
         except Exception as e:
             print(f"LLM summarization failed: {e}")
             return None
+        
+        if self.cache:
+            self.cache.put(key, summary)
+        return summary
+    
+    def _model(self) -> str:
+        """Get the configured model name."""
+        return self.llm_config.get("model", "moonshot/kimi-k2-0711-preview")
+    
+    def _cache_key(self, text: str, max_length: int, template: Optional[str] = None) -> Optional[str]:
+        """Cache key of an LLM summary, or None without a cache."""
+        if not self.cache:
+            return None
+        return SummaryCache.make_key(text, max_length, self._model(), template or self.PROMPT_TEMPLATE)
+    
+    def _completion_request(self, text: str, max_length: int) -> Dict[str, Any]:
+        """Build the completion arguments for summarizing a text."""
+        # Prepare prompt
+        prompt = self.PROMPT_TEMPLATE.format(max_length=max_length, text=text)
+        return self._prompt_request(prompt)
+    
+    def _prompt_request(self, prompt: str) -> Dict[str, Any]:
+        """Build the completion arguments for a prompt from the LLM configuration."""
+        return {
+            "model": self._model(),
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": self.llm_config.get("max_tokens", 150),
+            "temperature": self.llm_config.get("temperature", 0.3),
+            "api_base": self.llm_config.get("api_base", "https://api.moonshot.cn/v1"),
+            "api_key": self.llm_config.get("api_key")
+        }
+    
+    @staticmethod
+    def _finish_summary(response: Any, max_length: int) -> str:
+        """Extract the summary from a completion response."""
+        summary = response.choices[0].message.content.strip()
+        
+        # Ensure summary doesn't exceed max_length
+        if len(summary) > max_length:
+            summary = summary[:max_length-3] + "..."
+        
+        return summary
     
     def get_usage_info(self) -> dict:
         """Get information about LLM usage configuration."""
@@ -3,20 +3,27 @@
 import re
 from typing import Optional
 from ..models.chat import QAPair
+from .cache import SummaryCache
 
 
 class RuleSummarizer:
     """Simple rule-based text summarizer."""
     
-    def __init__(self, max_question_length: int = 60, max_answer_length: int = 120):
+    # Part of the cache key; bump when the rules change
+    CACHE_TEMPLATE = "rule-v1"
+    
+    def __init__(self, max_question_length: int = 60, max_answer_length: int = 120,
+                 cache: Optional[SummaryCache] = None):
         """Initialize rule summarizer.
         
         Args:
             max_question_length: Maximum length for question summaries
             max_answer_length: Maximum length for answer summaries
+            cache: Summary cache to consult before summarizing
         """
         self.max_question_length = max_question_length
         self.max_answer_length = max_answer_length
+        self.cache = cache
     
     def summarize_qa(self, qa_pair: QAPair) -> bool:
         """Summarize both question and answer in a Q&A pair.
@@ -53,6 +60,11 @@ class RuleSummarizer:
         if len(cleaned) <= self.max_question_length:
             return None  # No summary needed
         
+        key = self._cache_key(cleaned, self.max_question_length, "question")
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            return cached
+        
         # Extract the core question part
         summary = self._extract_question_core(cleaned)
         
@@ -60,6 +72,8 @@ class RuleSummarizer:
         if len(summary) > self.max_question_length:
             summary = summary[:self.max_question_length - 3] + "..."
         
+        if self.cache:
+            self.cache.put(key, summary)
         return summary
     
     def summarize_answer(self, answer: str) -> Optional[str]:
@@ -74,6 +88,11 @@ class RuleSummarizer:
         if len(cleaned) <= self.max_answer_length:
             return None  # No summary needed
         
+        key = self._cache_key(cleaned, self.max_answer_length, "answer")
+        cached = self.cache.get(key) if self.cache else None
+        if cached is not None:
+            return cached
+        
         # Extract key sentences
         summary = self._extract_answer_key_content(cleaned)
         
@@ -81,8 +100,16 @@ class RuleSummarizer:
         if len(summary) > self.max_answer_length:
             summary = summary[:self.max_answer_length - 3] + "..."
         
+        if self.cache:
+            self.cache.put(key, summary)
         return summary
     
+    def _cache_key(self, text: str, max_length: int, kind: str) -> Optional[str]:
+        """Cache key of a rule-based summary, or None without a cache."""
+        if not self.cache:
+            return None
+        return SummaryCache.make_key(text, max_length, "rule", f"{self.CACHE_TEMPLATE}:{kind}")
+    
     def _clean_text(self, text: str) -> str:
         """Clean text by removing extra whitespace and formatting."""
         # Remove multiple spaces and newlines
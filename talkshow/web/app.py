@@ -4,10 +4,11 @@ TalkShow FastAPI Application
 Main web application for serving TalkShow API and frontend.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, StreamingResponse
 from typing import List, Dict, Any, Optional
+from datetime import date
 import json
 import os
 import yaml
@@ -15,9 +16,17 @@ from pathlib import Path
 import re # Added for markdown filename generation
 
 # Import TalkShow components
-from ..storage.json_storage import JSONStorage
+from ..storage.factory import create_storage
+from ..storage.repository import SessionRepository
+from ..storage.async_repository import AsyncSessionRepository
+from ..analytics.qa_table import ANSWER_PREVIEW_LENGTH, HAS_TIMESTAMP, QUESTION_SUMMARY, QATable
 from ..models.chat import ChatSession
 from ..config.manager import ConfigManager
+from .caching import ConditionalGetMiddleware
+from .compression import CompressionMiddleware
+from .events import EventBroker
+from .pagination import ListingIndex, parse_fields, parse_time_bound, sort_key
+from .responses import FastJSONResponse
 
 # Create FastAPI app
 app = FastAPI(
@@ -29,10 +38,34 @@ app = FastAPI(
 # Initialize configuration manager
 config_manager = ConfigManager()
 
-# Data storage
-storage_path = config_manager.get_data_file_path()
+# Data storage (backend selected by storage.type)
+storage = create_storage(config_manager)
+storage_path = storage.storage_path
 print(f"Using data file: {storage_path}")
-storage = JSONStorage(str(storage_path))
+# Sessions are served from memory and reloaded only when the data file changes
+repository = SessionRepository(storage)
+# Handlers await blocking loads on a bounded thread pool instead of running them on the event loop
+data = AsyncSessionRepository(repository, max_workers=config_manager.get("web.io_workers", 4))
+# Clients subscribed to /api/events get the changes of every new data version
+events = EventBroker(
+    data,
+    poll_interval=config_manager.get("web.events.poll_interval", 1.0),
+    heartbeat=config_manager.get("web.events.heartbeat", 15.0)
+)
+
+# API responses derived from the stored sessions are revalidated by ETag and
+# cached until the data version changes; markdown files are read from disk
+CACHED_PATHS = ("/api/sessions", "/api/insights", "/api/search", "/api/stats", "/api/timeline")
+
+# Compression sits inside the response cache, so cached bodies are stored compressed
+if config_manager.get("web.compression.enabled", True):
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=config_manager.get("web.compression.minimum_size", 1024),
+        gzip_level=config_manager.get("web.compression.gzip_level", 6),
+        brotli_quality=config_manager.get("web.compression.brotli_quality", 5)
+    )
+app.add_middleware(ConditionalGetMiddleware, get_version=data.get_data_version, paths=CACHED_PATHS)
 
 # Mount static files
 static_dir = Path(__file__).parent / "static"
@@ -43,6 +76,53 @@ else:
     print(f"Warning: Static directory not found at {static_dir}")
 
 
+# Sorted, pre-encoded list responses per endpoint, rebuilt when the data version changes
+_listings: Dict[str, Any] = {}
+
+
+def listing_params(
+    limit: Optional[int] = Query(None, ge=1, le=10000, description="Maximum number of items per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    since: Optional[str] = Query(None, description="Only items at or after this date/time (ISO 8601)"),
+    until: Optional[str] = Query(None, description="Only items before this time, or up to and including this date"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include in each item")
+) -> Dict[str, Any]:
+    """Common pagination and projection parameters of the list endpoints."""
+    return {"limit": limit, "cursor": cursor, "since": since, "until": until, "fields": fields}
+
+
+async def _get_listing(name: str, get_version, build) -> ListingIndex:
+    """Get the listing of an endpoint, building it on the thread pool if the data version changed."""
+    def load() -> ListingIndex:
+        version = get_version()
+        cached = _listings.get(name)
+        if cached is None or cached[0] != version:
+            cached = (version, ListingIndex(build()))
+            _listings[name] = cached
+        return cached[1]
+    
+    return await data.coalesce(("listing", name), load)
+
+
+def _listing_response(listing: ListingIndex, params: Dict[str, Any]) -> Response:
+    """Serve one page of a listing, with the next cursor in the X-Next-Cursor header."""
+    try:
+        body, total, next_cursor = listing.page(
+            limit=params["limit"],
+            cursor=params["cursor"],
+            since=parse_time_bound(params["since"]),
+            until=parse_time_bound(params["until"], end=True),
+            fields=parse_fields(params["fields"])
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    headers = {"X-Total-Count": str(total)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/")
 async def root():
     """Serve the main frontend page."""
@@ -50,7 +130,7 @@ async def root():
         # 读取HTML文件
         html_path = Path(__file__).parent / "static" / "index.html"
         if html_path.exists():
-            return HTMLResponse(content=html_path.read_text(encoding='utf-8'))
+            return HTMLResponse(content=await data.run(html_path.read_text, encoding='utf-8'))
         else:
             # 如果文件不存在，返回简单的HTML
             return HTMLResponse(content="""
@@ -74,114 +154,137 @@ async def root():
 
 
 @app.get("/api/sessions", response_model=List[Dict[str, Any]])
-async def get_sessions():
-    """Get all chat sessions with metadata."""
+async def get_sessions(params: Dict[str, Any] = Depends(listing_params)):
+    """Get all chat sessions with metadata, ordered by creation time."""
     try:
-        sessions = storage.load_all_sessions()
-        
-        session_list = []
-        for session in sessions:
-            # 直接使用会话的filename作为markdown文件名
-            # 因为session.meta.filename应该就是实际的Markdown文件名
-            markdown_filename = session.meta.filename
-            
-            session_data = {
-                "filename": session.meta.filename,
-                "theme": session.meta.theme,
-                "markdown_filename": markdown_filename,  # 使用原始filename
-                "created_time": session.meta.ctime.isoformat() if session.meta.ctime else None,
-                "qa_count": len(session.qa_pairs),
-                "has_summaries": any(qa.question_summary or qa.answer_summary for qa in session.qa_pairs),
-                "first_question": session.qa_pairs[0].question[:50] + "..." if session.qa_pairs else None,
-                "timestamp": session.qa_pairs[0].timestamp.isoformat() if session.qa_pairs and session.qa_pairs[0].timestamp else None
-            }
-            session_list.append(session_data)
-        
-        # Sort by created_time
-        session_list.sort(key=lambda x: x["created_time"] or "", reverse=False)
+        def build():
+            # Digests only: no question or answer bodies are loaded for the listing
+            for digest in repository.get_all_metas():
+                # 直接使用会话的filename作为markdown文件名
+                # 因为session.meta.filename应该就是实际的Markdown文件名
+                markdown_filename = digest.meta.filename
+                
+                session_data = {
+                    "filename": digest.meta.filename,
+                    "theme": digest.meta.theme,
+                    "markdown_filename": markdown_filename,  # 使用原始filename
+                    "created_time": digest.meta.ctime.isoformat() if digest.meta.ctime else None,
+                    "qa_count": digest.qa_count,
+                    "has_summaries": digest.has_summaries,
+                    "first_question": digest.first_question[:50] + "..." if digest.first_question is not None else None,
+                    "timestamp": digest.first_timestamp.isoformat() if digest.first_timestamp else None
+                }
+                yield sort_key(digest.meta.ctime, digest.meta.filename), session_data
         
-        return session_list
+        listing = await _get_listing("sessions", storage.get_data_version, build)
+        return _listing_response(listing, params)
     
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load sessions: {str(e)}")
 
 
 @app.get("/api/sessions/insights", response_model=List[Dict[str, Any]])
-async def get_sessions_insights():
+async def get_sessions_insights(params: Dict[str, Any] = Depends(listing_params)):
     """Get all sessions with QA pairs optimized for daily insights view.
     
     This endpoint returns all the data needed for the homepage in a single request,
     avoiding the N+1 query problem where each session requires a separate API call.
     """
     try:
-        sessions = storage.load_all_sessions()
-        
-        insights_data = []
-        for session in sessions:
-            # Only include the data needed for daily insights
-            qa_pairs_data = []
-            for qa in session.qa_pairs:
-                # Only include fields needed for the daily insights view
-                qa_data = {
-                    "question": qa.question,
-                    "question_summary": qa.question_summary,
-                    "timestamp": qa.timestamp.isoformat() if qa.timestamp else None
-                }
-                qa_pairs_data.append(qa_data)
-            
-            session_data = {
-                "filename": session.meta.filename,
-                "theme": session.meta.theme,
-                "markdown_filename": session.meta.filename,  # Using filename as markdown filename
-                "created_time": session.meta.ctime.isoformat() if session.meta.ctime else None,
-                "qa_pairs": qa_pairs_data  # Include only necessary QA data
+        listing = await _get_listing("insights", lambda: repository.version,
+                                     lambda: _build_insights(repository.get_all_sessions()))
+        return _listing_response(listing, params)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load session insights: {str(e)}")
+
+
+def _build_insights(sessions: List[ChatSession]):
+    """Yield the sort key and insights item of each session."""
+    for session in sessions:
+        # Only include the data needed for daily insights
+        qa_pairs_data = []
+        for qa in session.qa_pairs:
+            # Only include fields needed for the daily insights view
+            qa_data = {
+                "question": qa.question,
+                "question_summary": qa.question_summary,
+                "timestamp": qa.timestamp.isoformat() if qa.timestamp else None
             }
-            insights_data.append(session_data)
+            qa_pairs_data.append(qa_data)
+        
+        session_data = {
+            "filename": session.meta.filename,
+            "theme": session.meta.theme,
+            "markdown_filename": session.meta.filename,  # Using filename as markdown filename
+            "created_time": session.meta.ctime.isoformat() if session.meta.ctime else None,
+            "qa_pairs": qa_pairs_data  # Include only necessary QA data
+        }
+        yield sort_key(session.meta.ctime, session.meta.filename), session_data
+
+
+@app.get("/api/insights/daily", response_model=Dict[str, Any])
+async def get_daily_insights(
+    start: Optional[date] = Query(None, description="First day to include (YYYY-MM-DD)"),
+    end: Optional[date] = Query(None, description="Last day to include (YYYY-MM-DD)"),
+    q: Optional[str] = Query(None, description="Filter questions by summary, text or theme"),
+    limit: int = Query(30, ge=1, le=366, description="Days per page"),
+    offset: int = Query(0, ge=0, description="Days to skip"),
+    order: str = Query("asc", pattern="^(asc|desc)$", description="Day order")
+):
+    """Get questions grouped by day and rounded to the half hour.
+    
+    Grouping is done once per data version on the server, with the same
+    logic as scripts/daily_insights.py; requests only filter and page
+    through the prepared days.
+    """
+    try:
+        insights = await data.get_daily_insights()
+        return FastJSONResponse(await data.run(insights.query, start=start, end=end, search=q, limit=limit,
+                                               offset=offset, descending=order == "desc"))
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load daily insights: {str(e)}")
+
+
+@app.get("/api/search", response_model=Dict[str, Any])
+async def search_qa_pairs(
+    q: str = Query(..., min_length=1, description="Search query"),
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0)
+):
+    """Full-text search over questions, answers and summaries."""
+    try:
+        index = await data.get_search_index()
+        total, hits = await data.run(index.search, q, limit=limit, offset=offset)
         
-        return insights_data
+        return FastJSONResponse({
+            "query": q,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "results": [hit.to_dict() for hit in hits]
+        })
     
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to load session insights: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to search sessions: {str(e)}")
 
 
 @app.get("/api/sessions/{filename}", response_model=Dict[str, Any])
 async def get_session_details(filename: str):
     """Get detailed information for a specific session."""
     try:
-        sessions = storage.load_all_sessions()
-        
-        # Find the session
-        target_session = None
-        for session in sessions:
-            if session.meta.filename == filename:
-                target_session = session
-                break
+        target_session = await data.get_session(filename)
         
         if not target_session:
             raise HTTPException(status_code=404, detail="Session not found")
         
-        # Build detailed response
-        qa_pairs = []
-        for qa in target_session.qa_pairs:
-            qa_data = {
-                "question": qa.question,
-                "answer": qa.answer,
-                "question_summary": qa.question_summary,
-                "answer_summary": qa.answer_summary,
-                "timestamp": qa.timestamp.isoformat() if qa.timestamp else None
-            }
-            qa_pairs.append(qa_data)
-        
-        session_detail = {
-            "filename": target_session.meta.filename,
-            "theme": target_session.meta.theme,
-            "created_time": target_session.meta.ctime.isoformat() if target_session.meta.ctime else None,
-            "qa_pairs": qa_pairs,
-            "qa_count": len(qa_pairs),
-            "has_summaries": any(qa.question_summary or qa.answer_summary for qa in target_session.qa_pairs)
-        }
-        
-        return session_detail
+        # Decoding and building the QA pairs runs on the thread pool
+        return FastJSONResponse(await data.run(_build_session_detail, target_session))
     
     except HTTPException:
         raise
@@ -189,113 +292,127 @@ async def get_session_details(filename: str):
         raise HTTPException(status_code=500, detail=f"Failed to load session details: {str(e)}")
 
 
+def _build_session_detail(target_session: ChatSession) -> Dict[str, Any]:
+    """Build the detail response of a session."""
+    qa_pairs = []
+    for qa in target_session.qa_pairs:
+        qa_data = {
+            "question": qa.question,
+            "answer": qa.answer,
+            "question_summary": qa.question_summary,
+            "answer_summary": qa.answer_summary,
+            "timestamp": qa.timestamp.isoformat() if qa.timestamp else None
+        }
+        qa_pairs.append(qa_data)
+    
+    return {
+        "filename": target_session.meta.filename,
+        "theme": target_session.meta.theme,
+        "created_time": target_session.meta.ctime.isoformat() if target_session.meta.ctime else None,
+        "qa_pairs": qa_pairs,
+        "qa_count": len(qa_pairs),
+        "has_summaries": any(qa.question_summary or qa.answer_summary for qa in target_session.qa_pairs)
+    }
+
+
 @app.get("/api/stats", response_model=Dict[str, Any])
 async def get_stats():
     """Get overall statistics about the chat history."""
     try:
-        sessions = storage.load_all_sessions()
-        
-        total_sessions = len(sessions)
-        total_qa_pairs = sum(len(session.qa_pairs) for session in sessions)
-        
-        # Count summaries
-        question_summaries = 0
-        answer_summaries = 0
-        
-        # Date range
-        all_dates = []
-        
-        for session in sessions:
-            if session.meta.ctime:
-                all_dates.append(session.meta.ctime)
-            
-            for qa in session.qa_pairs:
-                if qa.question_summary:
-                    question_summaries += 1
-                if qa.answer_summary:
-                    answer_summaries += 1
-                
-                if qa.timestamp:
-                    all_dates.append(qa.timestamp)
-        
-        date_range = {
-            "start": min(all_dates).isoformat() if all_dates else None,
-            "end": max(all_dates).isoformat() if all_dates else None
-        }
-        
-        # File size
-        file_size = 0
-        if os.path.exists(storage_path):
-            file_size = os.path.getsize(storage_path)
-        
-        stats = {
-            "total_sessions": total_sessions,
-            "total_qa_pairs": total_qa_pairs,
-            "question_summaries": question_summaries,
-            "answer_summaries": answer_summaries,
-            "average_qa_per_session": round(total_qa_pairs / total_sessions, 1) if total_sessions > 0 else 0,
-            "date_range": date_range,
-            "storage_file_size": file_size,
-            "storage_info": storage.get_storage_info()
-        }
-        
-        return stats
+        return FastJSONResponse(await data.coalesce("stats", _build_stats))
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get statistics: {str(e)}")
 
 
+def _build_stats() -> Dict[str, Any]:
+    """Compute the statistics from the QA table of the current data version."""
+    stats = dict(repository.get_qa_table().stats())
+    
+    # File size
+    file_size = 0
+    if os.path.exists(storage_path):
+        file_size = os.path.getsize(storage_path)
+    
+    stats["storage_file_size"] = file_size
+    stats["storage_info"] = storage.get_storage_info()
+    return stats
+
+
 @app.get("/api/timeline", response_model=List[Dict[str, Any]])
-async def get_timeline():
-    """Get timeline data for visualization."""
+async def get_timeline(params: Dict[str, Any] = Depends(listing_params)):
+    """Get timeline data for visualization, ordered by time."""
     try:
-        sessions = storage.load_all_sessions()
+        listing = await _get_listing("timeline", lambda: repository.version,
+                                     lambda: _build_timeline(repository.get_qa_table()))
+        return _listing_response(listing, params)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate timeline: {str(e)}")
+
+
+def _build_timeline(table: QATable):
+    """Yield the sort key and timeline entry of each session start and timestamped QA pair."""
+    for index, (filename, theme) in enumerate(zip(table.filenames, table.themes)):
+        rows = table.session_rows(index)
+        if not rows:
+            continue
         
-        timeline_data = []
+        session_time = table.session_time(index)
+        session_entry = {
+            "filename": filename,
+            "theme": theme,
+            "time": session_time.isoformat(),
+            "qa_count": len(rows),
+            "type": "session_start",
+            "summary": f"{theme} ({len(rows)} Q&As)"
+        }
+        yield sort_key(session_time, filename, -1), session_entry
         
-        for session in sessions:
-            if not session.qa_pairs:
+        # Add individual QA pairs for detailed timeline
+        for row in rows:
+            flags = table.flags[row]
+            if not flags & HAS_TIMESTAMP:
                 continue
             
-            # Get session start time from first QA pair or meta
-            session_time = session.meta.ctime
-            if not session_time and session.qa_pairs:
-                session_time = session.qa_pairs[0].timestamp
-            
-            if not session_time:
-                continue
+            # Long texts show their summary, else a truncated copy
+            question = table.questions[row]
+            if table.question_length[row] > 50:
+                question = table.summaries[row] if flags & QUESTION_SUMMARY else question[:50] + "..."
+            answer = table.answer_previews[row]
+            if table.answer_length[row] > ANSWER_PREVIEW_LENGTH:
+                answer = table.answer_summaries[row] or answer + "..."
             
-            session_entry = {
-                "filename": session.meta.filename,
-                "theme": session.meta.theme,
-                "time": session_time.isoformat(),
-                "qa_count": len(session.qa_pairs),
-                "type": "session_start",
-                "summary": f"{session.meta.theme} ({len(session.qa_pairs)} Q&As)"
+            timestamp = table.qa_time(row)
+            qa_entry = {
+                "filename": filename,
+                "theme": theme,
+                "time": timestamp.isoformat(),
+                "qa_index": table.position[row],
+                "type": "qa_pair",
+                "question": question,
+                "answer": answer
             }
-            timeline_data.append(session_entry)
-            
-            # Add individual QA pairs for detailed timeline
-            for i, qa in enumerate(session.qa_pairs):
-                if qa.timestamp:
-                    qa_entry = {
-                        "filename": session.meta.filename,
-                        "theme": session.meta.theme,
-                        "time": qa.timestamp.isoformat(),
-                        "qa_index": i,
-                        "type": "qa_pair",
-                        "question": qa.question_summary or qa.question[:50] + "..." if len(qa.question) > 50 else qa.question,
-                        "answer": qa.answer_summary or qa.answer[:100] + "..." if len(qa.answer) > 100 else qa.answer
-                    }
-                    timeline_data.append(qa_entry)
-        
-        # Sort by time
-        timeline_data.sort(key=lambda x: x["time"])
-        
-        return timeline_data
+            yield sort_key(timestamp, filename, table.position[row]), qa_entry
+
+
+@app.get("/api/events")
+async def stream_events():
+    """Stream changes of the stored sessions as server-sent events.
     
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate timeline: {str(e)}")
+    A ``ready`` event with the current data version comes first. Each
+    later data change produces one ``update`` event with the added,
+    updated and removed sessions and the daily insights days that
+    changed; ``reset`` means events were missed and everything should be
+    reloaded.
+    """
+    return StreamingResponse(
+        events.stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @app.get("/view/{filename}")
@@ -313,7 +430,7 @@ async def view_markdown(filename: str):
             raise HTTPException(status_code=404, detail=f"Markdown file not found: {decoded_filename}")
         
         # 读取文件内容
-        content = md_path.read_text(encoding='utf-8')
+        content = await data.run(md_path.read_text, encoding='utf-8')
         
         # 生成HTML页面
         html_content = f"""
@@ -444,13 +561,13 @@ async def get_markdown_content(filename: str):
             raise HTTPException(status_code=404, detail=f"Markdown file not found: {decoded_filename}")
         
         # 读取文件内容
-        content = md_path.read_text(encoding='utf-8')
+        content = await data.run(md_path.read_text, encoding='utf-8')
         
-        return {
+        return FastJSONResponse({
             "filename": decoded_filename,
             "content": content,
             "size": len(content)
-        }
+        })
     
     except HTTPException:
         raise
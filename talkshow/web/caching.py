@@ -0,0 +1,173 @@
+"""Conditional GET and response caching keyed on the storage data version.
+
+Every API response derived from stored sessions is fully determined by
+the request and the backend's data version. The middleware tags such
+responses with an ``ETag`` for that version, keeps serialized responses
+per path, query string and accepted encoding until the version changes,
+and answers a matching ``If-None-Match`` with 304 once the request is
+known to produce a 200 for the current version.
+
+There is no ``Last-Modified``: versions are not timestamps, and a
+second-resolution date cannot tell apart two versions written within
+the same second.
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers
+
+
+# (status, headers, body) of a buffered response
+CachedResponse = Tuple[int, List[Tuple[bytes, bytes]], bytes]
+
+_UNSET = object()
+
+
+def version_tag(version: Any) -> str:
+    """Short opaque tag of a data version, as used in ETags and event ids."""
+    return hashlib.sha1(repr(version).encode('utf-8')).hexdigest()[:20]
+
+
+class ResponseCache:
+    """Serialized responses of the current data version, least recently used first out."""
+    
+    def __init__(self, max_entries: int = 512):
+        """Initialize an empty cache.
+        
+        Args:
+            max_entries: Maximum number of responses kept for one version
+        """
+        self.max_entries = max_entries
+        self.version: Any = _UNSET
+        self.etag = b''
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Any, CachedResponse]' = OrderedDict()
+    
+    def validate(self, version: Any) -> None:
+        """Drop all responses if the data version changed."""
+        if version == self.version:
+            return
+        self.version = version
+        self.etag = b'W/"' + version_tag(version).encode('ascii') + b'"'
+        self._entries.clear()
+    
+    def get(self, key: Any) -> Optional[CachedResponse]:
+        """Get a cached response, counting the hit or miss."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def put(self, key: Any, entry: CachedResponse) -> None:
+        """Store a response for the current version."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class ConditionalGetMiddleware:
+    """ASGI middleware adding ETag/304 handling and response caching to GET endpoints.
+    
+    Only paths under the given prefixes are handled; they must depend on
+    nothing but the request and the stored data.
+    """
+    
+    def __init__(self, app, get_version: Callable[[], Any], paths: Sequence[str], max_entries: int = 512):
+        """Initialize the middleware.
+        
+        Args:
+            app: Wrapped ASGI application
+            get_version: Returns the current data version, e.g. ``storage.get_data_version``;
+                a coroutine function is awaited, so a blocking lookup can run off the event loop
+            paths: Path prefixes whose responses may be cached
+            max_entries: Maximum number of cached responses
+        """
+        self.app = app
+        self.get_version = get_version
+        self.paths = tuple(paths)
+        self.cache = ResponseCache(max_entries)
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith(self.paths):
+            await self.app(scope, receive, send)
+            return
+        
+        cache = self.cache
+        version = self.get_version()
+        if asyncio.iscoroutine(version):
+            version = await version
+        cache.validate(version)
+        etag = cache.etag
+        validators = [(b"etag", etag), (b"cache-control", b"no-cache")]
+        
+        # Bodies may be compressed inside this middleware, so the encoding is part of the key
+        request_headers = Headers(scope=scope)
+        key = (scope["path"], scope["query_string"], request_headers.get("accept-encoding", ""))
+        entry = cache.get(key)
+        if entry is None:
+            entry = await _buffer_response(self.app, scope, receive)
+            status, headers, body = entry
+            if status != 200:
+                await _send_response(send, entry)
+                return
+            
+            headers = [(name, value) for name, value in headers if name.lower() != b"etag"]
+            entry = (status, headers + validators, body)
+            # A write during the request leaves the response to the next version's check
+            if cache.version == version:
+                cache.put(key, entry)
+        
+        # The ETag names only the version, so it validates nothing but a 200 for this request
+        if _not_modified(request_headers, etag):
+            await _send_response(send, (304, validators, b''))
+            return
+        await _send_response(send, entry)
+
+
+def _not_modified(headers: Headers, etag: bytes) -> bool:
+    """Evaluate If-None-Match against the current ETag."""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is None:
+        return False
+    current = etag.decode('ascii').replace('W/', '', 1)
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.replace('W/', '', 1) == current:
+            return True
+    return False
+
+
+async def _buffer_response(app, scope, receive) -> CachedResponse:
+    """Run the wrapped app and collect its complete response."""
+    status = 500
+    headers: List[Tuple[bytes, bytes]] = []
+    chunks: List[bytes] = []
+    
+    async def capture(message) -> None:
+        nonlocal status, headers
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            headers = list(message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b''))
+    
+    await app(scope, receive, capture)
+    return status, headers, b''.join(chunks)
+
+
+async def _send_response(send, entry: CachedResponse) -> None:
+    """Send a buffered response."""
+    status, headers, body = entry
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,129 @@
+"""Response compression with Brotli or gzip.
+
+Responses with a compressible content type and a body of at least
+``minimum_size`` bytes are compressed with the best encoding the client
+accepts: Brotli when the optional ``brotli`` package is installed,
+otherwise gzip. Streaming responses such as server-sent events and
+responses that are already encoded pass through unchanged.
+"""
+
+import gzip
+from typing import List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # Optional: gzip only
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = ("application/json", "text/html", "text/css", "text/plain",
+                      "application/javascript", "text/javascript")
+
+
+def choose_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, or None."""
+    if not accept_encoding:
+        return None
+    accepted = set()
+    for item in accept_encoding.split(','):
+        name, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(name.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str, gzip_level: int = 6, brotli_quality: int = 5) -> bytes:
+    """Compress a body with the given content encoding."""
+    if encoding == 'br':
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing complete responses above a size threshold."""
+    
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        """Initialize the middleware.
+        
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Smallest body in bytes worth compressing
+            gzip_level: gzip compression level (1-9)
+            brotli_quality: Brotli quality (0-11); 4-6 suit dynamic responses
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+    
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start: Optional[dict] = None
+        chunks: List[bytes] = []
+        passthrough = False
+        
+        async def compressing_send(message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                content_type = headers.get("content-type", "").split(';')[0].strip()
+                if content_type not in COMPRESSIBLE_TYPES or "content-encoding" in headers:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start = message
+                return
+            
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            
+            chunks.append(message.get("body", b''))
+            if message.get("more_body", False):
+                return
+            
+            body = b''.join(chunks)
+            headers = MutableHeaders(raw=list(start.get("headers", [])))
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding, self.gzip_level, self.brotli_quality)
+                headers["content-encoding"] = encoding
+                headers["content-length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send({**start, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": body})
+        
+        await self.app(scope, receive, compressing_send)
+
+
+def compressed_sizes(body: bytes, gzip_level: int = 6, brotli_quality: int = 5) -> List[Tuple[str, int]]:
+    """Get the size of a body under each available encoding, identity first."""
+    sizes = [("identity", len(body)), ("gzip", len(compress(body, "gzip", gzip_level=gzip_level)))]
+    if brotli is not None:
+        sizes.append(("br", len(compress(body, "br", brotli_quality=brotli_quality))))
+    return sizes
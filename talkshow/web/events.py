@@ -0,0 +1,171 @@
+"""Server-sent events announcing changes of the stored sessions.
+
+Parsing runs in another process (``talkshow parse`` or ``talkshow
+watch``), so the server learns about new data the same way the response
+cache does: through the storage data version. While at least one client
+is subscribed, the broker checks the version every ``poll_interval``
+seconds. When it changes, the broker diffs the session digests and the
+daily insights against the previous version once, and sends every
+subscriber the same small ``update`` event.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Set, Tuple
+
+from ..analytics.insights import DailyInsights
+from ..models.chat import SessionDigest
+from ..storage.async_repository import AsyncSessionRepository
+from .caching import version_tag
+from .responses import dumps
+
+
+# (data version, session digests, daily insights) the last event was computed from
+Snapshot = Tuple[Any, List[SessionDigest], DailyInsights]
+
+KEEPALIVE = b": keepalive\n\n"
+
+
+def format_event(event: str, data: Any, event_id: Optional[str] = None) -> bytes:
+    """Encode one server-sent event with a JSON payload."""
+    lines = f"id: {event_id}\n" if event_id else ""
+    return (lines + f"event: {event}\ndata: ").encode('utf-8') + dumps(data) + b"\n\n"
+
+
+def diff_digests(previous: Sequence[SessionDigest], current: Sequence[SessionDigest]) -> Dict[str, List[Any]]:
+    """Compare two session listings by filename.
+    
+    Args:
+        previous: Digests of the earlier data version
+        current: Digests of the current data version
+    
+    Returns:
+        Dict[str, List[Any]]: ``added`` and ``updated`` sessions with their
+            ``filename``, ``theme`` and ``qa_count`` (updated ones also with
+            ``previous_qa_count``), and the ``removed`` filenames
+    """
+    before = {digest.meta.filename: digest for digest in previous}
+    added, updated = [], []
+    for digest in current:
+        old = before.pop(digest.meta.filename, None)
+        item = {"filename": digest.meta.filename, "theme": digest.meta.theme, "qa_count": digest.qa_count}
+        if old is None:
+            added.append(item)
+        elif _fingerprint(old) != _fingerprint(digest):
+            item["previous_qa_count"] = old.qa_count
+            updated.append(item)
+    return {"added": added, "updated": updated, "removed": sorted(before)}
+
+
+def _fingerprint(digest: SessionDigest) -> tuple:
+    """Fields of a digest that change when a session's content changes."""
+    return (digest.meta.theme, digest.qa_count, digest.question_summaries, digest.answer_summaries,
+            digest.first_question, digest.min_timestamp, digest.max_timestamp)
+
+
+class EventBroker:
+    """Publishes the changes of each new data version to all subscribers."""
+    
+    def __init__(self, data: AsyncSessionRepository, poll_interval: float = 1.0, heartbeat: float = 15.0,
+                 queue_size: int = 16):
+        """Initialize the broker.
+        
+        Args:
+            data: Repository facade the snapshots are loaded through
+            poll_interval: Seconds between checks of the data version
+            heartbeat: Seconds of silence after which a keep-alive comment is sent
+            queue_size: Events buffered per subscriber before it is told to reload
+        """
+        self.data = data
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._snapshot: Optional[Snapshot] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._subscribers)
+    
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Subscribe and yield encoded events until the client goes away.
+        
+        The first event, ``ready``, carries the tag of the version that
+        later ``update`` events are relative to. It equals the ETag of
+        API responses for that version, so a client whose data is older
+        knows to reload.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.add(queue)
+        try:
+            self._start()
+            await self._ready.wait()
+            tag = version_tag(self._snapshot[0])
+            yield b"retry: 3000\n\n" + format_event("ready", {"version": tag}, tag)
+            
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE
+        finally:
+            self._subscribers.discard(queue)
+    
+    def publish(self, event: str, data: Any, event_id: Optional[str] = None) -> None:
+        """Queue an event for every subscriber.
+        
+        A subscriber too slow to keep up gets its backlog replaced by a
+        single ``reset`` event, after which it should reload everything.
+        """
+        message = format_event(event, data, event_id)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(format_event("reset", {"version": event_id}, event_id))
+    
+    def _start(self) -> None:
+        """Start polling unless it is already running."""
+        if self._task is None or self._task.done():
+            self._ready = asyncio.Event()
+            self._task = asyncio.ensure_future(self._poll())
+    
+    async def _poll(self) -> None:
+        """Watch the data version while anyone is subscribed."""
+        try:
+            while self._subscribers:
+                if self._snapshot is None or await self.data.get_data_version() != self._snapshot[0]:
+                    try:
+                        snapshot = await self.data.run(self._load)
+                    except Exception as e:
+                        print(f"Warning: Failed to load data for events: {e}")
+                    else:
+                        if self._snapshot is not None:
+                            tag = version_tag(snapshot[0])
+                            self.publish("update", self._delta(self._snapshot, snapshot), tag)
+                        self._snapshot = snapshot
+                        self._ready.set()
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            # Nobody is listening; the next subscriber starts from a fresh snapshot
+            self._snapshot = None
+    
+    def _load(self) -> Snapshot:
+        """Load the digests and daily insights of the current version."""
+        repository = self.data.repository
+        # Read the version first: a write during loading makes the next check differ again
+        version = self.data.storage.get_data_version()
+        return version, repository.get_all_metas(), repository.get_daily_insights()
+    
+    @staticmethod
+    def _delta(previous: Snapshot, current: Snapshot) -> Dict[str, Any]:
+        """Build the payload of an ``update`` event."""
+        return {
+            "version": version_tag(current[0]),
+            "sessions": diff_digests(previous[1], current[1]),
+            **current[2].diff(previous[2])
+        }
@@ -0,0 +1,148 @@
+"""Time-ordered listings served in pages.
+
+A listing is sorted and serialized once per data version. Pages are
+then slices of the pre-encoded items, so paging through a large
+response never sorts or serializes the whole dataset again.
+"""
+
+import base64
+import binascii
+import json
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .responses import dumps
+
+
+# Sort key of a listing item: (epoch seconds, filename, position in the session)
+SortKey = Tuple[float, str, int]
+
+# Items without a time sort before all others
+NO_TIME = float('-inf')
+
+
+def encode_cursor(key: SortKey) -> str:
+    """Encode a sort key as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """Decode a cursor produced by ``encode_cursor``.
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        timestamp, filename, position = data
+        return float(timestamp), str(filename), int(position)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def parse_time_bound(value: Optional[str], end: bool = False) -> Optional[float]:
+    """Parse a ``since``/``until`` query value to epoch seconds.
+    
+    Accepts ISO dates and datetimes; naive values are read as UTC. A
+    date used as an end bound covers that whole day.
+    
+    Args:
+        value: Query value, or None
+        end: Whether the value is an (exclusive) end bound
+    
+    Returns:
+        Optional[float]: Epoch seconds, or None if no value was given
+    
+    Raises:
+        ValueError: If the value is not an ISO date or datetime
+    """
+    if not value:
+        return None
+    
+    text = value.strip()
+    if len(text) == 10:
+        day = date.fromisoformat(text)
+        if end:
+            day += timedelta(days=1)
+        moment = datetime.combine(day, time(), timezone.utc)
+    else:
+        moment = datetime.fromisoformat(text.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def sort_key(moment: Optional[datetime], filename: str, position: int = 0) -> SortKey:
+    """Build the sort key of a listing item."""
+    if moment is None:
+        return NO_TIME, filename, position
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp(), filename, position
+
+
+class ListingIndex:
+    """Items of a list endpoint sorted by time, each serialized once."""
+    
+    def __init__(self, entries: Iterable[Tuple[SortKey, Dict[str, Any]]]):
+        """Sort and encode the items of a listing.
+        
+        Args:
+            entries: (sort key, item) pairs in any order
+        """
+        entries = sorted(entries, key=lambda entry: entry[0])
+        self.keys: List[SortKey] = [key for key, _ in entries]
+        self.items: List[Dict[str, Any]] = [item for _, item in entries]
+        self.encoded: List[bytes] = [dumps(item) for item in self.items]
+        self.fields = frozenset(key for item in self.items for key in item)
+    
+    def __len__(self) -> int:
+        return len(self.items)
+    
+    def page(self, limit: Optional[int] = None, cursor: Optional[str] = None,
+             since: Optional[float] = None, until: Optional[float] = None,
+             fields: Optional[Sequence[str]] = None) -> Tuple[bytes, int, Optional[str]]:
+        """Get one page of the listing as a JSON array.
+        
+        Args:
+            limit: Maximum number of items, or None for all remaining items
+            cursor: Cursor returned with the previous page
+            since: Include items at or after this epoch time
+            until: Include items before this epoch time
+            fields: Keys to keep in each item, or None for all keys
+        
+        Returns:
+            Tuple[bytes, int, Optional[str]]: The encoded page, the number
+                of items matching the time filter and the cursor of the
+                next page (None on the last page)
+        
+        Raises:
+            ValueError: If the cursor is malformed or a field is unknown
+        """
+        low = bisect_left(self.keys, (since, '', -1)) if since is not None else 0
+        high = bisect_left(self.keys, (until, '', -1)) if until is not None else len(self.keys)
+        high = max(low, high)
+        total = high - low
+        
+        if cursor:
+            low = max(low, bisect_right(self.keys, decode_cursor(cursor)))
+        stop = high if limit is None else min(high, low + limit)
+        next_cursor = encode_cursor(self.keys[stop - 1]) if low < stop < high else None
+        
+        if fields:
+            unknown = [field for field in fields if field not in self.fields]
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+            body = dumps([{field: item[field] for field in fields if field in item}
+                                for item in self.items[low:stop]])
+        else:
+            body = b'[' + b','.join(self.encoded[low:stop]) + b']'
+        return body, total, next_cursor
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated ``fields`` query value."""
+    if not fields:
+        return None
+    return [field.strip() for field in fields.split(',') if field.strip()] or None
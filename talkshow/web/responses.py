@@ -0,0 +1,36 @@
+"""Fast JSON responses for plain dict and list payloads.
+
+Endpoints build their payloads from already JSON-compatible values, so
+they can skip FastAPI's response-model validation and
+``jsonable_encoder`` and be serialized in one call. ``orjson`` is used
+when it is installed, with the standard library as the fallback.
+"""
+
+import json
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Optional speedup
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a JSON-compatible value as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode('utf-8')
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response that serializes its content directly with ``dumps``.
+    
+    Returning one from an endpoint bypasses response-model validation,
+    so the content must already consist of dicts, lists, strings,
+    numbers, booleans and None.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -2,12 +2,19 @@
 
 class TalkShowApp {
     constructor() {
-        this.sessions = [];
         this.stats = {};
-        this.dailyInsights = {}; // 新的数据结构：按日期分组的问题
+        this.days = []; // 服务端按日期分组好的问题，按日期升序
+        this.totalDays = 0; // 当前筛选条件下的天数
+        this.totalQuestions = 0; // 当前筛选条件下的问题数
+        this.overall = { days: 0, questions: 0 }; // 未筛选时的总数
+        this.pageSize = 30; // 每次加载的天数
         this.selectedSession = null;
         this.currentTimeFilter = 'all';
         this.searchQuery = '';
+        this.searchTimer = null;
+        this.insightsRequest = null;
+        this.dataVersion = null; // 当前数据版本（与 ETag 相同），用于判断是否错过了更新
+        this.events = null;
         
         this.init();
     }
@@ -15,9 +22,9 @@ class TalkShowApp {
     async init() {
         try {
             await this.loadData();
-            this.processDailyInsights(); // 处理数据为按日期分组的格式
             this.renderApp();
             this.setupEventListeners();
+            this.subscribeEvents();
         } catch (error) {
             this.showError('Failed to initialize app: ' + error.message);
         }
@@ -25,26 +32,25 @@ class TalkShowApp {
     
     async loadData() {
         try {
-            // Load all data needed for daily insights in a single request
-            const [insightsResponse, statsResponse] = await Promise.all([
-                fetch('/api/sessions/insights'),  // Use optimized endpoint
-                fetch('/api/stats')
+            // Stats and the newest page of days; grouping is done on the server
+            const [statsResponse] = await Promise.all([
+                fetch('/api/stats'),
+                this.fetchDailyInsights()
             ]);
             
-            if (!insightsResponse.ok || !statsResponse.ok) {
+            if (!statsResponse.ok) {
                 throw new Error('Failed to fetch data from API');
             }
             
-            const insightsData = await insightsResponse.json();
             this.stats = await statsResponse.json();
-            
-            // Use the insights data directly - it already contains qa_pairs
-            this.sessions = insightsData;
+            if (this.currentTimeFilter === 'all' && !this.searchQuery) {
+                this.overall = { days: this.totalDays, questions: this.totalQuestions };
+            }
             
             console.log('Loaded data:', {
-                sessions: this.sessions.length,
-                stats: this.stats,
-                totalApiCalls: 2  // Only 2 API calls instead of N+1!
+                days: this.days.length,
+                totalDays: this.totalDays,
+                stats: this.stats
             });
             
         } catch (error) {
@@ -53,68 +59,134 @@ class TalkShowApp {
         }
     }
     
-    // 基于 daily_insights.py 的逻辑处理数据
-    processDailyInsights() {
-        this.dailyInsights = {};
+    // 从 /api/insights/daily 获取按日期分组的问题（与 daily_insights.py 逻辑一致）
+    // append 为 true 时加载更早的一页，否则按当前筛选条件重新加载
+    async fetchDailyInsights(append = false) {
+        const params = new URLSearchParams({
+            order: 'desc',
+            limit: this.pageSize,
+            offset: append ? this.days.length : 0
+        });
+        if (this.currentTimeFilter !== 'all') {
+            params.set('start', this.currentTimeFilter);
+        }
+        if (this.searchQuery) {
+            params.set('q', this.searchQuery);
+        }
         
-        for (const session of this.sessions) {
-            const sessionStartTime = new Date(session.created_time);
-            const dateStr = sessionStartTime.toISOString().split('T')[0]; // YYYY-MM-DD
-            
-            if (!this.dailyInsights[dateStr]) {
-                this.dailyInsights[dateStr] = [];
-            }
-            
-            // 为每个QA pair创建时间条目
-            for (const qaPair of session.qa_pairs) {
-                const question = qaPair.question?.trim();
-                if (question) {
-                    // 使用QA pair的时间戳，如果没有则使用会话开始时间
-                    const qaTime = qaPair.timestamp ? new Date(qaPair.timestamp) : sessionStartTime;
-                    
-                    // 归整时间到最近的半点或整点
-                    const roundedTime = this.roundToHalfHour(qaTime);
-                    
-                    // 使用已有的摘要，如果没有则使用原问题
-                    const qSummary = qaPair.question_summary || question;
-                    
-                    this.dailyInsights[dateStr].push({
-                        time: roundedTime,
-                        timeStr: roundedTime.toTimeString().slice(0, 5), // HH:MM
-                        original: question,
-                        summary: qSummary,
-                        sessionTheme: session.theme,
-                        sessionFilename: session.filename,
-                        markdownFilename: session.markdown_filename  // 新增字段
-                    });
-                }
-            }
+        // 只保留最新的请求，避免旧的搜索结果覆盖新的
+        if (this.insightsRequest) {
+            this.insightsRequest.abort();
         }
+        const request = new AbortController();
+        this.insightsRequest = request;
         
-        // 对每天的问题按时间排序
-        for (const dateStr in this.dailyInsights) {
-            this.dailyInsights[dateStr].sort((a, b) => a.time - b.time);
+        const response = await fetch(`/api/insights/daily?${params}`, { signal: request.signal });
+        if (!response.ok) {
+            throw new Error('Failed to fetch daily insights');
+        }
+        const data = await response.json();
+        if (this.insightsRequest !== request) {
+            return;
         }
+        this.insightsRequest = null;
+        this.dataVersion = this.parseVersion(response.headers.get('etag')) || this.dataVersion;
+        
+        // 每页按日期降序返回，显示时按升序排列
+        const page = data.days.reverse();
+        this.days = append ? [...page, ...this.days] : page;
+        this.totalDays = data.total_days;
+        this.totalQuestions = data.total_questions;
     }
     
-    // 归整时间到最近的半点或整点
-    roundToHalfHour(dt) {
-        const minutes = dt.getMinutes();
-        let roundedMinutes;
+    // 订阅 /api/events，新的问答对通过服务端推送的增量更新到页面
+    subscribeEvents() {
+        if (!window.EventSource || this.events) return;
         
-        if (minutes <= 15) {
-            // 归整到整点
-            roundedMinutes = 0;
-        } else if (minutes <= 45) {
-            // 归整到半点
-            roundedMinutes = 30;
-        } else {
-            // 归整到下一个整点
-            roundedMinutes = 0;
-            dt = new Date(dt.getTime() + 60 * 60 * 1000); // 加一小时
+        this.events = new EventSource('/api/events');
+        this.events.addEventListener('ready', (e) => {
+            // 连接（或重连）时数据已经变化，说明错过了更新，重新加载
+            const { version } = JSON.parse(e.data);
+            if (this.dataVersion && version !== this.dataVersion) {
+                this.reloadLive();
+            }
+            this.dataVersion = version;
+        });
+        this.events.addEventListener('update', (e) => this.applyUpdate(JSON.parse(e.data)));
+        this.events.addEventListener('reset', () => this.reloadLive());
+    }
+    
+    applyUpdate(delta) {
+        this.dataVersion = delta.version;
+        
+        // 有筛选条件时增量无法直接套用，按当前条件重新查询
+        if (this.currentTimeFilter !== 'all' || this.searchQuery) {
+            this.reloadLive();
+            return;
+        }
+        
+        const removed = new Set(delta.removed_days);
+        let days = this.days.filter(day => !removed.has(day.date));
+        const hasOlder = days.length < this.totalDays;
+        const oldest = days.length ? days[0].date : null;
+        
+        delta.days.forEach(changed => {
+            const index = days.findIndex(day => day.date === changed.date);
+            if (index >= 0) {
+                days[index] = changed;
+            } else if (!hasOlder || !oldest || changed.date > oldest) {
+                // 尚未加载的更早日期留给"加载更早的日期"
+                days.push(changed);
+            }
+        });
+        
+        days.sort((a, b) => a.date.localeCompare(b.date));
+        this.days = days;
+        this.totalDays = delta.total_days;
+        this.totalQuestions = delta.total_questions;
+        this.overall = { days: delta.total_days, questions: delta.total_questions };
+        
+        this.refreshLiveViews();
+    }
+    
+    async reloadLive() {
+        try {
+            await this.fetchDailyInsights();
+        } catch (error) {
+            if (error.name === 'AbortError') return;
+            console.error('Error reloading daily insights:', error);
+            return;
+        }
+        if (this.currentTimeFilter === 'all' && !this.searchQuery) {
+            this.overall = { days: this.totalDays, questions: this.totalQuestions };
+        }
+        this.refreshLiveViews();
+    }
+    
+    async refreshLiveViews() {
+        const container = document.getElementById('daily-insights');
+        if (container) {
+            container.innerHTML = this.renderDailyInsights();
+            this.setupQuestionRowEvents();
         }
         
-        return new Date(dt.getFullYear(), dt.getMonth(), dt.getDate(), dt.getHours(), roundedMinutes, 0, 0);
+        try {
+            const response = await fetch('/api/stats');
+            if (response.ok) {
+                this.stats = await response.json();
+            }
+        } catch (error) {
+            console.error('Error loading stats:', error);
+        }
+        const panel = document.querySelector('.stats-panel');
+        if (panel) {
+            panel.outerHTML = this.renderStats();
+        }
+    }
+    
+    parseVersion(etag) {
+        // W/"<version>" -> <version>
+        return etag ? etag.replace(/^W\//, '').replace(/"/g, '') : null;
     }
     
     renderApp() {
@@ -141,8 +213,8 @@ class TalkShowApp {
     }
     
     renderStats() {
-        const totalDays = Object.keys(this.dailyInsights).length;
-        const totalQuestions = Object.values(this.dailyInsights).reduce((sum, questions) => sum + questions.length, 0);
+        const totalDays = this.overall.days;
+        const totalQuestions = this.overall.questions;
         
         return `
             <div class="stats-panel">
@@ -201,12 +273,11 @@ class TalkShowApp {
     }
     
     renderDailyInsights() {
-        if (!this.dailyInsights || Object.keys(this.dailyInsights).length === 0) {
+        if (!this.days.length) {
             return '<div class="empty-state">暂无数据</div>';
         }
         
-        const sortedDates = Object.keys(this.dailyInsights).sort();
-        const totalQuestions = Object.values(this.dailyInsights).reduce((sum, questions) => sum + questions.length, 0);
+        const shownQuestions = this.days.reduce((sum, day) => sum + day.question_count, 0);
         
         let html = `
             <div class="daily-insights-header">
@@ -216,25 +287,30 @@ class TalkShowApp {
             <div class="daily-insights-container">
         `;
         
-        sortedDates.forEach(date => {
-            const questions = this.dailyInsights[date];
-            const questionCount = questions.length;
-            
+        if (this.days.length < this.totalDays) {
+            html += `
+                <div class="daily-column">
+                    <button onclick="app.loadMoreDays()">加载更早的日期</button>
+                </div>
+            `;
+        }
+        
+        this.days.forEach(day => {
             html += `
                 <div class="daily-column">
                     <div class="daily-column-header">
-                        <h4>${date}</h4>
-                        <span class="question-count">${questionCount} 个问题</span>
+                        <h4>${day.date}</h4>
+                        <span class="question-count">${day.question_count} 个问题</span>
                     </div>
                     <div class="daily-column-content">
             `;
             
-            questions.forEach(question => {
+            day.questions.forEach(question => {
                 html += `
                     <div class="daily-question">
                         <div class="question-summary">${question.summary}</div>
-                        <div class="question-time">${question.timeStr}</div>
-                        ${question.markdownFilename ? `<div class="question-theme"><a href="/view/${encodeURIComponent(question.markdownFilename)}" target="_blank" class="theme-link">${question.sessionTheme || question.markdownFilename}</a></div>` : ''}
+                        <div class="question-time">${question.time_str}</div>
+                        ${question.session_filename ? `<div class="question-theme"><a href="/view/${encodeURIComponent(question.session_filename)}" target="_blank" class="theme-link">${question.session_theme || question.session_filename}</a></div>` : ''}
                     </div>
                 `;
             });
@@ -248,45 +324,15 @@ class TalkShowApp {
         html += `
             </div>
             <div class="daily-insights-footer">
-                <small>显示 ${sortedDates.length} 天，共 ${totalQuestions} 个问题</small>
+                <small>显示 ${this.days.length} / ${this.totalDays} 天，共 ${shownQuestions} / ${this.totalQuestions} 个问题</small>
             </div>
         `;
         
         return html;
     }
     
-    getFilteredDailyInsights() {
-        let filtered = { ...this.dailyInsights };
-        
-        // Apply date filter
-        if (this.currentTimeFilter !== 'all') {
-            const filterDate = this.currentTimeFilter;
-            filtered = Object.fromEntries(
-                Object.entries(filtered).filter(([date]) => date >= filterDate)
-            );
-        }
-        
-        // Apply search filter
-        if (this.searchQuery) {
-            const query = this.searchQuery.toLowerCase();
-            filtered = Object.fromEntries(
-                Object.entries(filtered).map(([date, questions]) => [
-                    date,
-                    questions.filter(q => 
-                        q.summary.toLowerCase().includes(query) ||
-                        q.original.toLowerCase().includes(query) ||
-                        q.sessionTheme.toLowerCase().includes(query)
-                    )
-                ]).filter(([date, questions]) => questions.length > 0)
-            );
-        }
-        
-        return filtered;
-    }
-    
     getDateFilterOptions() {
-        const dates = Object.keys(this.dailyInsights).sort();
-        if (!dates.length) return [];
+        if (!this.overall.days) return [];
         
         const options = [];
         const now = new Date();
@@ -321,8 +367,10 @@ class TalkShowApp {
         const searchInput = document.getElementById('searchInput');
         if (searchInput) {
             searchInput.addEventListener('input', (e) => {
-                this.searchQuery = e.target.value.toLowerCase();
-                this.updateDailyInsights();
+                this.searchQuery = e.target.value.trim();
+                // 输入停顿后再请求服务端筛选
+                clearTimeout(this.searchTimer);
+                this.searchTimer = setTimeout(() => this.updateDailyInsights(), 250);
             });
         }
         
@@ -342,19 +390,32 @@ class TalkShowApp {
         });
     }
     
-    updateDailyInsights() {
-        const container = document.querySelector('.daily-insights-container');
+    async updateDailyInsights(append = false) {
+        try {
+            await this.fetchDailyInsights(append);
+        } catch (error) {
+            if (error.name === 'AbortError') return;
+            console.error('Error loading daily insights:', error);
+            return;
+        }
+        
+        const container = document.getElementById('daily-insights');
         if (container) {
-            container.outerHTML = this.renderDailyInsights();
+            container.innerHTML = this.renderDailyInsights();
             this.setupQuestionRowEvents();
         }
     }
     
+    loadMoreDays() {
+        this.updateDailyInsights(true);
+    }
+    
     async refreshData() {
         try {
             this.showLoading();
+            this.currentTimeFilter = 'all';
+            this.searchQuery = '';
             await this.loadData();
-            this.processDailyInsights();
             this.renderApp();
             this.setupEventListeners();
         } catch (error) {
@@ -363,8 +424,9 @@ class TalkShowApp {
     }
     
     exportData() {
+        const dailyInsights = Object.fromEntries(this.days.map(day => [day.date, day.questions]));
         const data = {
-            daily_insights: this.dailyInsights,
+            daily_insights: dailyInsights,
             stats: this.stats,
             exported_at: new Date().toISOString()
         };
@@ -0,0 +1,46 @@
+"""Shared test helpers."""
+
+from datetime import datetime, timedelta, timezone
+
+from talkshow.models.chat import ChatSession, QAPair, SessionMeta
+
+
+START = datetime(2025, 7, 28, 15, 16, 0, tzinfo=timezone.utc)
+
+
+def make_session(filename, questions=None, start=START, minutes=None, summaries=(), answer_summaries=()):
+    """Create a session with one QA pair per question.
+    
+    Args:
+        filename: Session file name; the theme is the name without ``.md``
+        questions: Question texts or (question, answer) tuples, by default
+            "<filename> q<i>" for each entry of ``minutes``, else one
+        start: Creation time of the session
+        minutes: Minutes after ``start`` of each QA pair, None for a pair
+            without timestamp; by default the i-th pair is i minutes later
+        summaries: Indices of the QA pairs that have a question summary
+        answer_summaries: Indices of the QA pairs that have an answer summary
+    
+    Returns:
+        ChatSession: The session
+    """
+    if questions is None:
+        questions = [f"{filename} q{i}" for i in range(len(minutes) if minutes is not None else 1)]
+    if minutes is None:
+        minutes = range(len(questions))
+    
+    qa_pairs = []
+    for i, (question, m) in enumerate(zip(questions, minutes)):
+        # A newline and CJK text in the answer exercise every record encoding
+        question, answer = question if isinstance(question, tuple) else (question, "Hi there!\n第二行")
+        qa_pairs.append(QAPair(
+            question=question,
+            answer=answer,
+            timestamp=start + timedelta(minutes=m) if m is not None else None,
+            question_summary="summary" if i in summaries else None,
+            answer_summary="summary" if i in answer_summaries else None
+        ))
+    
+    meta = SessionMeta(filename=filename, theme=filename[:-3], ctime=start,
+                       file_size=1000, qa_count=len(qa_pairs))
+    return ChatSession(meta=meta, qa_pairs=qa_pairs)
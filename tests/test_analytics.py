@@ -0,0 +1,173 @@
+"""Tests for the columnar QA table and daily insights."""
+
+import json
+from datetime import date, datetime, timedelta, timezone
+
+from talkshow.analytics.insights import DailyInsights, group_questions_by_date_and_time, round_to_half_hour
+from talkshow.analytics.qa_table import QATable, HAS_QUESTION
+from talkshow.models.chat import LazyChatSession, SessionDigest
+
+from .conftest import make_session
+
+
+class TestQATable:
+    """Test QATable aggregates and grouping."""
+    
+    def _sessions(self):
+        day = datetime(2025, 7, 28, 23, 10, 5, tzinfo=timezone.utc)
+        return [
+            make_session("late.md", start=day, minutes=[0, 6, 36, 49, None], summaries=(1,)),
+            make_session("early.md", start=day - timedelta(hours=20), minutes=[0, 15, 16, 45, 46]),
+            make_session("next.md", start=day + timedelta(hours=2), minutes=[0])
+        ]
+    
+    def test_half_hour_buckets_match_reference(self):
+        """Test that buckets equal the rounding of the daily insights script."""
+        sessions = self._sessions()
+        table = QATable.from_sessions(sessions)
+        
+        row = 0
+        for session in sessions:
+            for qa in session.qa_pairs:
+                assert table.bucket_time(row) == round_to_half_hour(qa.timestamp or session.start_time)
+                row += 1
+    
+    def test_day_rows_grouped_by_session_start(self):
+        """Test that rows are grouped by the start day of their session and ordered by bucket."""
+        table = QATable.from_sessions(self._sessions())
+        
+        days = list(table.iter_day_rows())
+        assert [day.isoformat() for day, _ in days] == ["2025-07-28", "2025-07-29"]
+        
+        # The late session's QA pairs after midnight stay on its start day
+        first_day = [table.questions[row] for row in days[0][1]]
+        assert first_day == ["early.md q0", "early.md q1", "early.md q2", "early.md q3", "early.md q4",
+                             "late.md q0", "late.md q4", "late.md q1", "late.md q2", "late.md q3"]
+        assert len(days[1][1]) == 1
+        assert all(table.flags[row] & HAS_QUESTION for row in days[0][1])
+    
+    def test_stats_match_session_digests(self):
+        """Test that the column aggregates equal the statistics summed over session digests."""
+        shanghai = timezone(timedelta(hours=8))
+        sessions = self._sessions() + [
+            make_session("cn.md", start=datetime(2025, 7, 29, 9, 10, tzinfo=shanghai), minutes=[0, 30],
+                         answer_summaries=(1,))
+        ]
+        digests = [SessionDigest.from_session(session) for session in sessions]
+        moments = [moment for digest in digests
+                   for moment in (digest.meta.ctime, digest.min_timestamp, digest.max_timestamp) if moment]
+        
+        total_qa_pairs = sum(digest.qa_count for digest in digests)
+        assert QATable.from_sessions(sessions).stats() == {
+            "total_sessions": len(digests),
+            "total_qa_pairs": total_qa_pairs,
+            "question_summaries": sum(digest.question_summaries for digest in digests),
+            "answer_summaries": sum(digest.answer_summaries for digest in digests),
+            "average_qa_per_session": round(total_qa_pairs / len(digests), 1),
+            "date_range": {"start": min(moments).isoformat(), "end": max(moments).isoformat()}
+        }
+        # The latest time is a QA pair recorded in UTC+8
+        assert QATable.from_sessions(sessions).stats()["date_range"]["end"] == "2025-07-29T09:40:00+08:00"
+    
+    def test_times_keep_their_time_zone(self):
+        """Test that creation and QA times come back as they were recorded, naive ones included."""
+        shanghai = timezone(timedelta(hours=8))
+        sessions = [
+            make_session("cn.md", start=datetime(2025, 7, 29, 9, 10, 5, 431711, tzinfo=shanghai), minutes=[0, None]),
+            make_session("naive.md", start=datetime(2025, 7, 29, 0, 20), minutes=[3])
+        ]
+        table = QATable.from_sessions(sessions)
+        
+        for index, session in enumerate(sessions):
+            assert table.session_time(index).isoformat() == session.meta.ctime.isoformat()
+            for row, qa in zip(table.session_rows(index), session.qa_pairs):
+                assert table.qa_time(row).isoformat() == (qa.timestamp or session.start_time).isoformat()
+    
+    def test_lazy_sessions_are_not_decoded(self):
+        """Test that building the table reads lazy sessions without building QA pairs."""
+        session = self._sessions()[0]
+        lazy = LazyChatSession(session.meta, json.dumps(session.to_dict()))
+        
+        table = QATable.from_sessions([lazy], utc_offset=480)
+        assert not lazy.is_loaded
+        assert len(table) == 5
+        assert next(table.iter_day_rows())[0].isoformat() == "2025-07-29"
+        assert table.bucket_time(0).isoformat() == "2025-07-29T07:00:00+08:00"
+        
+        questions = group_questions_by_date_and_time(table)["2025-07-29"]
+        assert not lazy.is_loaded
+        assert [q['summary'] for q in questions] == ["late.md q0", "late.md q4", "summary", "late.md q2", "late.md q3"]
+    
+    def test_wall_clock_of_each_timestamp(self):
+        """Test that days and buckets follow the offset of each timestamp, naive ones included."""
+        shanghai = timezone(timedelta(hours=8))
+        sessions = [
+            make_session("cn.md", start=datetime(2025, 7, 29, 9, 10, tzinfo=shanghai), minutes=[0]),
+            make_session("utc.md", start=datetime(2025, 7, 29, 8, 50, tzinfo=timezone.utc), minutes=[0]),
+            make_session("naive.md", start=datetime(2025, 7, 29, 0, 20), minutes=[0])
+        ]
+        table = QATable.from_sessions(sessions)
+        
+        assert [table.bucket_time(row) for row in range(3)] == [
+            round_to_half_hour(session.start_time) for session in sessions
+        ]
+        # One day, ordered by the instant of the rounded time
+        (day, rows), = table.iter_day_rows()
+        assert day.isoformat() == "2025-07-29"
+        assert list(rows) == [2, 0, 1]
+
+
+
+class TestDailyInsights:
+    """Test grouping, filtering and pagination of daily insights."""
+    
+    def _sessions(self):
+        start = datetime(2025, 7, 1, 9, 20, tzinfo=timezone.utc)
+        return [
+            make_session(f"day{i}.md", start=start + timedelta(days=i), minutes=[0, 40, 70], summaries=(0,))
+            for i in range(5)
+        ]
+    
+    def test_grouping(self):
+        """Test that questions are grouped per day in half-hour order."""
+        daily = group_questions_by_date_and_time(self._sessions())
+        
+        assert list(daily) == [f"2025-07-0{i}" for i in range(1, 6)]
+        first = daily["2025-07-01"]
+        assert [q['time_str'] for q in first] == ["09:30", "10:00", "10:30"]
+        assert [q['summary'] for q in first] == ["summary", "day0.md q1", "day0.md q2"]
+        assert first[0]['session_filename'] == "day0.md"
+    
+    def test_query_pages_and_filters(self):
+        """Test date range, search and day-level pagination."""
+        insights = DailyInsights.from_table(QATable.from_sessions(self._sessions()))
+        
+        page = insights.query(limit=2, offset=1, descending=True)
+        assert page["total_days"] == 5
+        assert page["total_questions"] == 15
+        assert [day["date"] for day in page["days"]] == ["2025-07-04", "2025-07-03"]
+        
+        page = insights.query(start=date(2025, 7, 2), end=date(2025, 7, 3))
+        assert [day["date"] for day in page["days"]] == ["2025-07-02", "2025-07-03"]
+        
+        page = insights.query(search="DAY3.MD Q2")
+        assert page["total_days"] == 1
+        assert page["days"][0]["questions"][0]["original"] == "day3.md q2"
+        assert insights.query(search="missing")["days"] == []
+    
+    def test_diff_against_previous_version(self):
+        """Test that only added or changed days are reported, plus removed dates."""
+        sessions = self._sessions()
+        previous = DailyInsights.from_table(QATable.from_sessions(sessions))
+        
+        sessions[1].qa_pairs[0].question_summary = "changed"
+        current = DailyInsights.from_table(QATable.from_sessions(sessions[1:] + [
+            make_session("day9.md", start=datetime(2025, 7, 9, 9, 0, tzinfo=timezone.utc), minutes=[0])
+        ]))
+        delta = current.diff(previous)
+        
+        assert [day["date"] for day in delta["days"]] == ["2025-07-02", "2025-07-09"]
+        assert delta["days"][0]["questions"][0]["summary"] == "changed"
+        assert delta["removed_days"] == ["2025-07-01"]
+        assert (delta["total_days"], delta["total_questions"]) == (5, 13)
+        assert [day["date"] for day in current.diff(None)["days"]] == current.dates
@@ -0,0 +1,230 @@
+"""
+Tests for the concurrent LLM summarizer against a local OpenAI-compatible stub.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import pytest
+
+from talkshow.config.manager import ConfigManager
+from talkshow.models.chat import QAPair
+from talkshow.summarizer.async_summarizer import AsyncLLMSummarizer, TokenBucket, BATCH_PROMPT
+
+
+class StubCompletionServer(ThreadingHTTPServer):
+    """Minimal OpenAI-compatible chat completions endpoint."""
+    
+    daemon_threads = True
+    
+    def __init__(self, fail_first: int = 0, delay: float = 0.05, batch_reply: str = 'all'):
+        super().__init__(('127.0.0.1', 0), StubHandler)
+        self.fail_first = fail_first
+        self.delay = delay
+        self.batch_reply = batch_reply
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.batch_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    @property
+    def api_base(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    
+    def log_message(self, format, *args):
+        pass
+    
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        
+        with server.lock:
+            server.requests += 1
+            throttled = server.requests <= server.fail_first
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.delay)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+        
+        if throttled:
+            self._send(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_error"}})
+            return
+        
+        prompt = body["messages"][0]["content"]
+        content = f"摘要{len(prompt)}"
+        if prompt.startswith(BATCH_PROMPT):
+            with server.lock:
+                server.batch_requests += 1
+            items = json.loads(prompt[len(BATCH_PROMPT):])
+            if server.batch_reply == 'garbage':
+                content = "抱歉，我无法完成。"
+            else:
+                # 'partial' answers only every other item
+                replies = [{"id": item["id"], "summary": f"批量摘要{item['id']}"} for item in items
+                           if server.batch_reply == 'all' or item["id"] % 2 == 0]
+                content = "```json\n" + json.dumps(replies, ensure_ascii=False) + "\n```"
+        
+        self._send(200, {
+            "id": "chatcmpl-stub",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15}
+        })
+    
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class TestAsyncLLMSummarizer:
+    """Test AsyncLLMSummarizer against the stub server."""
+    
+    @pytest.fixture
+    def server(self, request):
+        server = StubCompletionServer(**getattr(request, 'param', {}))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield server
+        server.shutdown()
+        server.server_close()
+    
+    def _summarizer(self, server, **llm_config):
+        config = {
+            'model': 'openai/stub-model',
+            'api_base': server.api_base,
+            'api_key': 'test-key',
+            'max_tokens': 50,
+            'temperature': 0.3,
+            'retry_base_delay': 0.01,
+            'retry_max_delay': 0.05,
+            **llm_config
+        }
+        config_manager = MagicMock(spec=ConfigManager)
+        config_manager.get.side_effect = lambda key, default=None: config if key == "summarizer.llm" else default
+        return AsyncLLMSummarizer(config_manager=config_manager)
+    
+    def _qa_pairs(self, count):
+        return [
+            QAPair(question=f"第{i}个问题：" + "如何实现一个复杂的功能" * 3,
+                   answer=f"第{i}个回答：" + "这里有很多实现细节需要说明" * 10)
+            for i in range(count)
+        ]
+    
+    def test_concurrency_is_bounded(self, server):
+        """Test that all pairs are summarized with at most `concurrency` requests in flight."""
+        summarizer = self._summarizer(server, concurrency=3)
+        qa_pairs = self._qa_pairs(6)
+        
+        assert summarizer.summarize_all(qa_pairs) == 6
+        assert server.requests == 12
+        assert server.max_in_flight == 3
+        assert all(qa.question_summary.startswith("摘要") for qa in qa_pairs)
+        assert all(qa.answer_summary.startswith("摘要") for qa in qa_pairs)
+    
+    @pytest.mark.parametrize('server', [{'fail_first': 2}], indirect=True)
+    def test_rate_limited_requests_are_retried(self, server):
+        """Test that 429 responses are retried with backoff."""
+        summarizer = self._summarizer(server, concurrency=1)
+        qa_pairs = self._qa_pairs(1)
+        
+        assert summarizer.summarize_all(qa_pairs) == 1
+        assert server.requests == 4
+        assert qa_pairs[0].answer_summary.startswith("摘要")
+    
+    @pytest.mark.parametrize('server', [{'fail_first': 100}], indirect=True)
+    def test_gives_up_after_max_retries(self, server):
+        """Test that a pair fails once retries are exhausted."""
+        summarizer = self._summarizer(server, concurrency=1, max_retries=1)
+        qa_pairs = [QAPair(question="短问题", answer="这是一个超过八十个字符的回答。" * 10)]
+        
+        assert summarizer.summarize_all(qa_pairs) == 0
+        assert server.requests == 2
+        assert qa_pairs[0].question_summary == "短问题"
+        assert qa_pairs[0].answer_summary is None
+    
+    def test_batched_requests(self, server):
+        """Test that many texts are summarized in one request."""
+        summarizer = self._summarizer(server, batch_size=20)
+        qa_pairs = self._qa_pairs(6)
+        
+        assert summarizer.summarize_all(qa_pairs) == 6
+        assert server.requests == 1
+        assert all(qa.question_summary.startswith("批量摘要") for qa in qa_pairs)
+        assert all(qa.answer_summary.startswith("批量摘要") for qa in qa_pairs)
+    
+    def test_batches_respect_size_and_token_budget(self, server):
+        """Test that batches are split by item count and prompt token budget."""
+        summarizer = self._summarizer(server, batch_size=4)
+        assert summarizer.summarize_all(self._qa_pairs(6)) == 6
+        assert server.batch_requests == 3
+        
+        summarizer = self._summarizer(server, batch_size=20, batch_token_budget=200)
+        assert summarizer.summarize_all(self._qa_pairs(6)) == 6
+        assert server.batch_requests > 4
+    
+    @pytest.mark.parametrize('server', [{'batch_reply': 'partial'}], indirect=True)
+    def test_partial_batch_falls_back_per_item(self, server):
+        """Test that items missing from a batch response are summarized one by one."""
+        summarizer = self._summarizer(server, batch_size=20)
+        qa_pairs = self._qa_pairs(3)
+        
+        assert summarizer.summarize_all(qa_pairs) == 3
+        assert server.requests == 1 + 3
+        summaries = [s for qa in qa_pairs for s in (qa.question_summary, qa.answer_summary)]
+        assert sum(s.startswith("批量摘要") for s in summaries) == 3
+    
+    @pytest.mark.parametrize('server', [{'batch_reply': 'garbage'}], indirect=True)
+    def test_malformed_batch_falls_back_per_item(self, server):
+        """Test that an unparseable batch response falls back to per-item requests."""
+        summarizer = self._summarizer(server, batch_size=20)
+        qa_pairs = self._qa_pairs(2)
+        
+        assert summarizer.summarize_all(qa_pairs) == 2
+        assert server.requests == 1 + 4
+        assert all(qa.answer_summary.startswith("摘要") for qa in qa_pairs)
+
+
+class TestTokenBucket:
+    """Test the token bucket rate limiter."""
+    
+    def test_waits_for_refill(self):
+        """Test that acquiring beyond capacity waits for the refill rate."""
+        async def run():
+            bucket = TokenBucket(per_minute=600, capacity=2)  # 10 tokens per second
+            start = time.monotonic()
+            for _ in range(4):
+                await bucket.acquire(1)
+            return time.monotonic() - start
+        
+        elapsed = asyncio.run(run())
+        assert 0.15 <= elapsed < 1.0
+    
+    def test_oversized_request_is_capped(self):
+        """Test that a request larger than the capacity does not wait forever."""
+        async def run():
+            bucket = TokenBucket(per_minute=60000, capacity=10)
+            await bucket.acquire(1000)
+            return bucket.tokens
+        
+        assert asyncio.run(run()) == 0
@@ -0,0 +1,73 @@
+"""Tests for the synthetic corpus and the throughput benchmarks."""
+
+import pytest
+
+from talkshow.benchmarks.corpus import generate_corpus
+from talkshow.benchmarks.throughput import API_PATHS, BENCHMARKS, run_benchmarks
+from talkshow.cli.main import BENCHMARK_NAMES
+from talkshow.parser.md_parser import MDParser
+from talkshow.parser.stream_parser import StreamingMDParser
+
+
+class TestSyntheticCorpus:
+    """Test the SpecStory corpus generator."""
+    
+    def test_deterministic(self, tmp_path):
+        """Test that the same arguments give byte-identical files and the seed changes them."""
+        first = generate_corpus(tmp_path / "a", files=3, turns=4, seed=7)
+        second = generate_corpus(tmp_path / "b", files=3, turns=4, seed=7)
+        other = generate_corpus(tmp_path / "c", files=3, turns=4, seed=8)
+        
+        assert [path.name for path in first] == [path.name for path in second]
+        assert [path.read_bytes() for path in first] == [path.read_bytes() for path in second]
+        assert [path.read_bytes() for path in first] != [path.read_bytes() for path in other]
+    
+    def test_parses_into_requested_turns(self, tmp_path):
+        """Test that both parsers read every turn and agree on the result."""
+        paths = generate_corpus(tmp_path, files=2, turns=5, answer_chars=400, code_ratio=0.5, cjk_ratio=1.0)
+        
+        for path in paths:
+            session = MDParser().parse_file(str(path))
+            assert len(session.qa_pairs) == 5
+            assert session.to_dict() == StreamingMDParser().parse_file(str(path)).to_dict()
+        assert "```python" in paths[0].read_text(encoding='utf-8')
+    
+    def test_cjk_ratio(self, tmp_path):
+        """Test that a zero CJK ratio produces ASCII-only content."""
+        path = generate_corpus(tmp_path, files=1, turns=3, cjk_ratio=0.0)[0]
+        assert path.read_text(encoding='utf-8').isascii()
+
+
+class TestThroughputBenchmarks:
+    """Test the benchmark runner."""
+    
+    def test_report(self):
+        """Test that selected benchmarks report throughput and peak memory."""
+        report = run_benchmarks(["parse_file", "storage_load"], files=2, turns=3, repeat=1)
+        
+        assert report["corpus"]["files"] == 2
+        assert report["corpus"]["bytes"] > 0
+        assert list(report["benchmarks"]) == ["parse_file", "storage_load"]
+        for result in report["benchmarks"].values():
+            assert result["mb_per_s"] > 0
+            assert result["qa_per_s"] > 0
+            assert result["peak_rss_mb"] >= result["baseline_rss_mb"]
+    
+    def test_api_report(self):
+        """Test that every endpoint answers and is timed with and without the response cache."""
+        endpoints = run_benchmarks(["api"], files=2, turns=3, repeat=1)["benchmarks"]["api"]["endpoints"]
+        
+        assert list(endpoints) == list(API_PATHS)
+        for result in endpoints.values():
+            assert result["bytes"] > 0
+            assert result["cached_requests_per_s"] > 0
+            assert result["uncached_requests_per_s"] > 0
+    
+    def test_cli_names_match(self):
+        """Test that the names offered by talkshow bench are the benchmarks that exist."""
+        assert BENCHMARK_NAMES == BENCHMARKS
+    
+    def test_unknown_benchmark(self):
+        """Test that an unknown benchmark name is rejected."""
+        with pytest.raises(ValueError, match="nope"):
+            run_benchmarks(["nope"])
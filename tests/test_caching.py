@@ -0,0 +1,111 @@
+"""Tests for conditional GET and response caching."""
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from talkshow.web.caching import ConditionalGetMiddleware
+
+
+def make_client(async_version=False):
+    state = {"version": 1, "calls": 0}
+    app = FastAPI()
+    
+    @app.get("/api/items")
+    async def items(page: int = 0):
+        state["calls"] += 1
+        return {"version": state["version"], "page": page}
+    
+    @app.get("/api/items/{name}")
+    async def item(name: str):
+        state["calls"] += 1
+        if name != "known":
+            raise HTTPException(status_code=404)
+        return {"version": state["version"], "name": name}
+    
+    @app.get("/other")
+    async def other():
+        state["calls"] += 1
+        return {}
+    
+    async def get_version_async():
+        return state["version"]
+    
+    get_version = get_version_async if async_version else lambda: state["version"]
+    app.add_middleware(ConditionalGetMiddleware, get_version=get_version, paths=("/api/",))
+    return TestClient(app), state
+
+
+class TestConditionalGetMiddleware:
+    """Test ETag revalidation and per-version response caching."""
+    
+    def test_not_modified_until_version_changes(self):
+        """Test that a matching If-None-Match gets a 304 without running the endpoint."""
+        client, state = make_client()
+        
+        response = client.get("/api/items")
+        etag = response.headers["etag"]
+        assert response.status_code == 200
+        assert "last-modified" not in response.headers
+        
+        response = client.get("/api/items", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b''
+        assert state["calls"] == 1
+        
+        state["version"] = 2
+        response = client.get("/api/items", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["version"] == 2
+        assert response.headers["etag"] != etag
+    
+    def test_responses_cached_per_query(self):
+        """Test that bodies are memoized per path and query and dropped on a new version."""
+        client, state = make_client()
+        
+        assert client.get("/api/items?page=1").json()["page"] == 1
+        assert client.get("/api/items?page=1").json()["page"] == 1
+        assert client.get("/api/items?page=2").json()["page"] == 2
+        assert state["calls"] == 2
+        
+        state["version"] = 2
+        assert client.get("/api/items?page=1").json()["version"] == 2
+        assert state["calls"] == 3
+    
+    def test_not_modified_only_for_successful_paths(self):
+        """Test that a version ETag is not honoured for a path that does not return 200."""
+        client, state = make_client()
+        etag = client.get("/api/items").headers["etag"]
+        
+        assert client.get("/api/items/missing", headers={"If-None-Match": etag}).status_code == 404
+        
+        # Not cached yet: the handler runs once, then the match is answered from the cache
+        assert client.get("/api/items/known", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/api/items/known", headers={"If-None-Match": etag}).status_code == 304
+        assert state["calls"] == 3
+    
+    def test_if_modified_since_ignored(self):
+        """Test that If-Modified-Since alone never produces a 304."""
+        client, _ = make_client()
+        client.get("/api/items")
+        response = client.get("/api/items", headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"})
+        assert response.status_code == 200
+    
+    def test_other_paths_untouched(self):
+        """Test that paths outside the prefixes are neither tagged nor cached."""
+        client, state = make_client()
+        
+        assert "etag" not in client.get("/other").headers
+        client.get("/other")
+        assert state["calls"] == 2
+    
+    def test_async_version_lookup(self):
+        """Test that a coroutine function returning the version is awaited."""
+        client, state = make_client(async_version=True)
+        
+        etag = client.get("/api/items").headers["etag"]
+        assert client.get("/api/items", headers={"If-None-Match": etag}).status_code == 304
+        
+        state["version"] = 2
+        response = client.get("/api/items", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["version"] == 2
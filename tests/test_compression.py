@@ -0,0 +1,71 @@
+"""Tests for response compression and fast JSON responses."""
+
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from talkshow.web.compression import CompressionMiddleware, choose_encoding
+from talkshow.web.responses import FastJSONResponse, dumps
+
+
+def make_client():
+    app = FastAPI()
+    
+    @app.get("/big")
+    async def big():
+        return FastJSONResponse([{"question": "如何重构存储层？", "index": i} for i in range(500)])
+    
+    @app.get("/small")
+    async def small():
+        return FastJSONResponse({"ok": True})
+    
+    @app.get("/events")
+    async def events():
+        return StreamingResponse(iter([b"data: 1\n\n" * 500]), media_type="text/event-stream")
+    
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return TestClient(app)
+
+
+class TestCompression:
+    """Test content negotiation and the size threshold."""
+    
+    def test_choose_encoding(self):
+        """Test that gzip is chosen when accepted and q=0 excludes an encoding."""
+        assert choose_encoding("gzip, deflate") == "gzip"
+        assert choose_encoding("gzip;q=0, deflate") is None
+        assert choose_encoding("identity") is None
+        assert choose_encoding(None) is None
+    
+    def test_large_json_is_compressed(self):
+        """Test that bodies above the threshold are gzip-encoded with a correct length."""
+        client = make_client()
+        response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+        
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json()[499] == {"question": "如何重构存储层？", "index": 499}
+    
+    def test_small_and_streaming_responses_pass_through(self):
+        """Test that small bodies and event streams are not compressed."""
+        client = make_client()
+        
+        assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+        response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text.startswith("data: 1")
+        assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+
+class TestFastJSON:
+    """Test the fast JSON encoder."""
+    
+    def test_dumps_matches_json(self):
+        """Test that dumps produces compact UTF-8 JSON equal to the stdlib encoding."""
+        value = {"theme": "存储", "items": [1, 2.5, None, True], "nested": {"a": "b"}}
+        assert json.loads(dumps(value)) == value
+        assert "存储".encode('utf-8') in dumps(value)
+        assert b" " not in dumps(value)
@@ -0,0 +1,82 @@
+"""Tests for the server-sent change events."""
+
+import asyncio
+import json
+
+from talkshow.models.chat import SessionDigest
+from talkshow.storage.async_repository import AsyncSessionRepository
+from talkshow.storage.json_storage import JSONStorage
+from talkshow.storage.repository import SessionRepository
+from talkshow.web.caching import version_tag
+from talkshow.web.events import EventBroker, diff_digests, format_event
+
+from .conftest import make_session
+
+
+def parse_event(message):
+    fields = dict(line.split(": ", 1) for line in message.decode('utf-8').strip().split("\n"))
+    return fields.get("id"), fields["event"], json.loads(fields["data"])
+
+
+def test_format_event():
+    """Test the wire format of an event."""
+    assert format_event("update", {"a": 1}, "v1") == b'id: v1\nevent: update\ndata: {"a":1}\n\n'
+    assert format_event("reset", [], None) == b'event: reset\ndata: []\n\n'
+
+
+def test_diff_digests():
+    """Test that sessions are classified as added, updated or removed."""
+    previous = [SessionDigest.from_session(make_session(name, ["q"])) for name in ("a.md", "b.md", "c.md")]
+    current = [
+        SessionDigest.from_session(make_session("a.md", ["q"])),
+        SessionDigest.from_session(make_session("b.md", ["q", "another"])),
+        SessionDigest.from_session(make_session("d.md", ["q"]))
+    ]
+    
+    delta = diff_digests(previous, current)
+    assert delta["added"] == [{"filename": "d.md", "theme": "d", "qa_count": 1}]
+    assert delta["updated"] == [{"filename": "b.md", "theme": "b", "qa_count": 2, "previous_qa_count": 1}]
+    assert delta["removed"] == ["c.md"]
+
+
+def test_broker_streams_updates(tmp_path):
+    """Test that a subscriber gets a ready event and then one delta per data change."""
+    storage = JSONStorage(str(tmp_path / "sessions.json"))
+    storage.save_session(make_session("a.md", ["first"]))
+    data = AsyncSessionRepository(SessionRepository(storage))
+    broker = EventBroker(data, poll_interval=0.01)
+    
+    async def run():
+        stream = broker.stream()
+        ready = parse_event((await stream.__anext__()).split(b"\n\n", 1)[1])
+        assert broker.subscriber_count == 1
+        
+        storage.save_session(make_session("b.md", ["second"]))
+        update = parse_event(await asyncio.wait_for(stream.__anext__(), 5))
+        await stream.aclose()
+        return ready, update
+    
+    (ready_id, ready_event, ready_data), (update_id, update_event, delta) = asyncio.run(run())
+    data.close()
+    
+    assert ready_event == "ready" and ready_id == ready_data["version"]
+    assert update_event == "update"
+    assert update_id == delta["version"] == version_tag(storage.get_data_version())
+    assert [item["filename"] for item in delta["sessions"]["added"]] == ["b.md"]
+    assert delta["sessions"]["removed"] == []
+    assert [q["original"] for q in delta["days"][0]["questions"]] == ["first", "second"]
+    assert delta["total_questions"] == 2
+    assert broker.subscriber_count == 0
+
+
+def test_slow_subscriber_is_reset():
+    """Test that an overflowing queue is replaced by a single reset event."""
+    broker = EventBroker(data=None, queue_size=2)
+    queue = asyncio.Queue(2)
+    broker._subscribers.add(queue)
+    
+    for i in range(3):
+        broker.publish("update", {"i": i}, f"v{i}")
+    
+    assert queue.qsize() == 1
+    assert parse_event(queue.get_nowait())[:2] == ("v2", "reset")
@@ -0,0 +1,44 @@
+"""Tests for the chat data models."""
+
+import pickle
+from datetime import datetime, timezone
+
+import pytest
+
+from talkshow.benchmarks.memory import measure_footprint
+from talkshow.models.chat import ChatSession, QAPair, SessionMeta
+
+
+class TestSlottedModels:
+    """Test the memory-compact QAPair and SessionMeta."""
+    
+    def test_no_instance_dict(self):
+        """Test that instances keep fields in slots with the dataclass API intact."""
+        qa = QAPair(question="Hello", answer="Hi there!")
+        assert not hasattr(qa, '__dict__')
+        with pytest.raises(AttributeError):
+            qa.extra = 1
+        
+        qa.question_summary = "greeting"
+        assert qa == QAPair("Hello", "Hi there!", None, "greeting")
+        assert repr(qa).startswith("QAPair(question='Hello'")
+        assert pickle.loads(pickle.dumps(qa)) == qa
+    
+    def test_names_are_interned(self):
+        """Test that equal themes and filenames decoded separately share one string."""
+        ctime = datetime(2025, 7, 28, 15, 16, tzinfo=timezone.utc)
+        session = ChatSession(SessionMeta("a.md", "talkshow-theme", ctime, 1000, 1),
+                              [QAPair("Hello", "Hi there!", ctime)])
+        first = ChatSession.from_dict(session.to_dict())
+        second = ChatSession.from_dict(session.to_dict())
+        
+        assert first.meta.theme is second.meta.theme
+        assert first.meta.filename is second.meta.filename
+    
+    def test_footprint_benchmark(self):
+        """Test that the memory benchmark reports smaller slotted instances."""
+        results = measure_footprint(count=2000)
+        
+        assert set(results) == {"QAPair", "SessionMeta"}
+        for figures in results.values():
+            assert figures["slots"] < figures["dict"]
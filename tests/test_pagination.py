@@ -0,0 +1,68 @@
+"""Tests for paginated, time-ordered listings."""
+
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from talkshow.web.pagination import ListingIndex, parse_time_bound, sort_key
+
+
+def make_listing(count=10):
+    start = datetime(2025, 7, 28, 22, 0, tzinfo=timezone.utc)
+    entries = [
+        (sort_key(start + timedelta(hours=i), f"s{i}.md"), {"filename": f"s{i}.md", "index": i, "theme": "t"})
+        for i in range(count)
+    ]
+    entries.append((sort_key(None, "untimed.md"), {"filename": "untimed.md", "index": -1, "theme": "t"}))
+    # Entries are sorted by the index, not by the caller
+    return ListingIndex(reversed(entries))
+
+
+class TestListingIndex:
+    """Test cursor pages, time filters and field projection."""
+    
+    def test_cursor_pages_cover_listing(self):
+        """Test that following cursors returns every item once, in time order."""
+        listing = make_listing()
+        
+        items, cursor, pages = [], None, 0
+        while True:
+            body, total, cursor = listing.page(limit=4, cursor=cursor)
+            items.extend(json.loads(body))
+            pages += 1
+            if cursor is None:
+                break
+        
+        assert pages == 3
+        assert total == 11
+        assert [item["index"] for item in items] == list(range(-1, 10))
+        assert json.loads(listing.page()[0]) == items
+    
+    def test_since_until(self):
+        """Test that a date as end bound covers the whole day and untimed items are excluded."""
+        listing = make_listing()
+        
+        body, total, cursor = listing.page(since=parse_time_bound("2025-07-29"),
+                                           until=parse_time_bound("2025-07-29", end=True))
+        assert total == 8
+        assert cursor is None
+        assert [item["index"] for item in json.loads(body)] == list(range(2, 10))
+        
+        body, total, _ = listing.page(until=parse_time_bound("2025-07-28T23:30:00+00:00", end=True))
+        assert [item["index"] for item in json.loads(body)] == [-1, 0, 1]
+    
+    def test_fields_projection(self):
+        """Test that only the requested fields are returned."""
+        body, _, _ = make_listing().page(limit=2, fields=["index", "filename"])
+        assert json.loads(body) == [{"index": -1, "filename": "untimed.md"}, {"index": 0, "filename": "s0.md"}]
+    
+    def test_invalid_input(self):
+        """Test that bad cursors, fields and dates raise ValueError."""
+        listing = make_listing()
+        with pytest.raises(ValueError):
+            listing.page(cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            listing.page(fields=["missing"])
+        with pytest.raises(ValueError):
+            parse_time_bound("yesterday")
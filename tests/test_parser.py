@@ -1,9 +1,21 @@
 """Tests for the MD parser module."""
 
+import json
+import os
+import threading
+import time
 import pytest
+from unittest.mock import patch
 from datetime import datetime, timezone, timedelta
+from talkshow.benchmarks.time_extraction import measure_time_extraction
 from talkshow.parser.md_parser import MDParser
 from talkshow.parser.time_extractor import TimeExtractor
+from talkshow.parser.manifest import FileManifest
+from talkshow.parser.incremental import IncrementalIndexer
+from talkshow.parser.parallel import parse_files
+from talkshow.parser.stream_parser import ParseCheckpoint, StreamState, StreamingMDParser
+from talkshow.parser.watcher import HistoryWatcher, PollingWatcher, create_watcher
+from talkshow.storage.json_storage import JSONStorage
 from talkshow.models.chat import SessionMeta
 
 
@@ -35,6 +47,39 @@ class TestTimeExtractor:
         content = "No timestamp in this content"
         timestamp = TimeExtractor.extract_first_timestamp(content)
         assert timestamp is None
+    
+    def test_earliest_timestamp(self):
+        """Test that the earliest valid timestamp wins regardless of its position."""
+        content = "ran at 2025-07-28 23:16:38.431711, started 2025-07-28 09:00:00 and 2025-13-01 00:00:00"
+        assert TimeExtractor.extract_first_timestamp(content) == datetime(2025, 7, 28, 9, 0)
+        assert TimeExtractor.extract_all_timestamps(content) == [
+            datetime(2025, 7, 28, 9, 0), datetime(2025, 7, 28, 23, 16, 38, 431711)
+        ]
+    
+    def test_fractions_parse_like_strptime(self):
+        """Test that fractional seconds of any accepted length parse and longer ones are skipped."""
+        assert TimeExtractor.extract_first_timestamp("2025-07-28 23:16:38.43") == datetime(2025, 7, 28, 23, 16, 38, 430000)
+        assert TimeExtractor.extract_first_timestamp("2025-07-28 23:16:38.4317119") is None
+    
+    def test_command_output_line_parity(self, tmp_path):
+        """Test that both parsers take the earliest timestamp of the line after a datetime command."""
+        path = tmp_path / "2025-07-28_15-30Z-parity.md"
+        path.write_text(
+            "_**User**_\n\nWhat time is it?\n\n---\n\n_**Assistant**_\n\n"
+            'python -c "from datetime import datetime;print(datetime.now())"\n'
+            "Output: 2025-07-28 23:16:38.431711 and earlier 2025-07-28 10:00:00\n\nDone.\n",
+            encoding='utf-8'
+        )
+        
+        session = MDParser().parse_file(str(path))
+        assert session.qa_pairs[0].timestamp == datetime(2025, 7, 28, 10, 0, tzinfo=timezone.utc)
+        assert session.to_dict() == StreamingMDParser().parse_file(str(path)).to_dict()
+    
+    def test_time_extraction_benchmark(self):
+        """Test that the benchmark agrees with the previous implementation and reports timings."""
+        results = measure_time_extraction(size=2000, repeat=1)
+        assert set(results) == {"command", "prose", "log"}
+        assert results["log"]["extract_first_timestamp"]["fast_us"] > 0
 
 
 class TestMDParser:
@@ -147,4 +192,340 @@ class TestMDParser:
             assert qa_pair.timestamp == test_ctime
         finally:
             # Restore original method
-            self.parser._extract_creation_time_from_filename = original_method
\ No newline at end of file
+            self.parser._extract_creation_time_from_filename = original_method
+
+class FailingParser(MDParser):
+    """Parser that raises on files whose name contains 'bad'."""
+    
+    def parse_file(self, file_path):
+        if 'bad' in file_path:
+            raise ValueError("corrupt file")
+        return super().parse_file(file_path)
+
+
+class TestStreamingMDParser:
+    """Test the single-pass streaming parser."""
+    
+    CONTENT = """Preamble
+---
+_**Assistant**_
+Leading answer
+---
+_**User**_
+First question
+spanning lines
+
+---
+_**Assistant**_
+Let me check the time.
+```bash
+python -c "from datetime import datetime;print(datetime.now())"
+```
+2025-07-28 23:16:38.431711
+user@host:~$ ls
+Done --- mostly
+---
+Trailing section
+
+---
+_**User**_
+
+---
+_**Assistant**_
+Answer after an empty question
+---
+_**User**_
+Second question
+---
+_**Assistant**_
+Second answer at 2025-07-20 10:00:00
+"""
+    
+    def test_matches_md_parser(self):
+        """Test that the streaming parser produces the same session as MDParser."""
+        expected = MDParser().parse_content(self.CONTENT, "2025-07-28_15-30Z-stream.md")
+        session = StreamingMDParser().parse_content(self.CONTENT, "2025-07-28_15-30Z-stream.md")
+        
+        assert session.to_dict() == expected.to_dict()
+        assert session.qa_pairs[0].timestamp.hour == 23
+        assert session.qa_pairs[1].question == "Second question"
+    
+    def test_parse_file_matches_md_parser(self, tmp_path):
+        """Test streaming from disk, including file size and CRLF line endings."""
+        path = tmp_path / "2025-07-28_15-30Z-stream.md"
+        path.write_bytes(self.CONTENT.replace('\n', '\r\n').encode('utf-8'))
+        
+        expected = MDParser().parse_file(str(path))
+        session = StreamingMDParser().parse_file(str(path))
+        assert session.to_dict() == expected.to_dict()
+    
+    def test_pairs_are_yielded_as_they_complete(self):
+        """Test that a QA pair is available before the rest of the file is read."""
+        consumed = []
+        
+        def lines():
+            for line in self.CONTENT.splitlines(keepends=True):
+                consumed.append(line)
+                yield line
+        
+        pairs = StreamingMDParser().iter_qa_pairs(lines(), datetime.now(timezone.utc))
+        first = next(pairs)
+        assert first.question == "First question\nspanning lines"
+        assert len(consumed) < len(self.CONTENT.splitlines())
+        assert [qa.question for qa in pairs] == ["Second question"]
+    
+    @pytest.mark.parametrize("newline", ["\n", "\r\n"])
+    def test_resume_matches_full_parse(self, tmp_path, newline):
+        """Test that resuming at a checkpoint gives the same session for any cut point."""
+        content = self.CONTENT.replace('\n', newline).encode('utf-8')
+        path = tmp_path / "2025-07-28_15-30Z-stream.md"
+        parser = StreamingMDParser()
+        
+        for cut in range(0, len(content) + 1, 7):
+            path.write_bytes(content[:cut])
+            previous, checkpoint = parser.parse_file_checkpointed(str(path))
+            checkpoint = ParseCheckpoint.from_dict(json.loads(json.dumps(checkpoint.to_dict())))
+            
+            path.write_bytes(content)
+            session, _ = parser.resume_file(str(path), checkpoint, previous.qa_pairs if previous else [])
+            assert session.to_dict() == parser.parse_file(str(path)).to_dict(), cut
+    
+    def test_resume_reads_only_appended_lines(self, tmp_path):
+        """Test that a resumed parse feeds only the new lines and detects rewrites."""
+        path = tmp_path / "2025-07-28_15-30Z-stream.md"
+        path.write_text(self.CONTENT, encoding='utf-8')
+        parser = StreamingMDParser()
+        previous, checkpoint = parser.parse_file_checkpointed(str(path))
+        assert checkpoint.emitted == 1
+        
+        appended = "Still answering\n---\n_**User**_\nThird question\n---\n_**Assistant**_\nThird answer\n"
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(appended)
+        
+        with patch.object(StreamState, 'feed', autospec=True, side_effect=StreamState.feed) as feed:
+            session, new_checkpoint = parser.resume_file(str(path), checkpoint, previous.qa_pairs)
+        assert feed.call_count == appended.count('\n')
+        assert session.to_dict() == parser.parse_file(str(path)).to_dict()
+        assert session.qa_pairs[1].answer.endswith("Still answering")
+        assert new_checkpoint.emitted == 2
+        
+        path.write_text(self.CONTENT.replace("First question", "Edited question") + appended, encoding='utf-8')
+        assert parser.resume_file(str(path), checkpoint, previous.qa_pairs) is None
+
+
+class TestParallelParsing:
+    """Test process-pool parsing."""
+    
+    def _write_files(self, directory, names):
+        paths = []
+        for name in names:
+            path = directory / name
+            path.write_text(f"_**User**_\n{name}\n\n---\n_**Assistant**_\nAnswer\n", encoding='utf-8')
+            paths.append(path)
+        return paths
+    
+    def test_results_in_input_order(self, tmp_path):
+        """Test that outcomes come back in input order and match sequential parsing."""
+        names = [f"2025-07-{day:02d}_10-00Z-s{day}.md" for day in range(1, 13)]
+        paths = self._write_files(tmp_path, names)
+        
+        outcomes = list(parse_files(paths, jobs=2))
+        assert [o.path.name for o in outcomes] == names
+        assert [o.session.qa_pairs[0].question for o in outcomes] == names
+        
+        sequential = MDParser().parse_directory(str(tmp_path))
+        parallel = MDParser().parse_directory(str(tmp_path), jobs=2)
+        assert [s.to_dict() for s in parallel] == [s.to_dict() for s in sequential]
+    
+    def test_failure_is_isolated(self, tmp_path):
+        """Test that a file raising in a worker does not stop the others."""
+        names = ["2025-07-01_10-00Z-good.md", "2025-07-02_10-00Z-bad.md", "2025-07-03_10-00Z-good.md"]
+        paths = self._write_files(tmp_path, names)
+        
+        outcomes = list(parse_files(paths, jobs=2, parser=FailingParser()))
+        assert [o.error is None for o in outcomes] == [True, False, True]
+        assert "corrupt file" in outcomes[1].error
+        assert outcomes[2].session is not None
+
+
+class TestIncrementalIndexer:
+    """Test manifest-driven incremental parsing."""
+    
+    CONTENT = """
+---
+_**User**_
+{question}
+
+---
+_**Assistant**_
+{answer}
+"""
+    
+    def _write(self, directory, name, question, answer="Answer"):
+        path = directory / name
+        path.write_text(self.CONTENT.format(question=question, answer=answer), encoding='utf-8')
+        return path
+    
+    @pytest.fixture
+    def setup(self, tmp_path):
+        history = tmp_path / "history"
+        history.mkdir()
+        data_file = tmp_path / "data" / "sessions.json"
+        storage = JSONStorage(str(data_file))
+        return history, data_file, storage
+    
+    def _run(self, history, data_file, storage, parser=None):
+        indexer = IncrementalIndexer(storage, FileManifest.for_data_file(data_file), parser=parser)
+        return indexer.run(history)
+    
+    def test_only_changed_files_are_parsed(self, setup):
+        """Test that a re-run skips unchanged files and drops deleted ones."""
+        history, data_file, storage = setup
+        self._write(history, "2025-07-28_15-30Z-a.md", "First")
+        self._write(history, "2025-07-28_16-30Z-b.md", "Second")
+        
+        result = self._run(history, data_file, storage)
+        assert sorted(result.parsed) == ["2025-07-28_15-30Z-a.md", "2025-07-28_16-30Z-b.md"]
+        
+        parser = MDParser()
+        with patch.object(parser, 'parse_file', wraps=parser.parse_file) as spy:
+            result = self._run(history, data_file, storage, parser=parser)
+            spy.assert_not_called()
+        assert len(result.unchanged) == 2
+        
+        self._write(history, "2025-07-28_15-30Z-a.md", "First, edited")
+        (history / "2025-07-28_16-30Z-b.md").unlink()
+        result = self._run(history, data_file, storage)
+        
+        assert result.parsed == ["2025-07-28_15-30Z-a.md"]
+        assert result.removed == ["2025-07-28_16-30Z-b.md"]
+        assert storage.get_session_count() == 1
+        assert storage.load_session("2025-07-28_15-30Z-a.md").qa_pairs[0].question == "First, edited"
+    
+    def test_touched_file_is_not_reparsed(self, setup):
+        """Test that an mtime-only change is detected through the content hash."""
+        history, data_file, storage = setup
+        path = self._write(history, "2025-07-28_15-30Z-a.md", "First")
+        self._run(history, data_file, storage)
+        
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+        result = self._run(history, data_file, storage)
+        assert result.parsed == []
+        assert result.unchanged == ["2025-07-28_15-30Z-a.md"]
+    
+    def test_summaries_carried_over(self, setup):
+        """Test that summaries of unchanged QA pairs survive a re-parse."""
+        history, data_file, storage = setup
+        self._write(history, "2025-07-28_15-30Z-a.md", "First")
+        self._run(history, data_file, storage)
+        
+        session = storage.load_session("2025-07-28_15-30Z-a.md")
+        session.qa_pairs[0].question_summary = "kept summary"
+        storage.save_session(session)
+        
+        path = history / "2025-07-28_15-30Z-a.md"
+        path.write_text(path.read_text(encoding='utf-8') + self.CONTENT.format(question="Second", answer="More"),
+                        encoding='utf-8')
+        result = self._run(history, data_file, storage)
+        
+        assert result.parsed == ["2025-07-28_15-30Z-a.md"]
+        session = storage.load_session("2025-07-28_15-30Z-a.md")
+        assert len(session.qa_pairs) == 2
+        assert session.qa_pairs[0].question_summary == "kept summary"
+    
+    def test_growing_file_resumes_from_checkpoint(self, setup):
+        """Test that an appended-to file is parsed from its checkpoint, and rewritten files in full."""
+        history, data_file, storage = setup
+        path = self._write(history, "2025-07-28_15-30Z-a.md", "First")
+        indexer = IncrementalIndexer(storage, FileManifest.for_data_file(data_file))
+        indexer.run(history)
+        
+        session = storage.load_session("2025-07-28_15-30Z-a.md")
+        session.qa_pairs[0].question_summary = "kept summary"
+        storage.save_session(session)
+        
+        for question in ("Second", "Third"):
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(self.CONTENT.format(question=question, answer="More"))
+            result = indexer.run(history)
+            assert result.resumed == ["2025-07-28_15-30Z-a.md"]
+        
+        session = storage.load_session("2025-07-28_15-30Z-a.md")
+        assert [qa.question for qa in session.qa_pairs] == ["First", "Second", "Third"]
+        assert session.qa_pairs[0].question_summary == "kept summary"
+        assert session.to_dict()["qa_pairs"][1:] == StreamingMDParser().parse_file(str(path)).to_dict()["qa_pairs"][1:]
+        
+        manifest = FileManifest.for_data_file(data_file)
+        assert manifest.records["2025-07-28_15-30Z-a.md"].checkpoint["emitted"] == 2
+        
+        path.write_text(path.read_text(encoding='utf-8').replace("First", "First, edited") + "more\n", encoding='utf-8')
+        result = indexer.run(history)
+        assert result.resumed == []
+        assert result.parsed == ["2025-07-28_15-30Z-a.md"]
+        assert storage.load_session("2025-07-28_15-30Z-a.md").qa_pairs[0].question == "First, edited"
+        
+        # Files not written to for longer than checkpoint_age drop their checkpoint
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write("\n")
+        stale = time.time() - 2 * 86400
+        os.utime(path, (stale, stale))
+        indexer.run(history)
+        assert FileManifest.for_data_file(data_file).records["2025-07-28_15-30Z-a.md"].checkpoint is None
+
+
+
+class TestHistoryWatcher:
+    """Test change detection and re-indexing of a watched history directory."""
+    
+    @pytest.mark.parametrize("force_polling", [False, True])
+    def test_detects_markdown_changes(self, tmp_path, force_polling):
+        """Test that new and edited markdown files are reported and other files ignored."""
+        watcher = create_watcher(tmp_path, poll_interval=0.01, force_polling=force_polling)
+        if force_polling:
+            assert isinstance(watcher, PollingWatcher)
+        try:
+            assert not watcher.wait(0.05)
+            (tmp_path / "notes.txt").write_text("x")
+            assert not watcher.wait(0.05)
+            
+            (tmp_path / "2025-07-28_15-30Z-a.md").write_text("x")
+            assert watcher.wait(1)
+            (tmp_path / "2025-07-28_15-30Z-a.md").write_text("longer")
+            assert watcher.wait(1)
+        finally:
+            watcher.close()
+    
+    def test_watch_reindexes_changed_files(self, tmp_path):
+        """Test that each burst of changes triggers one incremental run."""
+        history = tmp_path / "history"
+        history.mkdir()
+        data_file = tmp_path / "data" / "sessions.json"
+        storage = JSONStorage(str(data_file))
+        helper = TestIncrementalIndexer()
+        helper._write(history, "2025-07-28_15-30Z-a.md", "First")
+        
+        indexer = IncrementalIndexer(storage, FileManifest.for_data_file(data_file))
+        watcher = HistoryWatcher(indexer, history, watcher=PollingWatcher(history, interval=0.01), debounce=0.05)
+        results = []
+        updated = threading.Event()
+        stop = threading.Event()
+        
+        def on_update(result):
+            results.append(result)
+            updated.set()
+        
+        thread = threading.Thread(target=watcher.watch, args=(on_update, stop), kwargs={"timeout": 0.05})
+        thread.start()
+        try:
+            assert updated.wait(5)
+            assert results[0].parsed == ["2025-07-28_15-30Z-a.md"]
+            
+            updated.clear()
+            helper._write(history, "2025-07-28_16-30Z-b.md", "Second")
+            assert updated.wait(5)
+            assert results[1].parsed == ["2025-07-28_16-30Z-b.md"]
+            assert storage.get_session_count() == 2
+        finally:
+            stop.set()
+            thread.join(5)
+        assert not thread.is_alive()
@@ -0,0 +1,79 @@
+"""Tests for full-text search."""
+
+import pytest
+
+from talkshow.search.index import SearchIndex, tokenize
+
+from .conftest import make_session
+
+
+class TestTokenize:
+    """Test the search tokenizer."""
+    
+    def test_latin_words(self):
+        """Test lowercase word splitting."""
+        assert tokenize("Use FastAPI, not Flask!") == ["use", "fastapi", "not", "flask"]
+    
+    def test_cjk_unigrams_and_bigrams(self):
+        """Test that CJK runs are indexed as unigrams and bigrams."""
+        assert tokenize("实现功能") == ["实", "现", "功", "能", "实现", "现功", "功能"]
+        assert tokenize("实现功能", for_query=True) == ["实现", "现功", "功能"]
+        assert tokenize("中", for_query=True) == ["中"]
+    
+    def test_mixed_text(self):
+        """Test mixed Chinese and English text."""
+        assert tokenize("用Python实现") == ["用", "python", "实", "现", "实现"]
+
+
+class TestSearchIndex:
+    """Test SearchIndex ranking and paging."""
+    
+    @pytest.fixture
+    def index(self):
+        """Create an index over a few sessions."""
+        sessions = [
+            make_session("a.md", [
+                ("如何实现异步功能？", "可以使用 asyncio 实现异步功能。"),
+                ("How to configure logging?", "Use the logging module with a handler."),
+            ]),
+            make_session("b.md", [
+                ("数据库怎么选", "推荐使用 SQLite 存储数据。"),
+                ("Explain asyncio event loop", "The event loop runs coroutines; asyncio schedules them."),
+            ]),
+        ]
+        return SearchIndex.from_sessions(sessions)
+    
+    def test_chinese_query(self, index):
+        """Test searching Chinese text."""
+        total, hits = index.search("异步功能")
+        assert total == 1
+        assert hits[0].filename == "a.md"
+        assert hits[0].qa_index == 0
+        assert "异步功能" in hits[0].snippet
+    
+    def test_all_terms_required(self, index):
+        """Test that every query term must match."""
+        total, _ = index.search("asyncio")
+        assert total == 2
+        
+        total, hits = index.search("asyncio loop")
+        assert total == 1
+        assert hits[0].filename == "b.md"
+    
+    def test_question_match_ranks_higher(self, index):
+        """Test that matches in the question outrank matches in the answer."""
+        _, hits = index.search("asyncio")
+        assert hits[0].question == "Explain asyncio event loop"
+    
+    def test_paging(self, index):
+        """Test offset and limit."""
+        total, first_page = index.search("asyncio", limit=1)
+        total2, second_page = index.search("asyncio", limit=1, offset=1)
+        assert total == total2 == 2
+        assert len(first_page) == len(second_page) == 1
+        assert first_page[0].filename != second_page[0].filename
+    
+    def test_no_match(self, index):
+        """Test queries without matches."""
+        assert index.search("kubernetes") == (0, [])
+        assert index.search("   ") == (0, [])
@@ -1,13 +1,27 @@
 """Tests for storage functionality."""
 
+import asyncio
 import pytest
 import tempfile
+import time
 import os
-from datetime import datetime
+import json
+import multiprocessing
+from datetime import datetime, timezone
 from pathlib import Path
+from unittest.mock import MagicMock, patch
 
-from talkshow.models.chat import ChatSession, QAPair, SessionMeta
+from talkshow.models.chat import ChatSession, LazyChatSession, QAPair, SessionDigest, SessionMeta
 from talkshow.storage.json_storage import JSONStorage
+from talkshow.storage.jsonl_storage import JSONLStorage
+from talkshow.storage.locking import FileLock
+from talkshow.storage.repository import SessionRepository
+from talkshow.storage.async_repository import AsyncSessionRepository
+from talkshow.storage.sqlite_storage import SQLiteStorage
+from talkshow.storage.factory import create_storage
+from talkshow.config.manager import ConfigManager
+
+from .conftest import START, make_session
 
 
 class TestJSONStorage:
@@ -107,6 +121,26 @@ class TestJSONStorage:
         for i in range(len(loaded_sessions) - 1):
             assert loaded_sessions[i].meta.ctime <= loaded_sessions[i + 1].meta.ctime
     
+    def test_load_all_sessions_is_lazy(self, temp_storage, sample_session):
+        """Test that loaded sessions decode their QA pairs only on access."""
+        temp_storage.save_session(sample_session)
+        
+        with patch.object(QAPair, 'from_dict', wraps=QAPair.from_dict) as spy:
+            loaded = temp_storage.load_all_sessions()[0]
+            assert isinstance(loaded, LazyChatSession)
+            assert loaded.meta.filename == "test.md"
+            assert loaded.meta.qa_count == 2
+            assert loaded.to_dict()['qa_pairs'][1]['answer'] == "I'm doing well, thank you!"
+            assert spy.call_count == 0
+            assert not loaded.is_loaded
+            
+            assert loaded.qa_pairs[1].answer == "I'm doing well, thank you!"
+            assert spy.call_count == 2
+            assert loaded.is_loaded
+        
+        assert loaded == ChatSession.from_dict(sample_session.to_dict())
+        assert ChatSession.from_dict(sample_session.to_dict()) == loaded
+    
     def test_get_storage_info(self, temp_storage, sample_session):
         """Test getting storage information."""
         info = temp_storage.get_storage_info()
@@ -115,4 +149,554 @@ class TestJSONStorage:
         
         temp_storage.save_session(sample_session)
         info = temp_storage.get_storage_info()
-        assert info['session_count'] == 1
\ No newline at end of file
+        assert info['session_count'] == 1
+    
+    def test_load_session_reads_single_record(self, temp_storage, sample_session):
+        """Test that loading one session does not parse the whole file."""
+        temp_storage.save_session(sample_session)
+        
+        with patch.object(temp_storage, '_load_data') as mock_load:
+            loaded_session = temp_storage.load_session("test.md")
+            mock_load.assert_not_called()
+        
+        assert loaded_session.meta.filename == "test.md"
+        assert temp_storage.load_session("missing.md") is None
+    
+    def test_file_format_matches_json_dump(self, temp_storage, sample_session):
+        """Test that the record-wise writer produces standard indented JSON."""
+        temp_storage.save_session(sample_session)
+        
+        raw = temp_storage.storage_path.read_text(encoding='utf-8')
+        assert raw == json.dumps(json.loads(raw), indent=2, ensure_ascii=False)
+    
+    def test_offset_index_rebuilt_for_foreign_file(self, temp_storage, sample_session):
+        """Test that a data file written without an index is still indexed."""
+        data = {"test.md": sample_session.to_dict()}
+        with open(temp_storage.storage_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        
+        loaded_session = temp_storage.load_session("test.md")
+        assert loaded_session is not None
+        assert loaded_session.qa_pairs[1].question == "How are you?"
+        assert temp_storage.get_session_count() == 1
+    
+    def test_corrupted_file_is_not_overwritten(self, temp_storage, sample_session):
+        """Test that a save refuses to replace a file it cannot parse."""
+        temp_storage.storage_path.write_text('{"test.md": {"meta"', encoding='utf-8')
+        
+        assert temp_storage.save_session(sample_session) is False
+        assert temp_storage.storage_path.read_text(encoding='utf-8') == '{"test.md": {"meta"'
+    
+    def test_failed_write_keeps_previous_file(self, temp_storage, sample_session):
+        """Test that an interrupted write leaves the old file and no temp files."""
+        temp_storage.save_session(sample_session)
+        before = temp_storage.storage_path.read_bytes()
+        
+        sample_session.meta.filename = "other.md"
+        with patch('talkshow.storage.locking.os.replace', side_effect=OSError("disk full")):
+            assert temp_storage.save_session(sample_session) is False
+        
+        assert temp_storage.storage_path.read_bytes() == before
+        assert not list(temp_storage.storage_path.parent.glob('*.tmp'))
+    
+    def test_update_sessions_batch(self, temp_storage, sample_session):
+        """Test saving and deleting sessions in one write."""
+        temp_storage.save_session(sample_session)
+        
+        renamed = ChatSession.from_dict(sample_session.to_dict())
+        renamed.meta.filename = "renamed.md"
+        with patch.object(temp_storage, '_save_data', wraps=temp_storage._save_data) as spy:
+            assert temp_storage.update_sessions([renamed], deleted=["test.md"]) is True
+            assert spy.call_count == 1
+        
+        assert not temp_storage.session_exists("test.md")
+        assert temp_storage.load_session("renamed.md") is not None
+    
+    def test_concurrent_writers(self, temp_storage, sample_session):
+        """Test that writers in separate processes do not lose each other's sessions."""
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(target=_save_sessions_worker,
+                            args=(str(temp_storage.storage_path), sample_session.to_dict(), worker))
+            for worker in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+        
+        assert temp_storage.get_session_count() == 4 * 5
+        assert len(temp_storage.load_all_sessions()) == 4 * 5
+
+
+def _save_sessions_worker(storage_path, session_data, worker):
+    """Save sessions one at a time from a separate process."""
+    storage = JSONStorage(storage_path)
+    for i in range(5):
+        session = ChatSession.from_dict(session_data)
+        session.meta.filename = f"worker{worker}-{i}.md"
+        assert storage.save_session(session)
+
+
+class TestFileLock:
+    """Test the advisory file lock."""
+    
+    def test_reentrant_and_exclusive(self, tmp_path):
+        """Test nested acquisition and exclusion of another process."""
+        lock = FileLock(tmp_path / "data.lock", timeout=0.2)
+        with lock:
+            with lock:
+                pass
+            
+            # A second process cannot take the lock while it is held
+            context = multiprocessing.get_context('fork')
+            process = context.Process(target=_try_lock, args=(str(tmp_path / "data.lock"),))
+            process.start()
+            process.join(timeout=10)
+            assert process.exitcode == 1
+        
+        with FileLock(tmp_path / "data.lock", timeout=0.2):
+            pass
+
+
+def _try_lock(lock_path):
+    """Exit with 1 if the lock cannot be acquired."""
+    try:
+        with FileLock(lock_path, timeout=0.2):
+            os._exit(0)
+    except TimeoutError:
+        os._exit(1)
+
+
+class TestJSONLStorage:
+    """Test the append-only JSONL session log."""
+    
+    @pytest.fixture
+    def temp_storage(self, tmp_path):
+        return JSONLStorage(str(tmp_path / "sessions.jsonl"))
+    
+    def test_save_appends_one_record(self, temp_storage):
+        """Test that each save appends to the log instead of rewriting it."""
+        temp_storage.save_session(make_session("a.md"))
+        size = temp_storage.storage_path.stat().st_size
+        content = temp_storage.storage_path.read_bytes()
+        
+        temp_storage.save_session(make_session("b.md"))
+        assert temp_storage.storage_path.read_bytes().startswith(content)
+        assert temp_storage.storage_path.stat().st_size > size
+        
+        assert temp_storage.load_session("a.md") == make_session("a.md")
+        assert temp_storage.get_session_count() == 2
+    
+    def test_upsert_and_delete(self, temp_storage):
+        """Test that the latest record of a session wins and deletes hide it."""
+        temp_storage.save_session(make_session("a.md", ["old"]))
+        temp_storage.save_session(make_session("a.md", ["new"]))
+        temp_storage.save_session(make_session("b.md"))
+        
+        assert temp_storage.load_session("a.md").qa_pairs[0].question == "new"
+        assert temp_storage.delete_session("b.md") is True
+        assert temp_storage.delete_session("b.md") is False
+        assert not temp_storage.session_exists("b.md")
+        assert [s.meta.filename for s in temp_storage.load_all_sessions()] == ["a.md"]
+        assert temp_storage.get_log_stats() == {'records': 4, 'live': 1, 'dead': 3, 'dead_ratio': 0.75}
+    
+    def test_index_rebuilt_on_open_and_caught_up(self, temp_storage):
+        """Test that another instance indexes the log and sees later appends."""
+        temp_storage.update_sessions([make_session("a.md"), make_session("b.md")])
+        reader = JSONLStorage(str(temp_storage.storage_path))
+        assert reader.get_session_count() == 2
+        
+        temp_storage.update_sessions([make_session("c.md")], deleted=["a.md"])
+        assert reader.session_exists("c.md")
+        assert not reader.session_exists("a.md")
+    
+    def test_torn_tail_is_ignored_and_truncated(self, temp_storage):
+        """Test that a partial record from a crashed writer is skipped and cut off."""
+        temp_storage.save_session(make_session("a.md"))
+        record = temp_storage._put_record(make_session("b.md"))
+        with open(temp_storage.storage_path, 'ab') as f:
+            f.write(record[:-10])
+        
+        reader = JSONLStorage(str(temp_storage.storage_path))
+        assert reader.get_session_count() == 1
+        
+        reader.save_session(make_session("c.md"))
+        assert {s.meta.filename for s in JSONLStorage(str(temp_storage.storage_path)).load_all_sessions()} == {"a.md", "c.md"}
+    
+    def test_compact(self, temp_storage):
+        """Test that compaction keeps only live records, respecting the threshold."""
+        for i in range(3):
+            temp_storage.save_session(make_session("a.md", [f"v{i}"]))
+        temp_storage.save_session(make_session("b.md"))
+        reader = JSONLStorage(str(temp_storage.storage_path))
+        
+        assert temp_storage.compact(threshold=0.6) is False
+        assert temp_storage.compact(threshold=0.4) is True
+        assert temp_storage.get_log_stats()['records'] == 2
+        assert temp_storage.compact() is False
+        
+        # Readers holding the old index pick up the rewritten file
+        assert reader.load_session("a.md").qa_pairs[0].question == "v2"
+        assert reader.get_log_stats()['dead'] == 0
+        
+        temp_storage.save_session(make_session("c.md"))
+        assert reader.get_session_count() == 3
+    
+    def test_replaced_log_with_reused_inode(self, temp_storage, tmp_path):
+        """Test that a reader rebuilds its index when a larger log replaces the file in place."""
+        temp_storage.save_session(make_session("a.md"))
+        reader = JSONLStorage(str(temp_storage.storage_path))
+        assert reader.get_session_count() == 1
+        inode = temp_storage.storage_path.stat().st_ino
+        
+        other = JSONLStorage(str(tmp_path / "other.jsonl"))
+        other.update_sessions([make_session(f"{name}.md") for name in "bcd"])
+        # Same inode and a larger size, as when a compacted log's inode is reused
+        with open(temp_storage.storage_path, 'r+b') as f:
+            f.write(other.storage_path.read_bytes())
+        assert temp_storage.storage_path.stat().st_ino == inode
+        
+        assert reader.get_session_count() == 3
+        assert reader.load_session("b.md") == make_session("b.md")
+        assert not reader.session_exists("a.md")
+    
+    def test_log_without_generation_header(self, temp_storage, tmp_path):
+        """Test that logs written before generation headers are still read and appended to."""
+        path = tmp_path / "legacy.jsonl"
+        path.write_bytes(temp_storage._put_record(make_session("a.md")))
+        
+        legacy = JSONLStorage(str(path))
+        legacy.save_session(make_session("b.md"))
+        assert {s.meta.filename for s in JSONLStorage(str(path)).load_all_sessions()} == {"a.md", "b.md"}
+    
+    def test_concurrent_writers(self, temp_storage):
+        """Test that appends from separate processes are not interleaved."""
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(target=_append_sessions_worker,
+                            args=(str(temp_storage.storage_path), make_session("x.md").to_dict(), worker))
+            for worker in range(4)
+        ]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+        
+        assert len(temp_storage.load_all_sessions()) == 4 * 5
+
+
+def _append_sessions_worker(storage_path, session_data, worker):
+    """Append sessions one at a time from a separate process."""
+    storage = JSONLStorage(storage_path)
+    for i in range(5):
+        session = ChatSession.from_dict(session_data)
+        session.meta.filename = f"worker{worker}-{i}.md"
+        assert storage.save_session(session)
+
+
+class TestSessionRepository:
+    """Test SessionRepository caching behaviour."""
+    
+    @pytest.fixture
+    def temp_storage(self):
+        """Create a temporary storage for testing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage_path = os.path.join(temp_dir, "test_sessions.json")
+            yield JSONStorage(storage_path)
+    
+    def test_sessions_served_from_memory(self, temp_storage):
+        """Test that unchanged storage is not reloaded."""
+        temp_storage.save_session(make_session("a.md"))
+        repository = SessionRepository(temp_storage)
+        
+        first = repository.get_all_sessions()
+        with patch.object(temp_storage, 'load_all_sessions') as mock_load:
+            second = repository.get_all_sessions()
+            mock_load.assert_not_called()
+        
+        assert first is second
+        assert repository.get_session("a.md") is first[0]
+        assert repository.get_session("missing.md") is None
+    
+    def test_reload_when_storage_changes(self, temp_storage):
+        """Test that a changed data file triggers a reload."""
+        temp_storage.save_session(make_session("a.md"))
+        repository = SessionRepository(temp_storage)
+        assert repository.get_session_count() == 1
+        
+        temp_storage.save_session(make_session("b.md", start=START.replace(minute=20)))
+        assert repository.get_session_count() == 2
+        assert repository.get_session("b.md") is not None
+    
+    def test_metas_do_not_load_sessions(self, temp_storage):
+        """Test that listing digests neither loads nor caches full sessions."""
+        temp_storage.save_session(make_session("a.md"))
+        repository = SessionRepository(temp_storage)
+        
+        with patch.object(temp_storage, 'load_all_sessions') as mock_load:
+            assert [m.meta.filename for m in repository.get_all_metas()] == ["a.md"]
+            temp_storage.save_session(make_session("b.md", start=START.replace(minute=20)))
+            assert len(repository.get_all_metas()) == 2
+            mock_load.assert_not_called()
+
+
+class TestAsyncSessionRepository:
+    """Test the thread-pool facade used by the web handlers."""
+    
+    @pytest.fixture
+    def slow_storage(self):
+        """Create a storage whose full load takes a while and is counted."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = JSONStorage(os.path.join(temp_dir, "test_sessions.json"))
+            storage.save_session(make_session("a.md"))
+            load = storage.load_all_sessions
+            storage.load_calls = 0
+            
+            def slow_load():
+                storage.load_calls += 1
+                sessions = load()
+                time.sleep(0.3)
+                return sessions
+            
+            storage.load_all_sessions = slow_load
+            yield storage
+    
+    def test_concurrent_loads_are_coalesced(self, slow_storage):
+        """Test that concurrent identical calls share one blocking load."""
+        facade = AsyncSessionRepository(SessionRepository(slow_storage), max_workers=4)
+        
+        async def run():
+            return await asyncio.gather(*(facade.get_all_sessions() for _ in range(10)))
+        
+        results = asyncio.run(run())
+        facade.close()
+        assert slow_storage.load_calls == 1
+        assert all(result is results[0] for result in results)
+        assert [s.meta.filename for s in results[0]] == ["a.md"]
+    
+    def test_call_on_older_version_is_not_joined(self, slow_storage):
+        """Test that a caller arriving after a write starts its own load."""
+        facade = AsyncSessionRepository(SessionRepository(slow_storage), max_workers=4)
+        
+        async def run():
+            first = asyncio.ensure_future(facade.get_all_sessions())
+            await asyncio.sleep(0.1)
+            slow_storage.save_session(make_session("b.md", start=START.replace(minute=20)))
+            second = await facade.get_all_sessions()
+            return await first, second
+        
+        first, second = asyncio.run(run())
+        facade.close()
+        assert slow_storage.load_calls == 2
+        assert [s.meta.filename for s in first] == ["a.md"]
+        assert sorted(s.meta.filename for s in second) == ["a.md", "b.md"]
+    
+    def test_event_loop_stays_responsive(self, slow_storage):
+        """Test that a slow load does not block other coroutines."""
+        facade = AsyncSessionRepository(SessionRepository(slow_storage), max_workers=2)
+        
+        async def run():
+            gaps = []
+            
+            async def ticker():
+                previous = time.monotonic()
+                for _ in range(20):
+                    await asyncio.sleep(0.01)
+                    now = time.monotonic()
+                    gaps.append(now - previous)
+                    previous = now
+            
+            await asyncio.gather(facade.get_all_sessions(), ticker())
+            return max(gaps)
+        
+        assert asyncio.run(run()) < 0.1
+        facade.close()
+
+
+class TestSQLiteStorage:
+    """Test SQLiteStorage functionality."""
+    
+    @pytest.fixture
+    def temp_storage(self):
+        """Create a temporary SQLite storage for testing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            storage = SQLiteStorage(os.path.join(temp_dir, "test_sessions.db"))
+            yield storage
+            storage.close()
+    
+    def test_load_is_a_consistent_snapshot(self, temp_storage):
+        """Test that a write between the session and QA queries does not affect the load."""
+        temp_storage.save_sessions([make_session("a.md", start=START.replace(day=27)), make_session("b.md")])
+        writer = SQLiteStorage(str(temp_storage.storage_path))
+        new_session = make_session("c.md", start=START.replace(day=29))
+        conn = temp_storage._connect()
+        
+        class WriteAfterFirstSelect:
+            """Connection proxy letting another connection write after the sessions query."""
+            
+            def __init__(self):
+                self.written = False
+            
+            def execute(self, sql, *args):
+                cursor = conn.execute(sql, *args)
+                if sql.lstrip().startswith("SELECT") and not self.written:
+                    self.written = True
+                    assert writer.save_session(new_session)
+                    assert writer.delete_session("a.md")
+                return cursor
+            
+            def __getattr__(self, name):
+                return getattr(conn, name)
+        
+        temp_storage._local.conn = WriteAfterFirstSelect()
+        try:
+            sessions = temp_storage.load_all_sessions()
+        finally:
+            temp_storage._local.conn = conn
+            writer.close()
+        
+        assert [s.meta.filename for s in sessions] == ["a.md", "b.md"]
+        assert [s.meta.filename for s in temp_storage.load_all_sessions()] == ["b.md", "c.md"]
+    
+    def test_save_and_load_session(self, temp_storage):
+        """Test round-tripping a session through SQLite."""
+        session = make_session("test.md", ("Hello", "How are you?"), summaries=(0,))
+        assert temp_storage.save_session(session) is True
+        
+        loaded_session = temp_storage.load_session("test.md")
+        assert loaded_session == session
+        assert temp_storage.load_session("missing.md") is None
+    
+    def test_overwrite_session(self, temp_storage):
+        """Test that saving a session again replaces its QA pairs."""
+        temp_storage.save_session(make_session("test.md", ("a", "b", "c")))
+        temp_storage.save_session(make_session("test.md", ("d",)))
+        
+        loaded_session = temp_storage.load_session("test.md")
+        assert [qa.question for qa in loaded_session.qa_pairs] == ["d"]
+        assert temp_storage.get_session_count() == 1
+    
+    def test_delete_and_exists(self, temp_storage):
+        """Test deleting a session."""
+        temp_storage.save_session(make_session("test.md"))
+        assert temp_storage.session_exists("test.md") is True
+        
+        assert temp_storage.delete_session("test.md") is True
+        assert temp_storage.session_exists("test.md") is False
+        assert temp_storage.delete_session("test.md") is False
+        assert temp_storage.count_qa_pairs_between() == 0
+    
+    def test_date_range_queries(self, temp_storage):
+        """Test loading sessions and counting QA pairs by date."""
+        temp_storage.save_sessions([
+            make_session(f"day{day}.md", ("q1", "q2"), start=START.replace(day=day))
+            for day in (26, 27, 28)
+        ])
+        
+        sessions = temp_storage.load_sessions_between(
+            start=datetime(2025, 7, 27, tzinfo=timezone.utc),
+            end=datetime(2025, 7, 28, tzinfo=timezone.utc)
+        )
+        assert [s.meta.filename for s in sessions] == ["day27.md"]
+        assert len(sessions[0].qa_pairs) == 2
+        assert temp_storage.count_qa_pairs_between(start=datetime(2025, 7, 27, tzinfo=timezone.utc)) == 4
+        assert [s.meta.filename for s in temp_storage.load_all_sessions()] == ["day26.md", "day27.md", "day28.md"]
+    
+    def test_data_version_changes_on_write(self, temp_storage):
+        """Test that every write advances the data version."""
+        version = temp_storage.get_data_version()
+        temp_storage.save_session(make_session("test.md"))
+        assert temp_storage.get_data_version() != version
+        
+        info = temp_storage.get_storage_info()
+        assert info['storage_type'] == 'SQLite'
+        assert info['session_count'] == 1
+
+
+class TestLoadAllMetas:
+    """Test meta-only projection loads in every backend."""
+    
+    @pytest.fixture(params=["json", "jsonl", "sqlite"])
+    def temp_storage(self, request, tmp_path):
+        storage = create_storage(MagicMock(spec=ConfigManager), storage_type=request.param,
+                                 storage_path=str(tmp_path / f"sessions.{request.param}"))
+        yield storage
+        if isinstance(storage, SQLiteStorage):
+            storage.close()
+    
+    def _session(self, filename, day):
+        return make_session(filename, ["第一个问题" * 30, ("Second", "Answer")],
+                            start=START.replace(day=day, hour=9, minute=0), minutes=[60, 210],
+                            summaries=(0,), answer_summaries=(1,))
+    
+    def test_digests_match_sessions(self, temp_storage):
+        """Test that digests are served without loading full sessions."""
+        sessions = [self._session("b.md", 28), self._session("a.md", 27)]
+        temp_storage.save_sessions(sessions)
+        temp_storage.delete_session("b.md")
+        temp_storage.save_session(self._session("c.md", 29))
+        
+        with patch.object(temp_storage, 'load_all_sessions') as mock_load:
+            metas = temp_storage.load_all_metas()
+            mock_load.assert_not_called()
+        
+        assert [m.meta.filename for m in metas] == ["a.md", "c.md"]
+        assert [s.meta.filename for s in temp_storage.load_all_sessions()] == ["a.md", "c.md"]
+        assert temp_storage.load_all_sessions()[0] == sessions[1]
+        assert metas[0] == SessionDigest.from_session(sessions[1])
+        assert metas[0].first_question == ("第一个问题" * 30)[:100]
+        assert metas[0].qa_count == 2
+        assert metas[0].has_summaries
+        assert metas[0].max_timestamp == datetime(2025, 7, 27, 12, 30, 0, tzinfo=timezone.utc)
+    
+    def test_json_digests_rebuilt_for_foreign_file(self, tmp_path):
+        """Test that a data file written without the sidecar still yields digests."""
+        session = self._session("a.md", 27)
+        data_file = tmp_path / "sessions.json"
+        data_file.write_text(json.dumps({"a.md": session.to_dict()}))
+        
+        assert JSONStorage(str(data_file)).load_all_metas() == [SessionDigest.from_session(session)]
+    
+    def test_sqlite_digest_columns_added_to_old_database(self, tmp_path):
+        """Test that a database without digest columns is migrated on open."""
+        db_path = str(tmp_path / "sessions.db")
+        storage = SQLiteStorage(db_path)
+        session = self._session("a.md", 27)
+        storage.save_session(session)
+        conn = storage._connect()
+        for column in ("question_summaries", "answer_summaries", "first_question",
+                       "first_timestamp", "min_timestamp", "max_timestamp"):
+            conn.execute(f"ALTER TABLE sessions DROP COLUMN {column}")
+        conn.commit()
+        storage.close()
+        
+        storage = SQLiteStorage(db_path)
+        assert storage.load_all_metas() == [SessionDigest.from_session(session)]
+        storage.close()
+
+
+class TestCreateStorage:
+    """Test storage backend selection."""
+    
+    def test_storage_type_switch(self, tmp_path):
+        """Test that storage.type selects the backend."""
+        config_manager = MagicMock(spec=ConfigManager)
+        config_manager.get_storage_type.return_value = "sqlite"
+        config_manager.get_database_path.return_value = tmp_path / "sessions.db"
+        
+        storage = create_storage(config_manager)
+        assert isinstance(storage, SQLiteStorage)
+        
+        storage = create_storage(config_manager, storage_type="json",
+                                 storage_path=str(tmp_path / "sessions.json"))
+        assert isinstance(storage, JSONStorage)
+        
+        storage = create_storage(config_manager, storage_type="jsonl",
+                                 storage_path=str(tmp_path / "sessions.jsonl"))
+        assert isinstance(storage, JSONLStorage)
+        
+        with pytest.raises(ValueError):
+            create_storage(config_manager, storage_type="xml")
@@ -1,7 +1,11 @@
 """Tests for summarizer functionality."""
 
 import pytest
+from unittest.mock import MagicMock, patch
 from talkshow.summarizer.rule_summarizer import RuleSummarizer
+from talkshow.summarizer.llm_summarizer import LLMSummarizer
+from talkshow.summarizer.cache import SummaryCache
+from talkshow.config.manager import ConfigManager
 from talkshow.models.chat import QAPair
 
 
@@ -119,4 +123,82 @@ class TestRuleSummarizer:
         if q_summary:
             assert len(q_summary) <= 20
         if a_summary:
-            assert len(a_summary) <= 80
\ No newline at end of file
+            assert len(a_summary) <= 80
+
+
+class TestSummaryCache:
+    """Test the persistent summary cache."""
+    
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = SummaryCache(str(tmp_path / "summary_cache.db"))
+        yield cache
+        cache.close()
+    
+    def test_key_covers_all_inputs(self):
+        """Test that text, length, model and template all change the key."""
+        base = SummaryCache.make_key("text", 20, "model", "template")
+        assert base == SummaryCache.make_key("text", 20, "model", "template")
+        assert base != SummaryCache.make_key("text2", 20, "model", "template")
+        assert base != SummaryCache.make_key("text", 21, "model", "template")
+        assert base != SummaryCache.make_key("text", 20, "model2", "template")
+        assert base != SummaryCache.make_key("text", 20, "model", "template2")
+    
+    def test_persists_and_counts(self, tmp_path, cache):
+        """Test hit/miss counting and persistence across instances."""
+        assert cache.get("k") is None
+        cache.put("k", "summary")
+        assert cache.get("k") == "summary"
+        assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+        
+        reopened = SummaryCache(str(tmp_path / "summary_cache.db"))
+        assert reopened.get("k") == "summary"
+        reopened.close()
+    
+    def test_lru_eviction(self, tmp_path):
+        """Test that the least recently used entries are evicted."""
+        cache = SummaryCache(str(tmp_path / "lru.db"), max_entries=3)
+        with patch('talkshow.summarizer.cache.time.time', side_effect=range(100)):
+            for key in ("a", "b", "c"):
+                cache.put(key, key.upper())
+            cache.get("a")  # "b" is now the oldest
+            cache.put("d", "D")
+        
+        assert cache.stats()["entries"] <= 3
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("d") == "D"
+        cache.close()
+    
+    def test_rule_summarizer_uses_cache(self, cache):
+        """Test that repeated texts are served from the cache."""
+        summarizer = RuleSummarizer(max_question_length=20, max_answer_length=80, cache=cache)
+        question = "This is a very long question that should be summarized"
+        
+        first = summarizer.summarize_question(question)
+        second = summarizer.summarize_question(question)
+        
+        assert first == second
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hits"] == 1
+    
+    @patch('talkshow.summarizer.llm_summarizer.completion')
+    def test_llm_summarizer_uses_cache(self, mock_completion, cache):
+        """Test that the LLM is called once for the same text and model."""
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = "摘要"
+        mock_completion.return_value = mock_response
+        
+        config_manager = MagicMock(spec=ConfigManager)
+        config_manager.get.side_effect = lambda key, default=None: {"model": "test-model"} if key == "summarizer.llm" else default
+        summarizer = LLMSummarizer(config_manager=config_manager, cache=cache)
+        
+        text = "这是一个需要摘要的长文本，内容超过了最大长度限制"
+        assert summarizer._summarize_text(text, max_length=10) == "摘要"
+        assert summarizer._summarize_text(text, max_length=10) == "摘要"
+        mock_completion.assert_called_once()
+        
+        # A different model must not reuse the cached summary
+        summarizer.llm_config = {"model": "other-model"}
+        summarizer._summarize_text(text, max_length=10)
+        assert mock_completion.call_count == 2